@@ -10,9 +10,14 @@ BASE_DIR = str(Path(__file__).resolve().parent.parent)
 sys.path.append(BASE_DIR)
 
 from apps.routes.query.route import query_route
+from apps.routes.query.semantic_cache import semantic_cache
 from apps.routes.train.route import train_route
 from apps.routes.crawl.route import crawl_route
-from libs.config import HOST, PORT, ENVIRONMENT
+from apps.routes.jobs.route import jobs_route
+from apps.llm.pool import llm_client_pool
+from apps.vector_stores.cache import vector_store_cache
+from apps.vector_stores.embeddings import get_embeddings
+from libs.config import HOST, PORT, ENVIRONMENT, WORKERS
 from libs.logger import get_logger, Colors, color_string
 
 logger, listener = get_logger("App")
@@ -23,6 +28,7 @@ app = FastAPI(title="LangChain RAG API")
 app.include_router(train_route)
 app.include_router(query_route)
 app.include_router(crawl_route)
+app.include_router(jobs_route)
 
 
 @app.get("/")
@@ -38,11 +44,21 @@ def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics")
+def metrics():
+    return {
+        "vector_store_cache": vector_store_cache.stats(),
+        "llm_client_pool": llm_client_pool.stats(),
+        "semantic_cache": semantic_cache.stats(),
+        "embedding_cache": get_embeddings().stats(),
+    }
+
+
 def start_server(
     host: str,
     port: int,
     reload: bool = True,
-    workers: int = 8,
+    workers: int = WORKERS,
     threads: int = 10,
     environment: str = "development"
 ):
@@ -0,0 +1,374 @@
+import asyncio
+import importlib.util
+import threading
+import time
+from collections import Counter
+from urllib.parse import urljoin, urlparse
+
+import httpx
+
+from apps.crawlers import logger
+from apps.crawlers.checkpoint import CrawlCheckpoint
+from apps.crawlers.request_helper import RequestHelper
+from apps.crawlers.site_classifier import MIN_TEXT, RICH_TEXT, classify_page
+from libs.config import (
+    CRAWL_HTTP2,
+    CRAWL_MAX_CONCURRENCY,
+    CRAWL_MAX_RETRIES,
+    CRAWL_PER_HOST_CONCURRENCY,
+    CRAWL_RATE_LIMIT,
+    CRAWL_RESPECT_ROBOTS,
+)
+from libs.constants import BASIC_HEADERS
+from libs.enums import ExtractorType
+from libs.logger import color_string
+
+DOC_EXTENSIONS = ('.pdf', '.docx', '.doc', '.xls', '.xlsx')
+IMG_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+
+
+class AsyncRequestHelper(RequestHelper):
+    """
+    Crawls on the event loop with one pooled httpx.AsyncClient instead of
+    running blocking requests calls in executor threads. Concurrency is capped
+    globally and per host, and each page is fetched and parsed once for both
+    its text and its links (see `RequestHelper.parse_page`). Requests share
+    the inherited per-host rate limiter and robots.txt rules. Robots and
+    sitemap discovery stay on the inherited blocking helpers, they are a
+    handful of requests per crawl.
+
+    With a `renderer` (a `SeleniumHelper`), the crawl is hybrid: every page is
+    fetched over HTTP, and only those that look script-rendered (see
+    `_needs_browser`) are rendered again by its browser pool, so a mostly
+    static site with a few client-rendered sections keeps HTTP speed.
+    """
+
+    def __init__(
+        self,
+        proxies: dict = None,
+        headers: dict = BASIC_HEADERS,
+        progress_callback=None,
+        page_sink=None,
+        extractor: ExtractorType | str | None = None,
+        remove_boilerplate: bool | None = None,
+        rate_limit: float = CRAWL_RATE_LIMIT,
+        respect_robots: bool = CRAWL_RESPECT_ROBOTS,
+        checkpoint: CrawlCheckpoint | None = None,
+        stop_event: threading.Event | None = None,
+        renderer=None,
+        max_concurrency: int = CRAWL_MAX_CONCURRENCY,
+        per_host_concurrency: int = CRAWL_PER_HOST_CONCURRENCY,
+        http2: bool = CRAWL_HTTP2,
+        timeout: int = 10,
+    ):
+        super().__init__(
+            proxies=proxies,
+            headers=headers,
+            progress_callback=progress_callback,
+            page_sink=page_sink,
+            extractor=extractor,
+            remove_boilerplate=remove_boilerplate,
+            rate_limit=rate_limit,
+            respect_robots=respect_robots,
+            checkpoint=checkpoint,
+            stop_event=stop_event,
+        )
+        self.headers = headers
+        self.proxy = (proxies or {}).get("https") or (proxies or {}).get("http")
+        self.max_concurrency = max_concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.timeout = timeout
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but the h2 package is not installed. Falling back to HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        self.renderer = renderer
+        self.escalations = Counter()
+
+        self.client = None
+        self._global_limit = None
+        self._host_limits = {}
+
+    async def __aenter__(self):
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            proxy=self.proxy,
+            http2=self.http2,
+            verify=False,
+            follow_redirects=True,
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+        )
+        self._global_limit = asyncio.Semaphore(self.max_concurrency)
+        self._host_limits = {}
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+        self.client = None
+        if self.renderer:
+            await asyncio.to_thread(self.renderer.stop_rendering)
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._host_limits[host]
+
+    async def arequest(self, url: str, method: str = 'GET', timeout: int = None, headers: dict = None):
+        logger.debug(f"Requesting {url} ...")
+
+        for try_request in range(1, CRAWL_MAX_RETRIES + 1):
+            # Wait for the host's rate limit before taking a connection slot.
+            await self.rate_limiter.aacquire(url)
+            start_time = time.time()
+            try:
+                async with self._global_limit, self._host_limit(url):
+                    response = await self.client.request(
+                        method, url, headers=headers, timeout=timeout or self.timeout
+                    )
+                time_taken = f'{time.time() - start_time:.2f} seconds'
+                if response.status_code in (200, 304):
+                    logger.debug(
+                        f'Try: {try_request}, '
+                        f'Status Code: {response.status_code}, '
+                        f'HTTP Version: {response.http_version}, '
+                        f'Response Length: '
+                        f'{len(response.content) / 1024 / 1024:.2f} MB, '
+                        f'Time Taken: {color_string(time_taken)}.'
+                    )
+                    return response
+                else:
+                    logger.warning(
+                        f'REQUEST FAILED - {try_request}: '
+                        f'Status Code: {response.status_code}, '
+                        f'Time Taken: {color_string(time_taken)}.'
+                    )
+                    delay = self._retry_delay(
+                        url, try_request, response.status_code, response.headers.get('Retry-After')
+                    )
+            except Exception as err:
+                logger.error(
+                    f'ERROR OCCURRED - {try_request}: Time Taken '
+                    f"{color_string(f'{time.time() - start_time:.2f} seconds')}"
+                    f', Error: {err!r}'
+                )
+                delay = self._retry_delay(url, try_request)
+
+            if delay is None:
+                break
+            if try_request < CRAWL_MAX_RETRIES:
+                await asyncio.sleep(delay)
+
+        return None
+
+    async def afetch_page(self, url: str) -> dict | None:
+        """
+        Async counterpart of `fetch_page`: at most one request and one parse
+        per page, plus a browser render for the pages `_needs_browser` picks
+        out when there is a `renderer`.
+        """
+        entry = await self._acache(self._cached_entry, url)
+        if self._unchanged_since_cached(url, entry):
+            return self._reuse_cached(url, entry, 'unchanged_in_sitemap')
+
+        response = await self.arequest(url, headers=self._conditional_headers(entry))
+        if response is None:
+            return None
+        if response.status_code == 304 and entry:
+            return await self._acache(self._reuse_cached, url, entry, 'not_modified')
+
+        text = response.text
+        page = self.parse_page(text, url)
+        if self.renderer and self._needs_browser(text, page, response.headers.get('Content-Type')):
+            rendered = await self._arender(url)
+            if rendered is not None:
+                text, page = rendered, self.parse_page(rendered, url)
+        # The rendered page is what gets cached, so a 304 on a recrawl does not render it again.
+        return await self._acache(self._parse_response, url, text, response.headers, page)
+
+    async def _acache(self, func, *args):
+        # HTTP cache reads and writes go to SQLite, which can wait on another crawl's writes; keep them off the loop.
+        if self.http_cache is None:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    @staticmethod
+    def _needs_browser(html: str, page: dict, content_type: str | None) -> bool:
+        """
+        True when an HTML page fetched over HTTP looks script-rendered: no
+        text at all, or short text and raw HTML that `classify_page` calls
+        dynamic (or, for very short text, does not call static). Text-rich
+        pages are kept without classifying them. The classifier reuses the
+        extracted page and only scans the HTML, so it is cheap enough to run
+        on the event loop.
+        """
+        if content_type and 'html' not in content_type.lower():
+            return False
+        text_length = len(page['cleanedData'])
+        if not text_length:
+            return True
+        if text_length >= RICH_TEXT:
+            return False
+        dynamic = classify_page(html, page)['dynamic']
+        return dynamic is True or (dynamic is None and text_length < MIN_TEXT)
+
+    async def _arender(self, url: str) -> str | None:
+        """The page's HTML as rendered by the renderer's browser pool, or None to keep the HTTP copy."""
+        self.escalations['escalated'] += 1
+        try:
+            return await asyncio.wrap_future(self.renderer.render(url))
+        except Exception as e:
+            logger.warning(f"Browser fallback failed for {url} - {e}. Keeping the HTTP copy")
+            self.escalations['failed'] += 1
+            return None
+
+    def crawl_stats(self) -> dict:
+        stats = super().crawl_stats()
+        stats["browser_escalation"] = self.escalation_stats() if self.renderer else None
+        return stats
+
+    def escalation_stats(self) -> dict:
+        stats = {
+            "escalated": self.escalations['escalated'],
+            "failed": self.escalations['failed'],
+            "browser_pool": self.renderer.pool_stats,
+        }
+        logger.info(
+            f"Browser escalation - Escalated - {stats['escalated']} of {self.cache_stats['fetched']} fetched - "
+            f"Failed - {stats['failed']}"
+        )
+        return stats
+
+    async def _arecord_page(self, data: list, page: dict):
+        """
+        `_record_page` for the event loop. The page sink blocks while a
+        PageStream is full and the progress callback may write to Mongo, so
+        both run in a thread; the loop keeps serving the other fetches.
+        """
+        if self.page_sink:
+            await asyncio.to_thread(self.page_sink, page)
+        else:
+            data.append(page)
+        self.pages_recorded += 1
+        if self.progress_callback:
+            await asyncio.to_thread(self.progress_callback, self.pages_recorded)
+
+    @staticmethod
+    def _skip_reason(url: str) -> str | None:
+        path = urlparse(url).path.lower()
+        if 'ebook' in url or 'download' in url or path.endswith(DOC_EXTENSIONS):
+            return "document"
+        if path.endswith(IMG_EXTENSIONS):
+            return "image"
+        return None
+
+    async def _crawl(self, seed_urls, filename: str, follow_links: bool, base_url: str = None):
+        queue = asyncio.Queue()
+        results = []
+        pdf_urls = []
+        errored_urls = []
+
+        seed_origins = set()
+
+        def enqueue(url: str):
+            if not self.stopped() and self.deduplicator.add_url(url):
+                queue.put_nowait(url)
+                if self.checkpoint:
+                    self.checkpoint.queued(url)
+
+        # A resumed crawl starts from its checkpointed frontier, with its pages already recorded.
+        if self.checkpoint:
+            for url in await asyncio.to_thread(
+                self.checkpoint.replay, self.deduplicator, lambda page: self._record_page(results, page), pdf_urls
+            ):
+                queue.put_nowait(url)
+                seed_origins.add(urljoin(url, "/"))
+
+        for url in seed_urls:
+            url = self._ensure_scheme(urljoin(base_url, url) if base_url else url)
+            enqueue(url)
+            seed_origins.add(urljoin(url, "/"))
+
+        # Links stay on the seeds' hosts, so robots.txt is loaded up front instead of on the loop.
+        if self.respect_robots:
+            for origin in seed_origins:
+                await asyncio.to_thread(self.load_robots, origin)
+
+        async def process(url: str) -> tuple[str, dict | None]:
+            """Returns the URL's checkpoint status and the page recorded for it, if any."""
+            skip_reason = self._skip_reason(url)
+            if skip_reason == "document":
+                logger.info(f"Skipping document/download - {url}")
+                pdf_urls.append(url)
+                return "document", None
+            if skip_reason == "image":
+                logger.info(f"Skipping image - {url}")
+                return "image", None
+            if not self.is_allowed(url):
+                return "skipped", None
+
+            page = await self.afetch_page(url)
+            if page is None:
+                errored_urls.append(url)
+                return "errored", None
+            scraped_data = self.to_scraped_data(page)
+            if scraped_data:
+                await self._arecord_page(results, scraped_data)
+
+            if follow_links:
+                for new_url in page['links']:
+                    enqueue(new_url)
+            return ("page", scraped_data) if scraped_data else ("empty", None)
+
+        async def worker():
+            while True:
+                url = await queue.get()
+                try:
+                    if url is None:
+                        return
+                    if self.stopped():
+                        # Drain the frontier unfetched; the checkpoint still has these URLs queued.
+                        continue
+                    try:
+                        status, page = await process(url)
+                    except Exception as e:
+                        logger.error(f"Error processing url {url}: {e}")
+                        errored_urls.append(url)
+                        status, page = "errored", None
+                    if self.checkpoint:
+                        self.checkpoint.processed(url, status, page)
+                finally:
+                    queue.task_done()
+
+        start_time = time.time()
+        async with self:
+            workers = [asyncio.create_task(worker()) for _ in range(self.max_concurrency)]
+            await queue.join()
+            for _ in workers:
+                queue.put_nowait(None)
+            await asyncio.gather(*workers)
+
+        time_taken = time.time() - start_time
+        logger.info(
+            f"{'Stopped after crawling' if self.stopped() else 'Crawled'} {self.pages_recorded} pages "
+            f"in {time_taken:.2f} seconds - "
+            f"{self.pages_recorded / max(time_taken, 1e-6):.1f} pages/sec - "
+            f"Errored - {len(errored_urls)} - HTTP/2 - {self.http2} - "
+            f"Concurrency - {self.max_concurrency} global, {self.per_host_concurrency} per host"
+        )
+        return self._save_scrape_results(
+            filename, results, pdf_urls, errored_urls, save_data=self.page_sink is None
+        )
+
+    async def scrape_entire_website_with_main_url_async(self, main_url: str, filename: str, max_workers: int = None):
+        if max_workers:
+            self.max_concurrency = max_workers
+        logger.info(f"Scraping the main entry point: {main_url}")
+        return await self._crawl([main_url], filename, follow_links=True)
+
+    async def scrape_using_sitemap_urls_async(self, main_list_of_urls, filename: str):
+        return await self._crawl(main_list_of_urls, filename, follow_links=False)
@@ -0,0 +1,77 @@
+import threading
+from collections import Counter
+
+from apps.crawlers import logger
+from apps.crawlers.extractors import normalize_text
+from libs.config import CRAWL_BOILERPLATE_MIN_PAGES, CRAWL_BOILERPLATE_MIN_RATIO
+
+
+class BoilerplateFilter:
+    """
+    Site-level boilerplate detector. Counts on how many pages of the crawl
+    each text line (an extractor's text node) appears, and strips a line from
+    a page once it has been seen on at least `min_pages` pages and on at least
+    `min_ratio` of the pages so far. Pages stream straight into training, so
+    the decision is made online: the first pages keep the site chrome, which
+    leaves one copy of the footer and contact details in the index.
+    """
+
+    def __init__(self, min_pages: int = CRAWL_BOILERPLATE_MIN_PAGES, min_ratio: float = CRAWL_BOILERPLATE_MIN_RATIO):
+        self.min_pages = min_pages
+        self.min_ratio = min_ratio
+        self.line_pages = Counter()
+        self.pages = 0
+        self.pages_changed = 0
+        self.pages_emptied = 0
+        self.bytes_in = 0
+        self.bytes_removed = 0
+        self._lock = threading.Lock()
+
+    def filter(self, page: dict) -> dict:
+        """Returns a copy of `page` with boilerplate lines removed from data and cleanedData."""
+        lines = page.get('lines')
+        if not lines:
+            return page
+
+        with self._lock:
+            self.pages += 1
+            self.line_pages.update({hash(line) for line in lines})
+            threshold = max(self.min_pages, self.min_ratio * self.pages)
+            kept_lines = [line for line in lines if self.line_pages[hash(line)] < threshold]
+
+            bytes_before = len(page['cleanedData'].encode('utf-8'))
+            self.bytes_in += bytes_before
+            if len(kept_lines) == len(lines):
+                return page
+
+            text, cleaned_text = normalize_text(" ".join(kept_lines))
+            self.bytes_removed += bytes_before - len(cleaned_text.encode('utf-8'))
+            self.pages_changed += 1
+            if not cleaned_text:
+                self.pages_emptied += 1
+
+        return {**page, 'data': text, 'cleanedData': cleaned_text, 'lines': kept_lines}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pages": self.pages,
+                "pages_changed": self.pages_changed,
+                "pages_emptied": self.pages_emptied,
+                "bytes_in": self.bytes_in,
+                "bytes_removed": self.bytes_removed,
+                "removed_ratio": round(self.bytes_removed / self.bytes_in, 4) if self.bytes_in else 0.0,
+                "boilerplate_lines": sum(
+                    1 for count in self.line_pages.values()
+                    if count >= max(self.min_pages, self.min_ratio * self.pages)
+                ),
+            }
+
+    def log_stats(self):
+        stats = self.stats()
+        logger.info(
+            f"Boilerplate removed - {stats['bytes_removed'] / 1024:.1f} KB of {stats['bytes_in'] / 1024:.1f} KB "
+            f"({stats['removed_ratio']:.1%}) - Pages Changed - {stats['pages_changed']}/{stats['pages']} - "
+            f"Pages Emptied - {stats['pages_emptied']} - Boilerplate Lines - {stats['boilerplate_lines']}"
+        )
+        return stats
@@ -0,0 +1,139 @@
+import queue
+import threading
+
+from selenium.common.exceptions import WebDriverException
+
+from apps.crawlers import logger
+from libs.config import CRAWL_BROWSER_POOL_SIZE, CRAWL_BROWSER_RECYCLE_PAGES
+
+
+class PooledDriver:
+    """
+    One worker's browser. Started on first use, replaced after
+    `recycle_after` pages to bound Chrome's memory growth, and restarted when
+    it stops responding.
+    """
+
+    def __init__(self, driver_factory, recycle_after: int, name: str):
+        self.driver_factory = driver_factory
+        self.recycle_after = recycle_after
+        self.name = name
+        self.driver = None
+        self.pages = 0
+        self.recycles = 0
+        self.restarts = 0
+
+    def get(self):
+        if self.driver is None:
+            logger.debug(f"[{self.name}] Starting browser")
+            self.driver = self.driver_factory()
+        return self.driver
+
+    def page_done(self):
+        self.pages += 1
+        if self.recycle_after and self.pages % self.recycle_after == 0:
+            logger.debug(f"[{self.name}] Recycling browser after {self.pages} pages")
+            self.quit()
+            self.recycles += 1
+
+    def is_alive(self) -> bool:
+        if self.driver is None:
+            return False
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except WebDriverException:
+            return False
+
+    def restart(self):
+        logger.warning(f"[{self.name}] Browser stopped responding. Restarting it")
+        self.quit()
+        self.restarts += 1
+
+    def quit(self):
+        if self.driver is None:
+            return
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.debug(f"[{self.name}] Error quitting browser - {e}")
+        self.driver = None
+
+
+class BrowserPool:
+    """
+    Crawls a shared frontier with `size` browsers, one worker thread each.
+    `run` calls `process(driver, url)` for every URL put on the frontier
+    (process may put more) until it drains. A URL whose browser crashed is
+    retried once on a fresh browser; other failures go to `on_error`. An
+    already running `warm_driver` is adopted by the first worker. `start`
+    and `stop` keep the workers serving a frontier that is fed from outside
+    for as long as the caller needs them; browsers start on first use.
+    """
+
+    def __init__(
+        self,
+        driver_factory,
+        size: int = CRAWL_BROWSER_POOL_SIZE,
+        recycle_after: int = CRAWL_BROWSER_RECYCLE_PAGES,
+        warm_driver=None,
+    ):
+        self.size = max(size, 1)
+        self.drivers = [PooledDriver(driver_factory, recycle_after, f"Browser-{i + 1}") for i in range(self.size)]
+        self.drivers[0].driver = warm_driver
+        self._frontier = None
+        self._threads = []
+
+    def _worker(self, slot: PooledDriver, frontier: queue.Queue, process, on_error):
+        while True:
+            url = frontier.get()
+            try:
+                if url is None:
+                    return
+                for attempt in (1, 2):
+                    try:
+                        process(slot.get(), url)
+                        slot.page_done()
+                        break
+                    except WebDriverException:
+                        if attempt == 2 or slot.is_alive():
+                            raise
+                        slot.restart()
+            except Exception as e:
+                on_error(url, e)
+            finally:
+                frontier.task_done()
+
+    def start(self, frontier: queue.Queue, process, on_error):
+        self._frontier = frontier
+        self._threads = [
+            threading.Thread(target=self._worker, args=(slot, frontier, process, on_error), name=slot.name)
+            for slot in self.drivers
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self):
+        """Lets the workers finish what is already queued, then quits every browser."""
+        for _ in self._threads:
+            self._frontier.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        for slot in self.drivers:
+            slot.quit()
+
+    def run(self, frontier: queue.Queue, process, on_error):
+        self.start(frontier, process, on_error)
+        try:
+            frontier.join()
+        finally:
+            self.stop()
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "pages": sum(slot.pages for slot in self.drivers),
+            "recycles": sum(slot.recycles for slot in self.drivers),
+            "restarts": sum(slot.restarts for slot in self.drivers),
+        }
@@ -0,0 +1,165 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from apps.crawlers import logger
+from libs.config import CRAWL_CHECKPOINT_INTERVAL
+from libs.enums import CrawlStrategy
+
+DOCUMENTS_DIR = Path(__file__).resolve().parent.parent.parent / 'documents'
+
+
+def crawl_directory(filename: str) -> Path:
+    """Directory in the documents directory holding one crawl's results and checkpoint."""
+    return DOCUMENTS_DIR / filename
+
+
+class CrawlCheckpoint:
+    """
+    Append-only JSONL log of a crawl, next to its results: a `start` event
+    with the crawl strategy, a `queued` event per URL added to the frontier
+    and a `done` event per processed URL, carrying the stored page if any
+    and `store_pages` is set. Crawls streaming to a page sink leave it off:
+    their pages have already gone downstream (training tracks what it
+    embedded in its chunk manifest and keeps it when resuming), and the log
+    must not become a second copy of the site on disk. Events are buffered and fsynced at
+    most every `flush_interval` seconds, so a crash loses only the last few
+    seconds of work. Replaying the log gives back the seen set, the pages
+    (when stored) and the frontier (queued and not done, plus URLs that
+    errored) for `crawl_website(..., resume=True)`. A crawl that finishes
+    deletes its log; there is nothing left to resume.
+    """
+
+    FILE_NAME = "checkpoint.jsonl"
+
+    def __init__(self, filename: str, flush_interval: float = CRAWL_CHECKPOINT_INTERVAL, store_pages: bool = True):
+        self.path = crawl_directory(filename) / self.FILE_NAME
+        self.flush_interval = flush_interval
+        self.store_pages = store_pages
+        self.strategy = None
+        self.resumed = False
+        self.finished = False
+        self.seen = {}
+        self.done = {}
+        self.pages = []
+        self._buffer = []
+        self._file = None
+        self._last_flush = time.time()
+        self._lock = threading.Lock()
+
+    def load(self) -> bool:
+        """Replays an existing log. Returns False when there is nothing to resume."""
+        if not self.path.exists():
+            return False
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A line cut short by the crash that we are resuming from.
+                    continue
+                kind = event.get('event')
+                if kind == 'start':
+                    self.strategy = CrawlStrategy(event['strategy'])
+                    self.finished = False
+                elif kind == 'queued':
+                    self.seen[event['url']] = None
+                elif kind == 'done':
+                    self.done[event['url']] = event['status']
+                    if event.get('page'):
+                        self.pages.append(event['page'])
+                elif kind == 'finished':
+                    self.finished = True
+
+        self.resumed = self.strategy is not None
+        if self.resumed:
+            logger.info(
+                f"Resuming crawl from {self.path} - Strategy - {self.strategy.value} - Seen - {len(self.seen)} - "
+                f"Done - {len(self.done)} - Pages - {len(self.pages)} - Finished - {self.finished}"
+            )
+        return self.resumed
+
+    def frontier(self) -> list[str]:
+        """URLs still to fetch: queued but not processed, and the ones that errored last time."""
+        return [url for url in self.seen if self.done.get(url) in (None, 'errored')]
+
+    def replay(self, deduplicator, record_page, pdf_urls: list) -> list[str]:
+        """
+        Restores a loaded log into a crawler: marks every seen URL, re-records
+        the stored pages, if the log has them (so they reach the results and
+        the near-duplicate index again), and returns the frontier.
+        """
+        if not self.resumed:
+            return []
+        for url in self.seen:
+            deduplicator.add_url(url)
+        for page in self.pages:
+            deduplicator.find_duplicate(page['url'], page['cleanedData'])
+            record_page(page)
+        pdf_urls.extend(url for url, status in self.done.items() if status == 'document')
+        return self.frontier()
+
+    def start(self, strategy: CrawlStrategy):
+        """Opens the log, appending to a loaded one, or starting over."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.resumed:
+            self._file = open(self.path, 'a', encoding='utf-8')
+            if self.path.stat().st_size and not self.path.read_bytes().endswith(b'\n'):
+                self._file.write('\n')
+        else:
+            self._file = open(self.path, 'w', encoding='utf-8')
+        self.strategy = strategy
+        self._append({'event': 'start', 'strategy': strategy.value, 'at': time.time()}, force_flush=True)
+
+    def queued(self, url: str):
+        self._append({'event': 'queued', 'url': url})
+
+    def processed(self, url: str, status: str, page: dict | None = None):
+        """Logs a processed URL. `status` is one of page, empty, document, image, skipped or errored."""
+        event = {'event': 'done', 'url': url, 'status': status}
+        if page and self.store_pages:
+            event['page'] = page
+        self._append(event)
+
+    def _append(self, event: dict, force_flush: bool = False):
+        with self._lock:
+            self._buffer.append(json.dumps(event, ensure_ascii=False))
+            due = force_flush or time.time() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            if self._file is None:
+                return
+            if self._buffer:
+                self._file.write('\n'.join(self._buffer) + '\n')
+                self._buffer.clear()
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._last_flush = time.time()
+
+    def finish(self):
+        """Closes and deletes the log of a crawl that completed."""
+        self._append({'event': 'finished', 'at': time.time()})
+        self.close()
+        self.finished = True
+        self.path.unlink(missing_ok=True)
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def stats(self) -> dict:
+        return {
+            "path": str(self.path),
+            "strategy": self.strategy.value if self.strategy else None,
+            "resumed": self.resumed,
+            "restored_pages": len(self.pages),
+        }
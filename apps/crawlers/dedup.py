@@ -0,0 +1,156 @@
+import hashlib
+import re
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+from apps.crawlers import logger
+from libs.config import CRAWL_DEDUPLICATE, CRAWL_SIMHASH_DISTANCE
+
+# Query parameters that never change the content of a page.
+IGNORED_QUERY_PARAMS = {
+    "gclid", "dclid", "fbclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid", "_ga", "_gl",
+    "ref", "ref_src", "replytocom", "sessionid", "sid", "phpsessid", "jsessionid", "print",
+}
+IGNORED_QUERY_PREFIXES = ("utm_",)
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Maps URL variants of the same page to one key: lower-cases scheme and
+    host, drops default ports, fragments, tracking and session parameters,
+    sorts the remaining query and strips trailing slashes and duplicate
+    slashes from the path.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    path = re.sub(r"/{2,}", "/", parts.path) or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in IGNORED_QUERY_PARAMS and not key.lower().startswith(IGNORED_QUERY_PREFIXES)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+def simhash(text: str, shingle_size: int = 3) -> int | None:
+    """
+    64-bit SimHash over word shingles. Near-identical texts get fingerprints a
+    few bits apart. Returns None for texts too short to fingerprint reliably.
+    """
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < shingle_size * 5:
+        return None
+
+    shingles = (" ".join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1))
+    hashes = np.fromiter(
+        (hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest() for shingle in shingles),
+        dtype="S8",
+    ).view(np.uint8).reshape(-1, 8)
+    bits = np.unpackbits(hashes, axis=1)
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > len(hashes)
+    return int.from_bytes(np.packbits(majority).tobytes(), "big")
+
+
+class CrawlDeduplicator:
+    """
+    Per-crawl frontier and content de-duplication. `add_url` claims a URL by
+    its canonical form so variants are fetched once. `find_duplicate`
+    compares a page's SimHash with earlier pages. The 64 bits are split into
+    `max_distance + 1` bands, so any fingerprint within `max_distance` bits
+    shares at least one band exactly and only pages in matching bands are
+    compared.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = CRAWL_DEDUPLICATE,
+        max_distance: int = CRAWL_SIMHASH_DISTANCE,
+        max_report: int = 100,
+    ):
+        self.enabled = enabled
+        self.max_distance = max_distance
+        self.max_report = max_report
+        self.bands = max_distance + 1
+        self.band_bits = 64 // self.bands
+        self.urls = {}
+        self.variants = set()
+        self.band_index = [{} for _ in range(self.bands)]
+        self.urls_collapsed = 0
+        self.pages_collapsed = 0
+        self.collapsed = []
+        self._lock = threading.Lock()
+
+    def canonical_url(self, url: str) -> str:
+        return canonicalize_url(url) if self.enabled else url
+
+    def add_url(self, url: str) -> bool:
+        """Returns True the first time a page is seen, False for repeats and URL variants of it."""
+        key = self.canonical_url(url)
+        with self._lock:
+            first_url = self.urls.get(key)
+            if first_url is None:
+                self.urls[key] = url
+                return True
+            if first_url != url and url not in self.variants:
+                self.variants.add(url)
+                self.urls_collapsed += 1
+                self._report(url, first_url, "url")
+            return False
+
+    def _bands(self, fingerprint: int):
+        mask = (1 << self.band_bits) - 1
+        for band in range(self.bands):
+            yield band, (fingerprint >> (band * self.band_bits)) & mask
+
+    def find_duplicate(self, url: str, text: str) -> str | None:
+        """Returns the URL of an earlier near-identical page, or registers this page and returns None."""
+        if not self.enabled:
+            return None
+        fingerprint = simhash(text)
+        if fingerprint is None:
+            return None
+
+        with self._lock:
+            for band, value in self._bands(fingerprint):
+                for other_fingerprint, other_url in self.band_index[band].get(value, ()):
+                    if (fingerprint ^ other_fingerprint).bit_count() <= self.max_distance:
+                        self.pages_collapsed += 1
+                        self._report(url, other_url, "content")
+                        return other_url
+
+            for band, value in self._bands(fingerprint):
+                self.band_index[band].setdefault(value, []).append((fingerprint, url))
+        return None
+
+    def _report(self, url: str, duplicate_of: str, reason: str):
+        if len(self.collapsed) < self.max_report:
+            self.collapsed.append({"url": url, "duplicate_of": duplicate_of, "reason": reason})
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "unique_urls": len(self.urls),
+                "urls_collapsed": self.urls_collapsed,
+                "pages_collapsed": self.pages_collapsed,
+                "examples": list(self.collapsed),
+            }
+
+    def log_stats(self) -> dict:
+        stats = self.stats()
+        logger.info(
+            f"Duplicates collapsed - URL Variants - {stats['urls_collapsed']} - "
+            f"Near Duplicate Pages - {stats['pages_collapsed']} - Unique URLs - {stats['unique_urls']}"
+        )
+        return stats
@@ -0,0 +1,299 @@
+import importlib.util
+import re
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from apps.crawlers import logger
+from libs.config import CRAWL_EXTRACTOR, CRAWL_MAIN_CONTENT
+from libs.enums import ExtractorType
+
+# Never visible text, dropped by every engine.
+NON_TEXT_TAGS = ("script", "style", "noscript", "template", "svg", "canvas", "iframe")
+# Site chrome dropped in main-content mode. <header> is kept inside <main>/<article>,
+# where it usually holds the page heading.
+BOILERPLATE_TAGS = ("nav", "footer", "aside", "form", "button", "select")
+BOILERPLATE_ROLES = {"navigation", "banner", "contentinfo", "complementary", "search", "dialog"}
+# A whole class or id token naming site chrome: the chrome word, optionally with a placement prefix
+# (site-footer, main-nav) and a part suffix (footer-links, cookie-banner). Tokens that merely contain
+# the word, like no-sidebar or has-related-posts, describe content and are kept.
+_BOILERPLATE_TOKEN_RE = re.compile(
+    r"(?:(?:site|main|page|global|top|bottom|primary|secondary|mobile|sticky|header|footer)[_-])?"
+    r"(?:nav|navbar|navigation|menu|footer|header|breadcrumbs?|sidebar|cookies?|consent|gdpr|banner|social|"
+    r"share|sharing|newsletter|subscribe|popup|modal|advert|ads|promo|related|skip-link)"
+    r"(?:[_-](?:bar|menu|nav|links?|list|wrapper|container|area|widget|section|inner|box|block|buttons?|"
+    r"icons?|banner|notice|popup|signup|form|posts|articles|items|consent))?",
+    re.IGNORECASE,
+)
+# An element holding more than this share of the content root's text is content, whatever its name says.
+MAIN_CONTENT_SHARE = 0.5
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(raw_text: str) -> tuple[str, str]:
+    """Returns (text, cleaned_text): text with control characters stripped, and with whitespace collapsed."""
+    text = raw_text.strip().replace('\n', '').replace('\t', '').replace(
+        '\r',
+        ''
+    ).replace('\v', '').replace('\f', '').replace('\xa0', '')
+    cleaned_text = _WHITESPACE_RE.sub(' ', raw_text.strip())
+    return text, cleaned_text
+
+
+def filter_links(hrefs, url: str) -> set[str]:
+    """Resolves hrefs against `url` and keeps the http(s) ones on the same host."""
+    base_netloc = urlparse(url).netloc
+
+    found_urls = set()
+    for href in hrefs:
+        # Join the URL to make it absolute
+        abs_url = urljoin(url, href)
+        # Parse it again to check the domain
+        parsed_abs = urlparse(abs_url)
+
+        # Check if it's an http/https URL and belongs to the same domain
+        if parsed_abs.scheme in ['http', 'https'] and parsed_abs.netloc == base_netloc:
+            found_urls.add(abs_url)
+
+    return found_urls
+
+
+def _has_boilerplate_token(value: str | None) -> bool:
+    return bool(value) and any(_BOILERPLATE_TOKEN_RE.fullmatch(token) for token in value.split())
+
+
+def is_boilerplate(class_name: str | None, element_id: str | None, role: str | None, aria_hidden: str | None) -> bool:
+    if (role or "").strip().lower() in BOILERPLATE_ROLES:
+        return True
+    if (aria_hidden or "").strip().lower() == "true":
+        return True
+    return _has_boilerplate_token(class_name) or _has_boilerplate_token(element_id)
+
+
+def text_length(strings) -> int:
+    return sum(len(string.strip()) for string in strings)
+
+
+def is_main_content(length: int, root_length: int, has_heading: bool) -> bool:
+    """
+    Guards main-content mode against dropping the content itself: an element
+    holding the page's main heading (<h1>) or most of its text is kept even
+    when its tag or name looks like site chrome.
+    """
+    return has_heading or length > MAIN_CONTENT_SHARE * root_length
+
+
+class HTMLExtractor:
+    """
+    Turns raw HTML into the page dict the crawlers store: title, text,
+    cleaned text and same-site links, plus `lines`, the page's text nodes,
+    for site-level boilerplate detection. Links always come from the whole
+    document so navigation keeps feeding the crawl, even when `main_content`
+    strips it from the text.
+    """
+
+    name = None
+
+    def __init__(self, main_content: bool = CRAWL_MAIN_CONTENT):
+        self.main_content = main_content
+
+    def extract(self, html: str, url: str) -> dict:
+        raise NotImplementedError
+
+    @staticmethod
+    def _page(url: str, title: str | None, strings, links: set) -> dict:
+        lines = [line for line in (string.strip() for string in strings) if line]
+        text, cleaned_text = normalize_text(" ".join(lines))
+        return {
+            'url': url,
+            'title': title.strip() if title and title.strip() else None,
+            'data': text,
+            'cleanedData': cleaned_text,
+            'lines': lines,
+            'links': links,
+        }
+
+
+class SoupExtractor(HTMLExtractor):
+    """BeautifulSoup with the stdlib parser. Slowest, but has no native dependency."""
+
+    name = ExtractorType.SOUP
+
+    def extract(self, html: str, url: str) -> dict:
+        soup = BeautifulSoup(html, 'html.parser')
+        title = soup.title.string if soup.title else None
+        links = filter_links((a['href'] for a in soup.find_all('a', href=True)), url)
+
+        for tag in soup(NON_TEXT_TAGS):
+            tag.decompose()
+
+        if not self.main_content:
+            return self._page(url, title, (soup.body or soup).stripped_strings, links)
+
+        root = soup.find('main') or soup.find(attrs={'role': 'main'})
+        if root is None:
+            articles = soup.find_all('article')
+            root = articles[0] if len(articles) == 1 else (soup.body or soup)
+        drop_tags = BOILERPLATE_TAGS if root.name in ('main', 'article') else BOILERPLATE_TAGS + ('header',)
+
+        root_length = text_length(root.strings)
+
+        def drop(tag):
+            if not tag.decomposed and not is_main_content(
+                text_length(tag.strings), root_length, tag.name == 'h1' or tag.find('h1') is not None
+            ):
+                tag.decompose()
+
+        for tag in root.find_all(drop_tags):
+            drop(tag)
+        for tag in root.find_all(
+            lambda t: t.attrs and is_boilerplate(
+                " ".join(t.get('class') or []), t.get('id'), t.get('role'), t.get('aria-hidden')
+            )
+        ):
+            drop(tag)
+
+        return self._page(url, title, root.stripped_strings, links)
+
+
+class LxmlExtractor(HTMLExtractor):
+    """libxml2's HTML parser through lxml, several times faster than html.parser."""
+
+    name = ExtractorType.LXML
+
+    def __init__(self, main_content: bool = CRAWL_MAIN_CONTENT):
+        super().__init__(main_content=main_content)
+        from lxml import html as lxml_html
+        from lxml.etree import ParserError
+
+        self._html = lxml_html
+        self._parser_error = ParserError
+
+    def extract(self, html: str, url: str) -> dict:
+        try:
+            document = self._html.document_fromstring(html)
+        except (self._parser_error, ValueError):
+            # Empty documents, or str input that carries an XML encoding declaration.
+            if not html or not html.strip():
+                return self._page(url, None, [], set())
+            document = self._html.document_fromstring(html.encode("utf-8"))
+
+        title = document.findtext('.//title')
+        links = filter_links((a.get('href') for a in document.iter('a') if a.get('href')), url)
+
+        for element in document.xpath('//comment() | //processing-instruction()'):
+            if element.getparent() is not None:
+                element.drop_tree()
+        for element in list(document.iter(*NON_TEXT_TAGS)):
+            element.drop_tree()
+
+        root = document.body if document.find('body') is not None else document
+        if self.main_content:
+            candidates = document.xpath('//main | //*[@role="main"]')
+            if not candidates:
+                articles = document.xpath('//article')
+                candidates = articles if len(articles) == 1 else []
+            if candidates:
+                root = candidates[0]
+            drop_tags = BOILERPLATE_TAGS if root.tag in ('main', 'article') else BOILERPLATE_TAGS + ('header',)
+
+            root_length = text_length(root.itertext())
+
+            def drop(element):
+                if not is_main_content(
+                    text_length(element.itertext()), root_length,
+                    element.tag == 'h1' or element.find('.//h1') is not None,
+                ):
+                    element.drop_tree()
+
+            for element in list(root.iter(*drop_tags)):
+                if element is not root:
+                    drop(element)
+            for element in root.xpath('.//*[@class or @id or @role or @aria-hidden]'):
+                if is_boilerplate(element.get('class'), element.get('id'), element.get('role'), element.get('aria-hidden')):
+                    drop(element)
+
+        return self._page(url, title, root.itertext(), links)
+
+
+class SelectolaxExtractor(HTMLExtractor):
+    """selectolax on the lexbor engine, the fastest of the three."""
+
+    name = ExtractorType.SELECTOLAX
+
+    def __init__(self, main_content: bool = CRAWL_MAIN_CONTENT):
+        super().__init__(main_content=main_content)
+        from selectolax.lexbor import LexborHTMLParser
+
+        self._parser = LexborHTMLParser
+
+    @staticmethod
+    def _decompose_outermost(nodes):
+        # Decomposing a node frees its subtree, so never touch a node whose ancestor is already gone.
+        dropped = set()
+        outermost = []
+        for node in nodes:
+            parent = node.parent
+            while parent is not None and parent.mem_id not in dropped:
+                parent = parent.parent
+            if parent is None:
+                dropped.add(node.mem_id)
+                outermost.append(node)
+        for node in outermost:
+            node.decompose()
+
+    def extract(self, html: str, url: str) -> dict:
+        tree = self._parser(html)
+        title_node = tree.css_first('title')
+        title = title_node.text(strip=True) if title_node else None
+        links = filter_links(
+            (node.attributes.get('href') for node in tree.css('a[href]') if node.attributes.get('href')), url
+        )
+
+        tree.strip_tags(list(NON_TEXT_TAGS))
+        root = tree.body or tree.root
+        if root is None:
+            return self._page(url, title, [], links)
+
+        if self.main_content:
+            candidate = tree.css_first('main, [role="main"]')
+            if candidate is None:
+                articles = tree.css('article')
+                candidate = articles[0] if len(articles) == 1 else None
+            if candidate is not None:
+                root = candidate
+            drop_tags = BOILERPLATE_TAGS if root.tag in ('main', 'article') else BOILERPLATE_TAGS + ('header',)
+
+            root_length = len(root.text(strip=True))
+            self._decompose_outermost([
+                node for node in root.css(', '.join(drop_tags + ('[class]', '[id]', '[role]', '[aria-hidden]')))
+                if node.mem_id != root.mem_id and (node.tag in drop_tags or is_boilerplate(
+                    node.attributes.get('class'), node.attributes.get('id'),
+                    node.attributes.get('role'), node.attributes.get('aria-hidden'),
+                )) and not is_main_content(
+                    len(node.text(strip=True)), root_length, node.tag == 'h1' or node.css_first('h1') is not None
+                )
+            ])
+
+        return self._page(url, title, root.text(separator="\x00").split("\x00"), links)
+
+
+EXTRACTORS = {
+    ExtractorType.SOUP: (SoupExtractor, "bs4"),
+    ExtractorType.LXML: (LxmlExtractor, "lxml"),
+    ExtractorType.SELECTOLAX: (SelectolaxExtractor, "selectolax"),
+}
+
+
+def get_extractor(extractor_type: ExtractorType | str | None = None, main_content: bool | None = None) -> HTMLExtractor:
+    """Builds the requested engine, falling back to BeautifulSoup when its package is not installed."""
+    extractor_type = ExtractorType(extractor_type or CRAWL_EXTRACTOR)
+    main_content = CRAWL_MAIN_CONTENT if main_content is None else main_content
+
+    extractor_class, module_name = EXTRACTORS[extractor_type]
+    if importlib.util.find_spec(module_name) is None:
+        logger.warning(f"{module_name} is not installed. Falling back to the {ExtractorType.SOUP.value} extractor")
+        extractor_class = SoupExtractor
+
+    logger.debug(f"Using {extractor_class.name.value} extractor - Main Content - {main_content}")
+    return extractor_class(main_content=main_content)
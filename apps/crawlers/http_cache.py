@@ -0,0 +1,100 @@
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+
+from apps.crawlers import logger
+from apps.crawlers.dedup import canonicalize_url
+from libs.config import CRAWL_HTTP_CACHE_PATH
+
+
+class HttpCache:
+    """
+    On-disk cache of crawled pages for recrawls. Stores each page's
+    validators (ETag, Last-Modified), its sitemap lastmod and the page as
+    extracted, so an unchanged page costs a 304 or no request at all and is
+    not parsed again. Entries are keyed by canonical URL and by the extractor
+    that produced them; switching engines or main-content mode misses. SQLite
+    in WAL mode, like the embedding store, so concurrent crawl jobs share it.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        primary_key = {
+            name for _, name, _, _, _, pk in self._connection.execute("PRAGMA table_info(pages)") if pk
+        }
+        if primary_key and primary_key != {"url", "extractor"}:
+            # Caches written before entries were keyed per extractor; it is only a cache, so start over.
+            logger.info(f"Recreating crawl HTTP cache table with per-extractor entries - {path}")
+            self._connection.execute("DROP TABLE pages")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT NOT NULL, extractor TEXT NOT NULL, etag TEXT, last_modified TEXT, lastmod TEXT, "
+            "size INTEGER NOT NULL, page BLOB NOT NULL, fetched_at REAL NOT NULL, "
+            "PRIMARY KEY (url, extractor))"
+        )
+        self._connection.commit()
+
+    def get(self, url: str, extractor: str) -> dict | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT etag, last_modified, lastmod, size, page FROM pages WHERE url = ? AND extractor = ?",
+                (canonicalize_url(url), extractor),
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, lastmod, size, blob = row
+        page = json.loads(zlib.decompress(blob))
+        page['links'] = set(page['links'])
+        return {"etag": etag, "last_modified": last_modified, "lastmod": lastmod, "size": size, "page": page}
+
+    def set(
+        self,
+        url: str,
+        extractor: str,
+        page: dict,
+        size: int,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        lastmod: str | None = None,
+    ):
+        blob = zlib.compress(json.dumps({**page, 'links': sorted(page['links'])}).encode("utf-8"))
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO pages (url, extractor, etag, last_modified, lastmod, size, page, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (canonicalize_url(url), extractor, etag, last_modified, lastmod, size, blob, time.time()),
+            )
+            self._connection.commit()
+
+    def touch(self, url: str, extractor: str, lastmod: str | None = None):
+        """Marks a revalidated entry as fresh, recording the sitemap lastmod it was checked against."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE pages SET fetched_at = ?, lastmod = COALESCE(?, lastmod) WHERE url = ? AND extractor = ?",
+                (time.time(), lastmod, canonicalize_url(url), extractor),
+            )
+            self._connection.commit()
+
+
+_http_cache = None
+_http_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> HttpCache | None:
+    """Process-wide HTTP cache, or None when CRAWL_HTTP_CACHE_PATH is not set."""
+    global _http_cache
+    if not CRAWL_HTTP_CACHE_PATH:
+        return None
+    with _http_cache_lock:
+        if _http_cache is None:
+            logger.info(f"Opening crawl HTTP cache - {CRAWL_HTTP_CACHE_PATH}")
+            _http_cache = HttpCache(CRAWL_HTTP_CACHE_PATH)
+        return _http_cache
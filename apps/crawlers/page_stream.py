@@ -0,0 +1,56 @@
+import queue
+import threading
+
+from apps.crawlers import logger
+from libs.config import CRAWL_STREAM_QUEUE_SIZE
+
+
+class PageStream:
+    """
+    Bounded hand-off between crawler threads producing pages and a consumer
+    iterating over them. `put` blocks while the buffer is full, so a slow
+    embedder throttles the crawl instead of letting pages pile up in memory.
+    """
+
+    _DONE = object()
+
+    def __init__(self, maxsize: int = CRAWL_STREAM_QUEUE_SIZE, poll_interval: float = 0.5):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.poll_interval = poll_interval
+        self.cancelled = threading.Event()
+        self.error = None
+        self.pages = 0
+
+    def _put(self, item) -> bool:
+        # Poll instead of blocking forever so a consumer that gave up cannot wedge the crawler.
+        while not self.cancelled.is_set():
+            try:
+                self.queue.put(item, timeout=self.poll_interval)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def put(self, page: dict):
+        if self._put(page):
+            self.pages += 1
+
+    def close(self, error: Exception | None = None):
+        """Called by the producer once the crawl is over, with the error if it failed."""
+        self.error = error
+        self._put(self._DONE)
+
+    def cancel(self):
+        """Called by the consumer when it stops reading; further pages are dropped."""
+        if not self.cancelled.is_set():
+            logger.warning(f"Page stream cancelled after {self.pages} pages")
+        self.cancelled.set()
+
+    def __iter__(self):
+        while True:
+            page = self.queue.get()
+            if page is self._DONE:
+                if self.error is not None:
+                    raise self.error
+                return
+            yield page
@@ -0,0 +1,216 @@
+import asyncio
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin, urlsplit
+
+from apps.crawlers import logger
+from libs.config import CRAWL_BACKOFF_BASE, CRAWL_MAX_DELAY, CRAWL_RATE_BURST, CRAWL_RATE_LIMIT
+
+# Worth retrying. The throttling ones also pause every request to the host.
+RETRY_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+THROTTLE_STATUS_CODES = {429, 503}
+
+_SITEMAP_RE = re.compile(r'^\s*(?:#\s*)?sitemap\s*:\s*([^\s#]+)', re.IGNORECASE | re.MULTILINE)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header, given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = CRAWL_BACKOFF_BASE, cap: float = CRAWL_MAX_DELAY) -> float:
+    """Exponential backoff with full jitter: a random delay in [0, min(cap, base * 2 ** (attempt - 1))]."""
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))
+
+
+class RobotsRules:
+    """
+    Allow/Disallow rules, Crawl-delay and sitemaps of one host's robots.txt.
+    Rules follow RFC 9309: the longest matching pattern wins, Allow wins
+    ties, `*` matches any run of characters and `$` anchors the end. Empty
+    rules (no robots.txt, or an unreachable one) allow everything.
+    """
+
+    def __init__(self, rules: list | None = None, crawl_delay: float | None = None, sitemaps: list | None = None):
+        self.rules = rules or []
+        self.crawl_delay = crawl_delay
+        self.sitemaps = sitemaps or []
+
+    @staticmethod
+    def _compile(pattern: str):
+        regex = re.escape(pattern).replace(r"\*", ".*")
+        if regex.endswith(r"\$"):
+            regex = regex[:-2] + "$"
+        return re.compile(regex)
+
+    @classmethod
+    def parse(cls, text: str, origin: str, user_agent: str = "*") -> "RobotsRules":
+        groups = []
+        group = None
+        for raw_line in text.splitlines():
+            line = raw_line.split("#", 1)[0].strip()
+            if ":" not in line:
+                continue
+            field, value = (part.strip() for part in line.split(":", 1))
+            field = field.lower()
+
+            if field == "user-agent":
+                # Consecutive User-agent lines share one group; one after a rule starts a new group.
+                if group is None or group["rules"] or group["crawl_delay"] is not None:
+                    group = {"agents": [], "rules": [], "crawl_delay": None}
+                    groups.append(group)
+                group["agents"].append(value.lower())
+            elif group is None:
+                continue
+            elif field in ("allow", "disallow") and value:
+                group["rules"].append((len(value), field == "allow", cls._compile(value)))
+            elif field == "crawl-delay":
+                try:
+                    group["crawl_delay"] = float(value)
+                except ValueError:
+                    pass
+
+        user_agent = user_agent.lower()
+        matched = [g for g in groups if any(agent != "*" and agent in user_agent for agent in g["agents"])]
+        if not matched:
+            matched = [g for g in groups if "*" in g["agents"]]
+
+        delays = [g["crawl_delay"] for g in matched if g["crawl_delay"] is not None]
+        sitemaps = []
+        for match in _SITEMAP_RE.finditer(text):
+            # Absolute or relative?
+            sitemap = urljoin(origin, match.group(1).strip())
+            if sitemap not in sitemaps:
+                sitemaps.append(sitemap)
+
+        return cls(
+            rules=[rule for g in matched for rule in g["rules"]],
+            crawl_delay=max(delays) if delays else None,
+            sitemaps=sitemaps,
+        )
+
+    def can_fetch(self, url: str) -> bool:
+        parts = urlsplit(url)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        if path == "/robots.txt":
+            return True
+
+        best_length, allowed = -1, True
+        for length, allow, pattern in self.rules:
+            if pattern.match(path) and (length > best_length or (length == best_length and allow)):
+                best_length, allowed = length, allow
+        return allowed
+
+
+class TokenBucket:
+    """
+    Token bucket for one host, kept as a theoretical arrival time (GCRA):
+    `reserve` books the next free slot and returns how long to wait for it,
+    so callers sleep outside the lock and in their own way (thread or loop).
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.interval = 1 / rate if rate > 0 else 0.0
+        self.burst = max(burst, 1)
+        self.next_slot = 0.0
+        self.paused_until = 0.0
+
+    @property
+    def tolerance(self) -> float:
+        return self.interval * (self.burst - 1)
+
+    def set_min_interval(self, seconds: float):
+        # Crawl-delay means one request per delay, no bursts.
+        if seconds > self.interval:
+            self.interval = seconds
+            self.burst = 1
+
+    def pause(self, until: float):
+        self.paused_until = max(self.paused_until, until)
+        # Restart slowly after the pause instead of releasing a burst into the same limit.
+        self.next_slot = max(self.next_slot, until + self.tolerance)
+
+    def reserve(self, now: float) -> float:
+        slot = max(self.next_slot, now)
+        start = max(slot - self.tolerance, self.paused_until, now)
+        self.next_slot = max(slot, start) + self.interval
+        return start - now
+
+
+class HostRateLimiter:
+    """
+    Per-host request rate limiter shared by a crawler's workers. Each host
+    gets a `TokenBucket` of `rate` requests per second with bursts of `burst`,
+    slowed to the host's robots.txt Crawl-delay, and paused for everyone when
+    the host answers 429/503 with or without a Retry-After. A `rate` of 0
+    disables the steady limit but keeps Crawl-delay and pauses.
+    """
+
+    def __init__(self, rate: float = CRAWL_RATE_LIMIT, burst: int = CRAWL_RATE_BURST, max_delay: float = CRAWL_MAX_DELAY):
+        self.rate = rate
+        self.burst = burst
+        self.max_delay = max_delay
+        self.buckets = {}
+        self.throttled = 0
+        self.wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        if host not in self.buckets:
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return self.buckets[host]
+
+    def set_crawl_delay(self, url: str, seconds: float):
+        if seconds > self.max_delay:
+            logger.warning(f"Crawl-delay of {seconds}s for {urlsplit(url).netloc} capped to {self.max_delay}s")
+            seconds = self.max_delay
+        with self._lock:
+            self._bucket(url).set_min_interval(seconds)
+        logger.info(f"Honoring Crawl-delay of {seconds}s for {urlsplit(url).netloc}")
+
+    def pause(self, url: str, seconds: float):
+        seconds = min(seconds, self.max_delay)
+        with self._lock:
+            self._bucket(url).pause(time.monotonic() + seconds)
+            self.throttled += 1
+        logger.warning(f"Throttled by {urlsplit(url).netloc} - pausing requests to it for {seconds:.1f}s")
+
+    def reserve(self, url: str) -> float:
+        with self._lock:
+            delay = self._bucket(url).reserve(time.monotonic())
+            self.wait_seconds += delay
+        return delay
+
+    def acquire(self, url: str):
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self, url: str):
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "rate_limit": self.rate,
+                "crawl_delays": {
+                    host: bucket.interval for host, bucket in self.buckets.items()
+                    if bucket.interval > (1 / self.rate if self.rate > 0 else 0.0)
+                },
+                "throttled": self.throttled,
+                "wait_seconds": round(self.wait_seconds, 2),
+            }
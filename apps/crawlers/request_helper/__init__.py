@@ -1,20 +1,34 @@
 import gzip
 import io
-import asyncio
 import json
 import os
 import re
+import threading
 import time
 import xml.etree.ElementTree as ET
-from pathlib import Path
-from urllib.parse import urljoin, urlparse, urlsplit
+from collections import Counter
+from urllib.parse import urljoin, urlsplit
 
 import requests
 import urllib3
-from bs4 import BeautifulSoup
 
 from libs.constants import BASIC_HEADERS
+from libs.enums import ExtractorType
 from apps.crawlers import logger
+from apps.crawlers.boilerplate import BoilerplateFilter
+from apps.crawlers.checkpoint import CrawlCheckpoint, crawl_directory
+from apps.crawlers.dedup import CrawlDeduplicator, canonicalize_url
+from apps.crawlers.extractors import get_extractor
+from apps.crawlers.http_cache import get_http_cache
+from apps.crawlers.politeness import (
+    RETRY_STATUS_CODES,
+    THROTTLE_STATUS_CODES,
+    HostRateLimiter,
+    RobotsRules,
+    backoff_delay,
+    parse_retry_after,
+)
+from libs.config import CRAWL_MAX_RETRIES, CRAWL_RATE_LIMIT, CRAWL_REMOVE_BOILERPLATE, CRAWL_RESPECT_ROBOTS
 
 from libs.logger import color_string
 
@@ -22,16 +36,88 @@ urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
 class RequestHelper:
-    def __init__(self, proxies: dict = None, headers: dict = BASIC_HEADERS):
+    def __init__(
+        self,
+        proxies: dict = None,
+        headers: dict = BASIC_HEADERS,
+        progress_callback=None,
+        page_sink=None,
+        extractor: ExtractorType | str | None = None,
+        remove_boilerplate: bool | None = None,
+        rate_limit: float = CRAWL_RATE_LIMIT,
+        respect_robots: bool = CRAWL_RESPECT_ROBOTS,
+        checkpoint: CrawlCheckpoint | None = None,
+        stop_event: threading.Event | None = None,
+    ):
         self.session = requests.Session()
         if proxies:
             self.session.proxies.update(proxies)
         self.session.headers.update(headers)
-
-    def request(self, url: str, method: str = 'GET', timeout: int = 10,params:dict=None,payload:dict | list =None):
+        self.progress_callback = progress_callback
+        # When set, pages go straight to the sink and no scraped_data.json is written.
+        self.page_sink = page_sink
+        self.pages_recorded = 0
+        self.extractor = get_extractor(extractor)
+        if remove_boilerplate is None:
+            remove_boilerplate = CRAWL_REMOVE_BOILERPLATE
+        self.boilerplate_filter = BoilerplateFilter() if remove_boilerplate else None
+        self.deduplicator = CrawlDeduplicator()
+        self.rate_limiter = HostRateLimiter(rate=rate_limit)
+        self.respect_robots = respect_robots
+        self.robots = {}
+        self.retries = 0
+        self.robots_blocked = 0
+        self._robots_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self.http_cache = get_http_cache()
+        self.cache_stats = Counter()
+        # Cached pages are only reused by the engine and mode that extracted them.
+        self.extractor_signature = f"{self.extractor.name.value}:{'main' if self.extractor.main_content else 'full'}"
+        # Canonical URL -> <lastmod> from the sitemaps read by get_urls_from_sitemap.
+        self.sitemap_lastmod = {}
+        # Started by the caller; the crawl logs its frontier and pages to it.
+        self.checkpoint = checkpoint
+        # Set by the caller to abandon the crawl: nothing more is queued or fetched.
+        self.stop_event = stop_event
+
+    def stopped(self) -> bool:
+        return self.stop_event is not None and self.stop_event.is_set()
+
+    def _record_page(self, data: list, page: dict):
+        if self.page_sink:
+            self.page_sink(page)
+        else:
+            data.append(page)
+        self.pages_recorded += 1
+        if self.progress_callback:
+            self.progress_callback(self.pages_recorded)
+
+    def _retry_delay(
+        self, url: str, attempt: int, status_code: int | None = None, retry_after: str | None = None
+    ) -> float | None:
+        """
+        Seconds to wait before retrying, or None when the response is final
+        (a 404 will not turn into a 200). Throttling responses pause the whole
+        host through the rate limiter instead, so the other workers back off too.
+        """
+        if status_code is not None and status_code not in RETRY_STATUS_CODES:
+            return None
+        with self._stats_lock:
+            self.retries += 1
+        delay = backoff_delay(attempt)
+        if status_code in THROTTLE_STATUS_CODES:
+            self.rate_limiter.pause(url, parse_retry_after(retry_after) or delay)
+            return 0.0
+        return delay
+
+    def request(
+        self, url: str, method: str = 'GET', timeout: int = 10,params:dict=None,payload:dict | list =None,
+        headers: dict = None,
+    ):
         logger.debug(f"Requesting {url} ...")
 
-        for try_request in range(1, 5):
+        for try_request in range(1, CRAWL_MAX_RETRIES + 1):
+            self.rate_limiter.acquire(url)
             start_time = time.time()
             try:
                 response = self.session.request(
@@ -39,12 +125,14 @@ class RequestHelper:
                     url=url,
                     params=params,
                     json=payload,
+                    headers=headers,
                     verify=False,
                     timeout=timeout,
                     stream=True
                 )
                 time_taken = f'{time.time() - start_time:.2f} seconds'
-                if response.status_code == 200:
+                # 304 only comes back to conditional requests, see `fetch_page`.
+                if response.status_code in (200, 304):
                     logger.debug(
                         f'Try: {try_request}, ' 
                         f'Status Code: {response.status_code}, ' 
@@ -59,198 +147,198 @@ class RequestHelper:
                         f'Status Code: {response.status_code}, ' 
                         f'Time Taken: {color_string(time_taken)}.'
                     )
+                    response.close()
+                    delay = self._retry_delay(
+                        url, try_request, response.status_code, response.headers.get('Retry-After')
+                    )
             except Exception as err:
                 logger.error(
                     f'ERROR OCCURRED - {try_request}: Time Taken ' 
                     f"{color_string(f'{time.time() - start_time:.2f} seconds')}"
                     f', Error: {err}'
                 )
+                delay = self._retry_delay(url, try_request)
 
-        return None
+            if delay is None:
+                break
+            if try_request < CRAWL_MAX_RETRIES:
+                time.sleep(delay)
 
-    def get_list_of_urls(self, url: str):
-        response = self.request(url)
-        if response is None:
-            return None
-        
-        soup = BeautifulSoup(response.text, 'html.parser')
-        base_netloc = urlparse(url).netloc
-        
-        found_urls = set()
-        for a in soup.find_all('a', href=True):
-            href = a['href']
-            # Join the URL to make it absolute
-            abs_url = urljoin(url, href)
-            # Parse it again to check the domain
-            parsed_abs = urlparse(abs_url)
-            
-            # Check if it's an http/https URL and belongs to the same domain
-            if parsed_abs.scheme in ['http', 'https'] and parsed_abs.netloc == base_netloc:
-                found_urls.add(abs_url)
-
-        logger.debug(f'Extracted {len(found_urls)} URLs from {url}')
-        return found_urls
-
-    def get_data_from_url_using_soup(self, url: str):
-        response = self.request(url)
-        if response is None:
-            print("response is none")
-            return None, None
-        logger.debug(
-            f'Got the response for {url}, data length: {len(response.text)}'
-        )
-        soup = BeautifulSoup(response.text, 'html.parser')
-        soup_text = soup.get_text()
-        text = soup_text.strip().replace('\n', '').replace('\t', '').replace(
-            '\r',
-            ''
-        ).replace('\v', '').replace('\f', '').replace('\xa0', '')
-        cleaned_text = re.sub(r'\s+', ' ', soup_text.strip())
-        return text, cleaned_text
+        return None
 
-    def get_sitemaps_from_robots_txt(self, base_url: str) -> list[str]:
-        parsed = urlsplit(base_url)
+    def load_robots(self, url: str) -> RobotsRules:
+        """
+        Fetches and parses the robots.txt of `url`'s host once per crawl, and
+        applies its Crawl-delay to the rate limiter when robots are respected.
+        """
+        parsed = urlsplit(url)
         if not parsed.scheme or not parsed.netloc:
-            return []
-
-        origin = f"{parsed.scheme}://{parsed.netloc}/"
-        robots_url = urljoin(origin, "robots.txt")
-        logger.debug(f"Fetching robots.txt from {robots_url}")
-
-        response = self.request(robots_url)
-        if response is None or response.status_code != 200:
-            logger.warning(f"Could not fetch or access robots.txt from {robots_url}")
-            return []
+            return RobotsRules()
+
+        with self._robots_lock:
+            rules = self.robots.get(parsed.netloc)
+            if rules is not None:
+                return rules
+
+            origin = f"{parsed.scheme}://{parsed.netloc}/"
+            robots_url = urljoin(origin, "robots.txt")
+            logger.debug(f"Fetching robots.txt from {robots_url}")
+            response = self.request(robots_url)
+            if response is None:
+                logger.warning(f"Could not fetch or access robots.txt from {robots_url}")
+                rules = RobotsRules()
+            else:
+                rules = RobotsRules.parse(response.text, origin)
+                logger.debug(
+                    f"Parsed {robots_url} - {len(rules.rules)} rules, "
+                    f"Crawl-delay - {rules.crawl_delay}, Sitemaps - {len(rules.sitemaps)}"
+                )
+            if self.respect_robots and rules.crawl_delay:
+                self.rate_limiter.set_crawl_delay(robots_url, rules.crawl_delay)
+            self.robots[parsed.netloc] = rules
+        return rules
+
+    def is_allowed(self, url: str) -> bool:
+        if not self.respect_robots or self.load_robots(url).can_fetch(url):
+            return True
+        logger.debug(f"Skipping {url} - disallowed by robots.txt")
+        with self._stats_lock:
+            self.robots_blocked += 1
+        return False
+
+    def parse_page(self, html: str, url: str) -> dict:
+        """Parses a page once and returns its title, text, cleaned text and same-site links together."""
+        return self.extractor.extract(html, url)
+
+    def _cached_entry(self, url: str) -> dict | None:
+        return self.http_cache.get(url, self.extractor_signature) if self.http_cache else None
+
+    def _unchanged_since_cached(self, url: str, entry: dict | None) -> bool:
+        """True when the sitemap's lastmod for `url` is the one seen when the cached copy was fetched."""
+        lastmod = self.sitemap_lastmod.get(canonicalize_url(url))
+        return bool(entry and lastmod and entry['lastmod'] == lastmod)
 
-        pattern = re.compile(
-            r'^\s*(?:#\s*)?sitemap\s*:\s*([^\s#]+)',
-            re.IGNORECASE | re.MULTILINE
+    @staticmethod
+    def _conditional_headers(entry: dict | None) -> dict | None:
+        headers = {}
+        if entry and entry['etag']:
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers or None
+
+    def _reuse_cached(self, url: str, entry: dict, reason: str) -> dict:
+        with self._stats_lock:
+            self.cache_stats[reason] += 1
+            self.cache_stats['bytes_saved'] += entry['size']
+        if reason == 'not_modified':
+            self.http_cache.touch(url, self.extractor_signature, self.sitemap_lastmod.get(canonicalize_url(url)))
+        logger.debug(f"Reusing cached copy of {url} - {reason}")
+        return {**entry['page'], 'url': url}
+
+    def _parse_response(self, url: str, text: str, headers, page: dict | None = None) -> dict:
+        """
+        Parses a fresh response, unless the caller already did (`page`), and
+        caches the page when the server or the sitemap gave a validator.
+        """
+        if page is None:
+            page = self.parse_page(text, url)
+        with self._stats_lock:
+            self.cache_stats['fetched'] += 1
+        etag, last_modified = headers.get('ETag'), headers.get('Last-Modified')
+        lastmod = self.sitemap_lastmod.get(canonicalize_url(url))
+        if self.http_cache and (etag or last_modified or lastmod):
+            self.http_cache.set(
+                url, self.extractor_signature, page, size=len(text),
+                etag=etag, last_modified=last_modified, lastmod=lastmod,
+            )
+        logger.debug(
+            f"Got the response for {url}, data length: {len(page['data'])}, links: {len(page['links'])}"
         )
-        raw_urls = [m.group(1).strip() for m in pattern.finditer(response.text)]
-
-        sitemaps = []
-        seen = set()
-        for u in raw_urls:
-            # Absolute or relative?
-            if not urlsplit(u).scheme:
-                u = urljoin(origin, u)
-            if u not in seen:
-                seen.add(u)
-                sitemaps.append(u)
-
-        logger.debug(f"Found {len(sitemaps)} sitemap(s) in {robots_url}: {sitemaps}")
-        return sitemaps
+        return page
 
-    def _process_url(self, url: str, main_url: str = None):
+    def fetch_page(self, url: str) -> dict | None:
         """
-        Processes a single URL: constructs full URL, skips certain file types, and scrapes data.
-        Returns a tuple: (full_url, scraped_data, is_skipped)
+        Fetches and parses a page with a single request, see `parse_page`.
+        With the HTTP cache on, a page whose sitemap lastmod has not moved is
+        served from the cache without a request, and others are fetched
+        conditionally so a 304 reuses the cached extraction.
         """
-        if main_url and not str(url).startswith("http"):
-            full_url = urljoin(main_url, url)
-        else:
-            full_url = url
-        full_url = self._ensure_scheme(full_url)
-
-        logger.debug(f"Processing url - {full_url}")
-
-        path = urlparse(full_url).path.lower()
-        doc_extensions = ['.pdf', '.docx', '.doc', '.xls', '.xlsx']
-        img_extensions = ['.jpg', '.jpeg', '.png']
-
-        if 'ebook' in full_url or 'download' in full_url or any(path.endswith(ext) for ext in doc_extensions):
-            logger.info(f"Skipping document/download - {full_url}")
-            return full_url, None, True
-
-        if any(path.endswith(ext) for ext in img_extensions):
-            logger.info(f"Skipping image - {full_url}")
-            return full_url, None, True
+        entry = self._cached_entry(url)
+        if self._unchanged_since_cached(url, entry):
+            return self._reuse_cached(url, entry, 'unchanged_in_sitemap')
 
-        _data, _cleaned_data = self.get_data_from_url_using_soup(full_url)
+        response = self.request(url, headers=self._conditional_headers(entry))
+        if response is None:
+            return None
+        if response.status_code == 304 and entry:
+            return self._reuse_cached(url, entry, 'not_modified')
+        return self._parse_response(url, response.text, response.headers)
 
-        if _data:
-            scraped_data = {
-                'url': full_url,
-                'heading': full_url.split('/')[-1],
-                'data': _data,
-                'cleanedData': _cleaned_data
+    def to_scraped_data(self, page: dict | None) -> dict | None:
+        """
+        Converts a parsed page to the record stored for a crawl, after removing
+        site-wide boilerplate, or None if no text is left or the page is a
+        near-duplicate of one already stored.
+        """
+        if page and self.boilerplate_filter:
+            page = self.boilerplate_filter.filter(page)
+        if not page or not page['data']:
+            return None
+        duplicate_of = self.deduplicator.find_duplicate(page['url'], page['cleanedData'])
+        if duplicate_of:
+            logger.debug(f"Skipping {page['url']} - near duplicate of {duplicate_of}")
+            return None
+        return {
+            'url': page['url'],
+            'heading': page['title'] or page['url'].split('/')[-1],
+            'data': page['data'],
+            'cleanedData': page['cleanedData']
+        }
+
+    def crawl_stats(self) -> dict:
+        return {
+            "pages": self.pages_recorded,
+            "boilerplate": self.boilerplate_filter.log_stats() if self.boilerplate_filter else None,
+            "duplicates": self.deduplicator.log_stats(),
+            "politeness": self.politeness_stats(),
+            "http_cache": self.http_cache_stats(),
+        }
+
+    def http_cache_stats(self) -> dict:
+        with self._stats_lock:
+            stats = {
+                "enabled": self.http_cache is not None,
+                "fetched": self.cache_stats['fetched'],
+                "not_modified": self.cache_stats['not_modified'],
+                "unchanged_in_sitemap": self.cache_stats['unchanged_in_sitemap'],
+                "bytes_saved": self.cache_stats['bytes_saved'],
             }
-            return full_url, scraped_data, False
-
-        return full_url, None, False
-
-    def scrape_entire_website_with_main_url(self, main_url, filename, max_workers=10):
-        import queue
-        import threading
-
-        urls_queue = queue.Queue()
-        processed_urls = set()
-        data = []
-        pdf_urls = []
-        data_lock = threading.Lock()
-
-        def worker():
-            while True:
-                url = urls_queue.get()
-                if url is None:
-                    break  # Sentinel
-
-                try:
-                    full_url, scraped_data, is_skipped = self._process_url(url, main_url=main_url)
-
-                    if is_skipped:
-                        with data_lock:
-                            pdf_urls.append(full_url)
-                        continue
-
-                    if scraped_data:
-                        with data_lock:
-                            data.append(scraped_data)
-
-                    if not is_skipped:
-                        fresh_urls = self.get_list_of_urls(full_url)
-                        if fresh_urls:
-                            for new_url in fresh_urls:
-                                with data_lock:
-                                    if new_url not in processed_urls:
-                                        processed_urls.add(new_url)
-                                        urls_queue.put(new_url)
-                except Exception as e:
-                    logger.error(f"Error in worker processing {url}: {e}")
-                finally:
-                    urls_queue.task_done()
-
-        threads = []
-        for i in range(max_workers):
-            thread = threading.Thread(target=worker, name=f"Worker-{i+1}")
-            thread.start()
-            threads.append(thread)
-
-        initial_urls = self.get_list_of_urls(main_url)
-        if initial_urls:
-            with data_lock:
-                for url in initial_urls:
-                    if url not in processed_urls:
-                        processed_urls.add(url)
-                        urls_queue.put(url)
-        else:
-            logger.error('Failed to retrieve initial URLs')
-            # Need to stop workers if we return early
-            for _ in range(max_workers):
-                urls_queue.put(None)
-            for t in threads:
-                t.join()
-            return
-
-        urls_queue.join()
-
-        # Stop workers
-        for _ in range(max_workers):
-            urls_queue.put(None)
-        for t in threads:
-            t.join()
+        if stats["enabled"]:
+            logger.info(
+                f"HTTP cache - Fetched - {stats['fetched']} - Not Modified - {stats['not_modified']} - "
+                f"Unchanged In Sitemap - {stats['unchanged_in_sitemap']} - "
+                f"Saved - {stats['bytes_saved'] / 1024 / 1024:.2f} MB"
+            )
+        return stats
+
+    def politeness_stats(self) -> dict:
+        stats = self.rate_limiter.stats()
+        stats.update({
+            "respect_robots": self.respect_robots,
+            "robots_blocked": self.robots_blocked,
+            "retries": self.retries,
+        })
+        logger.info(
+            f"Politeness - Throttled - {stats['throttled']} - Retries - {stats['retries']} - "
+            f"Robots Blocked - {stats['robots_blocked']} - Rate Limit Wait - {stats['wait_seconds']}s"
+        )
+        return stats
 
-        return self._save_scrape_results(filename, data, pdf_urls)
+    def get_sitemaps_from_robots_txt(self, base_url: str) -> list[str]:
+        sitemaps = self.load_robots(base_url).sitemaps
+        logger.debug(f"Found {len(sitemaps)} sitemap(s) in robots.txt of {base_url}: {sitemaps}")
+        return sitemaps
 
     @staticmethod
     def clean_text_from_json(filename: str):
@@ -293,6 +381,16 @@ class RequestHelper:
                 if isinstance(el.tag, str) and el.tag.endswith("loc") and el.text:
                     yield el.text.strip()
 
+        def _iter_url_entries(root: ET.Element):
+            # (loc, lastmod) of each <url> in a urlset, lastmod is None when missing
+            for entry in root:
+                values = {}
+                for el in entry:
+                    if isinstance(el.tag, str) and el.text:
+                        values[el.tag.rsplit("}", 1)[-1].lower()] = el.text.strip()
+                if values.get("loc"):
+                    yield values["loc"], values.get("lastmod")
+
         def _parse_and_collect(url: str, depth: int):
             if url in seen_sitemaps:
                 return
@@ -315,11 +413,12 @@ class RequestHelper:
                 root_tag = root_tag.split("}", 1)[1]
 
             if root_tag == "urlset":
-                for loc in _iter_locs(root):
-                    loc = loc.strip()
+                for loc, lastmod in _iter_url_entries(root):
                     abs_url = urljoin(url, loc)  # <-- use 'url' (current sitemap), not sitemap_url
                     abs_url = self._ensure_scheme(abs_url)  # ensure https://
                     found_urls.add(abs_url)
+                    if lastmod:
+                        self.sitemap_lastmod[canonicalize_url(abs_url)] = lastmod
 
             elif root_tag == "sitemapindex":
                 for loc in _iter_locs(root):
@@ -337,108 +436,14 @@ class RequestHelper:
         logger.debug(f"Collected {len(found_urls)} URLs from sitemap(s)")
         return found_urls
 
-    async def scrape_entire_website_with_main_url_async(self, main_url: str, filename: str, max_workers: int = 10):
-        queue = asyncio.Queue()
-        processed_urls = set()
-
-        results = []
-        pdf_urls = []
-        errored_urls = []
-
-        # Helper to run blocking I/O in a thread to not block the event loop
-        async def run_in_thread(func, *args):
-            loop = asyncio.get_event_loop()
-            return await loop.run_in_executor(None, func, *args)
-
-        # 1. First, process the main_url itself.
-        logger.info(f"Scraping the main entry point: {main_url}")
-        main_content, main_cleaned_content = await run_in_thread(self.get_data_from_url_using_soup, main_url)
-        
-        if main_content:
-            results.append({'url': main_url, 'data': main_content, 'cleanedData': main_cleaned_content})
-            processed_urls.add(main_url)
-        else:
-            logger.error(f"Failed to scrape content from the main URL: {main_url}")
-            errored_urls.append(main_url)
-            return self._save_scrape_results(filename, results, pdf_urls, errored_urls)
-
-        # 2. Now, look for more URLs on the main page to seed the queue.
-        initial_urls = await run_in_thread(self.get_list_of_urls, main_url)
-        if initial_urls:
-            for url in initial_urls:
-                if url not in processed_urls:
-                    processed_urls.add(url)
-                    await queue.put(url)
-        else:
-            logger.info("No further URLs found on the main page. Treating as a single page.")
-
-        async def worker(name: str):
-            while True:
-                try:
-                    # Wait for a URL from the queue, with a timeout to allow graceful exit
-                    current_url = await asyncio.wait_for(queue.get(), timeout=5.0)
-                    if current_url is None:
-                        queue.task_done()
-                        break
-                except asyncio.TimeoutError:
-                    # If the queue is empty and other workers are also waiting, we might be done.
-                    if queue.empty():
-                        break
-                    continue
-
-                if not str(current_url).startswith("http"):
-                    full_url = urljoin(main_url, current_url)
-                else:
-                    full_url = current_url
-
-                logger.debug(f"[{name}] Processing: {full_url}")
-
-                # Skip certain file types
-                if any(ext in full_url for ext in ['.pdf', '.ebook', '.download', ".docx", ".doc", ".xls", ".xlsx"]):
-                    logger.info(f"[{name}] Skipping PDF/download: {full_url}")
-                    pdf_urls.append(full_url)
-                elif not any(ext in full_url for ext in ['.jpg', '.png', '.jpeg']):
-                    # Scrape data and find new URLs concurrently
-                    data_task = run_in_thread(self.get_data_from_url_using_soup, full_url)
-                    urls_task = run_in_thread(self.get_list_of_urls, full_url)
-                    _data, new_urls = await asyncio.gather(data_task, urls_task)
-
-                    got_data = _data and _data[0] is not None
-                    got_urls = new_urls is not None
-
-                    if not got_data and not got_urls:
-                        errored_urls.append(full_url)
-
-                    if got_data:
-                        results.append({'url': full_url, 'data': _data[0], 'cleanedData': _data[1]})
-
-                    if got_urls:
-                        for url in new_urls:
-                            if url not in processed_urls:
-                                processed_urls.add(url)
-                                await queue.put(url)
-                queue.task_done()
-
-        # Create and start worker tasks
-        tasks = [asyncio.create_task(worker(f"Worker-{i+1}")) for i in range(max_workers)]
-        await queue.join() # Wait for all items in the queue to be processed
-
-        for _ in range(max_workers):
-            await queue.put(None)
-
-        await asyncio.gather(*tasks) # Wait for worker tasks to finish
-
-        # Save results
-        return self._save_scrape_results(filename, results, pdf_urls, errored_urls)
-
     @staticmethod
-    def _save_scrape_results(filename: str, data: list, pdf_urls: list, errored_urls: list = None) -> str:
+    def _save_scrape_results(
+        filename: str, data: list, pdf_urls: list, errored_urls: list = None, save_data: bool = True
+    ) -> str:
         """Saves scraped data, PDF URLs, and errored URLs to JSON files inside a new directory in the documents directory."""
-        # Get the project's documents directory
-        base_documents_dir = Path(__file__).resolve().parent.parent.parent.parent / 'documents'
-        # Create a new directory for the current crawl
-        crawl_dir = base_documents_dir / filename
-        crawl_dir.mkdir(exist_ok=True)
+        # Create a new directory for the current crawl in the project's documents directory
+        crawl_dir = crawl_directory(filename)
+        crawl_dir.mkdir(parents=True, exist_ok=True)
 
         # Define file paths within the new directory
         main_data_path = crawl_dir / 'scraped_data.json'
@@ -446,9 +451,10 @@ class RequestHelper:
         errored_data_path = crawl_dir / 'errored_urls.json'
 
         # Save main data
-        logger.debug(f'Saving main data to {main_data_path}')
-        with open(main_data_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        if save_data:
+            logger.debug(f'Saving main data to {main_data_path}')
+            with open(main_data_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
 
         # Save PDF URLs
         if pdf_urls:
@@ -472,57 +478,8 @@ class RequestHelper:
             return default + u.lstrip("/")
         return u
 
-    def scrape_using_sitemap_urls(self, main_list_of_urls, filename, max_workers=10):
-        import queue
-        import threading
-
-        urls_queue = queue.Queue()
-        data = []
-        pdf_urls = []
-        data_lock = threading.Lock()
-
-        for url in main_list_of_urls:
-            urls_queue.put(url)
-
-        def worker():
-            while True:
-                url = urls_queue.get()
-                if url is None:
-                    break
-
-                try:
-                    full_url, scraped_data, is_skipped = self._process_url(url)
-
-                    if is_skipped:
-                        with data_lock:
-                            pdf_urls.append(full_url)
-                        continue
-
-                    if scraped_data:
-                        with data_lock:
-                            data.append(scraped_data)
-                except Exception as e:
-                    logger.error(f"Error processing url {url}: {e}")
-                finally:
-                    urls_queue.task_done()
-
-        threads = []
-        for i in range(max_workers):
-            thread = threading.Thread(target=worker, name=f"Worker-{i + 1}")
-            thread.start()
-            threads.append(thread)
-
-        urls_queue.join()
-
-        # Stop workers
-        for _ in range(max_workers):
-            urls_queue.put(None)
-        for t in threads:
-            t.join()
-
-        return self._save_scrape_results(filename, data, pdf_urls)
 
 if __name__ == '__main__':
     requs = RequestHelper()
     res=requs.request("https://www.quintelaepenalva.pt/?")
-    print(res.text)
\ No newline at end of file
+    print(res.text)
@@ -1,12 +1,12 @@
 import json
 import queue
 import re
-from pathlib import Path
+import threading
+from concurrent.futures import Future
 from time import sleep
-from urllib.parse import urlsplit, urlunsplit, quote, unquote, urljoin, urlparse
+from urllib.parse import urlsplit, urlunsplit, quote, unquote, urlparse
 
 import requests
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.common.exceptions import NoAlertPresentException, InvalidArgumentException
 from selenium.webdriver.chrome.options import Options
@@ -17,34 +17,124 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from webdriver_manager.chrome import ChromeDriverManager
 
-from libs.constants import SCROLL_TO_END_SCRIPT, SCROLL_TO_TOP_SCRIPT
+from apps.crawlers import logger
+from apps.crawlers.boilerplate import BoilerplateFilter
+from apps.crawlers.browser_pool import BrowserPool
+from apps.crawlers.checkpoint import CrawlCheckpoint, crawl_directory
+from apps.crawlers.dedup import CrawlDeduplicator
+from apps.crawlers.extractors import get_extractor
+from apps.crawlers.politeness import HostRateLimiter, RobotsRules
+from libs.config import (
+    CHROMEDRIVER_PATH,
+    CRAWL_BROWSER_PAGE_TIMEOUT,
+    CRAWL_BROWSER_POOL_SIZE,
+    CRAWL_BROWSER_QUIET_MS,
+    CRAWL_BROWSER_RECYCLE_PAGES,
+    CRAWL_BROWSER_TEXT_ONLY,
+    CRAWL_REMOVE_BOILERPLATE,
+)
+from libs.constants import (
+    SCROLL_TO_END_SCRIPT,
+    SCROLL_TO_TOP_SCRIPT,
+    TEXT_ONLY_BLOCKED_URLS,
+    WAIT_FOR_DOM_STABLE_SCRIPT,
+)
+from libs.enums import ExtractorType
 from libs.logger import color_string, get_logger
 from libs.logger.constants import Colors
 
 # remove control chars and common invisible Unicode marks
 _INVISIBLE_RE = re.compile(r'[\x00-\x20\u200B-\u200F\u202A-\u202E]+')
 _SCHEME_RE = re.compile(r'^https?://', re.I)
+# Chrome start-ups are CPU heavy, so they are serialised.
+_driver_start_lock = threading.Lock()
+_chromedriver_lock = threading.Lock()
+_chromedriver_path = None
+_chromedriver_resolved = False
+
+
+def get_chromedriver_path() -> str | None:
+    """
+    chromedriver binary for this process, resolved once: CHROMEDRIVER_PATH
+    when pinned, else webdriver-manager's download. None lets Selenium find
+    a driver itself (PATH or Selenium Manager), which is also the fallback
+    when webdriver-manager cannot reach its servers.
+    """
+    global _chromedriver_path, _chromedriver_resolved
+    with _chromedriver_lock:
+        if not _chromedriver_resolved:
+            if CHROMEDRIVER_PATH:
+                _chromedriver_path = CHROMEDRIVER_PATH
+            else:
+                try:
+                    _chromedriver_path = ChromeDriverManager().install()
+                except Exception as e:
+                    logger.warning(f"webdriver-manager could not resolve chromedriver - {e}. Letting Selenium find it")
+            _chromedriver_resolved = True
+            logger.info(f"Using chromedriver - {_chromedriver_path or 'resolved by Selenium'}")
+        return _chromedriver_path
 
 
 class SeleniumHelper:
 
     def __init__(
         self,
+        progress_callback=None,
+        page_sink=None,
+        extractor: ExtractorType | str | None = None,
+        remove_boilerplate: bool | None = None,
+        robots: RobotsRules | None = None,
+        checkpoint: CrawlCheckpoint | None = None,
+        pool_size: int = CRAWL_BROWSER_POOL_SIZE,
+        recycle_after: int = CRAWL_BROWSER_RECYCLE_PAGES,
+        text_only: bool = CRAWL_BROWSER_TEXT_ONLY,
+        stop_event: threading.Event | None = None,
     ):
         self.driver = None
         self.proxies = None
+        self.progress_callback = progress_callback
+        self.page_sink = page_sink
+        self.pages_recorded = 0
+        self.extractor = get_extractor(extractor)
+        if remove_boilerplate is None:
+            remove_boilerplate = CRAWL_REMOVE_BOILERPLATE
+        self.boilerplate_filter = BoilerplateFilter() if remove_boilerplate else None
+        self.deduplicator = CrawlDeduplicator()
+        # robots.txt is fetched by the caller's RequestHelper; None crawls without it.
+        self.robots = robots
+        self.robots_blocked = 0
+        self.rate_limiter = HostRateLimiter()
+        self.checkpoint = checkpoint
+        # Set by the caller to abandon the crawl: nothing more is queued or loaded.
+        self.stop_event = stop_event
+        self.pool_size = pool_size
+        self.recycle_after = recycle_after
+        self.pool_stats = None
+        self.text_only = text_only
+        self._render_pool = None
+        self._render_queue = None
+        self._lock = threading.Lock()
         self.logger, self.listener = get_logger("SeleniumHelper")
         self.listener.start()
 
-    def get_driver(
+    def stopped(self) -> bool:
+        return self.stop_event is not None and self.stop_event.is_set()
+
+    def build_driver(
         self,
         use_incognito: bool = True,
         headless: bool = False,
         headers: dict = None,
         page_load_strategy: str = "normal",
         javascript_enabled: bool = True,
-        chrome_profile_path=None
+        chrome_profile_path=None,
+        text_only: bool = False,
     ):
+        """
+        Starts Chrome. `text_only` is the crawl profile: eager page loads, no
+        performance log, and images, media, fonts and known trackers blocked
+        (see TEXT_ONLY_BLOCKED_URLS), since only the DOM text is used.
+        """
         chrome_options = Options()
 
         chrome_options.add_argument('--disable-web-security')
@@ -56,8 +146,17 @@ class SeleniumHelper:
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         chrome_options.add_experimental_option("useAutomationExtension", False)
 
+        prefs = {}
+        if text_only:
+            page_load_strategy = "eager"
+            prefs["profile.managed_default_content_settings.images"] = 2
+            chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+            chrome_options.add_argument('--mute-audio')
+            chrome_options.add_argument('--disable-extensions')
+            chrome_options.add_argument('--disable-background-networking')
+        else:
+            chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
         chrome_options.page_load_strategy = page_load_strategy
-        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
 
         if chrome_profile_path:
             chrome_options.add_argument(
@@ -71,29 +170,58 @@ class SeleniumHelper:
             chrome_options.add_argument("--headless")
 
         if not javascript_enabled:
-            prefs = {"profile.managed_default_content_settings.javascript": 2}
+            prefs["profile.managed_default_content_settings.javascript"] = 2
+        if prefs:
             chrome_options.add_experimental_option("prefs", prefs)
 
         chrome_options.add_argument(
             "--disable-blink-features=AutomationControlled"
         )
-        _driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=chrome_options
-        )
+        with _driver_start_lock:
+            _driver = webdriver.Chrome(
+                service=Service(get_chromedriver_path()),
+                options=chrome_options
+            )
         if headers:
             def interceptor(request):
                 for key, value in headers.items():
                     request.headers[key] = value
 
             _driver.request_interceptor = interceptor
-        self.logger.info('Selenium driver started')
+        if text_only:
+            _driver.execute_cdp_cmd("Network.enable", {})
+            _driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": TEXT_ONLY_BLOCKED_URLS})
+        self.logger.info(f'Selenium driver started - Text Only - {text_only}')
         # For headless stability
         _driver.set_page_load_timeout(60)
         _driver.set_script_timeout(60)
-        self.driver = _driver
         return _driver
 
+    def get_driver(self, *args, **kwargs):
+        """Starts a driver, see `build_driver`, and makes it this helper's `self.driver`."""
+        self.driver = self.build_driver(*args, **kwargs)
+        return self.driver
+
+    def crawl_driver(self):
+        """A driver with the crawl's profile, as started by the browser pool."""
+        return self.build_driver(headless=True, text_only=self.text_only)
+
+    def wait_until_ready(self, driver, timeout: float = 20):
+        """
+        Waits for a navigated page. The text-only profile returns once the DOM
+        has stopped changing for CRAWL_BROWSER_QUIET_MS, which is usually well
+        before the full load, capped at CRAWL_BROWSER_PAGE_TIMEOUT; otherwise
+        waits for <body> up to `timeout`.
+        """
+        if self.text_only:
+            stable = driver.execute_async_script(
+                WAIT_FOR_DOM_STABLE_SCRIPT, CRAWL_BROWSER_QUIET_MS, int(CRAWL_BROWSER_PAGE_TIMEOUT * 1000)
+            )
+            if not stable:
+                self.logger.debug(f"DOM still changing after {CRAWL_BROWSER_PAGE_TIMEOUT}s, reading it as is")
+            return
+        WebDriverWait(driver, timeout).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+
     @staticmethod
     def _sanitize_for_nav(u: str) -> str:
         if not isinstance(u, str):
@@ -127,19 +255,14 @@ class SeleniumHelper:
             raise
 
         try:
-            WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+            self.wait_until_ready(self.driver, timeout)
         except Exception as e:
             self.logger.warning(f"Timeout waiting for page to load: {e}")
 
         html = self.driver.page_source
         self.logger.debug(f'Page source retrieved for {safe_url}')
-        soup = BeautifulSoup(html, 'html.parser')
-        soup_text = soup.get_text()
-        text = soup_text.strip().replace('\n', '').replace('\t', '').replace('\r', '').replace('\v', '').replace('\f',
-                                                                                                                 '').replace(
-            '\xa0', '')
-        cleaned_text = re.sub(r'\s+', ' ', soup_text.strip())
-        return text, cleaned_text
+        page = self.extractor.extract(html, url)
+        return page['data'], page['cleanedData']
 
     @staticmethod
     def highlight_element(element):
@@ -223,17 +346,42 @@ class SeleniumHelper:
         self.driver.quit()
         self.logger.info('Driver quit successfully.')
 
+    def _record_page(self, data: list, page: dict):
+        # The sink blocks while a PageStream is full; calling it under the lock would stall every worker and render().
+        if self.page_sink:
+            self.page_sink(page)
+        with self._lock:
+            if not self.page_sink:
+                data.append(page)
+            self.pages_recorded += 1
+            pages_recorded = self.pages_recorded
+        if self.progress_callback:
+            self.progress_callback(pages_recorded)
+
+    def crawl_stats(self) -> dict:
+        return {
+            "pages": self.pages_recorded,
+            "boilerplate": self.boilerplate_filter.log_stats() if self.boilerplate_filter else None,
+            "duplicates": self.deduplicator.log_stats(),
+            "politeness": {
+                **self.rate_limiter.stats(),
+                "respect_robots": self.robots is not None,
+                "robots_blocked": self.robots_blocked,
+            },
+            "browser_pool": self.pool_stats,
+        }
+
     def _save_scrape_results(self, filename: str, data: list, pdf_urls: list, errored_urls: list = None) -> str:
-        base_documents_dir = Path(__file__).resolve().parent.parent.parent.parent / 'documents'
-        crawl_dir = base_documents_dir / filename
-        crawl_dir.mkdir(exist_ok=True)
+        crawl_dir = crawl_directory(filename)
+        crawl_dir.mkdir(parents=True, exist_ok=True)
 
         main_data_path = crawl_dir / 'scraped_data.json'
         pdf_data_path = crawl_dir / 'pdf_urls.json'
         errored_data_path = crawl_dir / 'errored_urls.json'
-        self.logger.debug(f'Saving main data to {main_data_path}')
-        with open(main_data_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+        if self.page_sink is None:
+            self.logger.debug(f'Saving main data to {main_data_path}')
+            with open(main_data_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
 
         if pdf_urls:
             self.logger.debug(f'Saving PDF URLs to {pdf_data_path}')
@@ -247,71 +395,156 @@ class SeleniumHelper:
 
         return str(crawl_dir.resolve())
 
+    def render(self, url: str) -> Future:
+        """
+        Queues `url` for a pooled browser and returns a Future of its rendered
+        HTML, for crawlers that fetch over HTTP and only escalate the pages
+        that need JavaScript. The pool starts on the first call, its browsers
+        as they are needed, and runs until `stop_rendering`.
+        """
+        with self._lock:
+            if self._render_pool is None:
+                self.logger.info(f"Starting browser pool of {self.pool_size} for pages that need rendering")
+                self._render_queue = queue.Queue()
+                self._render_pool = BrowserPool(
+                    driver_factory=self.crawl_driver,
+                    size=self.pool_size,
+                    recycle_after=self.recycle_after,
+                    warm_driver=self.driver,
+                )
+                self.driver = None
+                self._render_pool.start(self._render_queue, self._render_job, self._render_failed)
+        future = Future()
+        self._render_queue.put((url, future))
+        return future
+
+    def _render_job(self, driver, job: tuple[str, Future]):
+        url, future = job
+        self.rate_limiter.acquire(url)
+        self.logger.debug(f"Rendering {url} with Selenium")
+        driver.get(self._sanitize_for_nav(url))
+        self.wait_until_ready(driver, 20)
+        future.set_result(driver.page_source)
+
+    @staticmethod
+    def _render_failed(job: tuple[str, Future], error: Exception):
+        job[1].set_exception(error)
+
+    def stop_rendering(self):
+        """Quits the browsers started by `render`, once the pages already queued are rendered."""
+        with self._lock:
+            pool, self._render_pool = self._render_pool, None
+        if pool is None:
+            return
+        pool.stop()
+        self.pool_stats = {**pool.stats(), "text_only": self.text_only}
+
     def scrape_entire_website_with_selenium(self, main_url, filename):
-        self.logger.info(f"Starting Selenium crawl for {main_url}")
+        """
+        Crawls `main_url` with a pool of `pool_size` headless browsers sharing
+        one frontier, see `BrowserPool`. A running `self.driver`, e.g. the one
+        `is_site_dynamic` probed with, becomes the first pool browser instead
+        of starting another Chrome.
+        """
+        self.logger.info(f"Starting Selenium crawl for {main_url} with {self.pool_size} browsers")
 
         urls_to_visit = queue.Queue()
-        urls_to_visit.put(main_url)
-
-        processed_urls = {main_url}
         data = []
         pdf_urls = []
         errored_urls = []
 
-        self.get_driver(headless=True)
+        def enqueue(url: str):
+            if not self.stopped() and self.deduplicator.add_url(url):
+                urls_to_visit.put(url)
+                if self.checkpoint:
+                    self.checkpoint.queued(url)
 
-        while not urls_to_visit.empty():
-            url = urls_to_visit.get()
+        # A resumed crawl starts from its checkpointed frontier, with its pages already recorded.
+        if self.checkpoint:
+            for url in self.checkpoint.replay(self.deduplicator, lambda page: self._record_page(data, page), pdf_urls):
+                urls_to_visit.put(url)
+        enqueue(main_url)
 
-            path = urlparse(url).path.lower()
-            doc_extensions = ['.pdf', '.docx', '.doc', '.xls', '.xlsx']
-            img_extensions = ['.jpg', '.jpeg', '.png']
+        def processed(url: str, status: str, page: dict | None = None):
+            if self.checkpoint:
+                self.checkpoint.processed(url, status, page)
+
+        if self.robots and self.robots.crawl_delay:
+            self.rate_limiter.set_crawl_delay(main_url, self.robots.crawl_delay)
 
+        doc_extensions = ['.pdf', '.docx', '.doc', '.xls', '.xlsx']
+        img_extensions = ['.jpg', '.jpeg', '.png']
+
+        def process(driver, url: str):
+            if self.stopped():
+                # Drain the frontier unloaded; the checkpoint still has these URLs queued.
+                return
+            path = urlparse(url).path.lower()
             if any(path.endswith(ext) for ext in doc_extensions):
                 self.logger.info(f"Skipping document link: {url}")
-                pdf_urls.append(url)
-                continue
+                with self._lock:
+                    pdf_urls.append(url)
+                processed(url, "document")
+                return
             if any(path.endswith(ext) for ext in img_extensions):
                 self.logger.info(f"Skipping image link: {url}")
-                continue
-
-            try:
-                self.logger.debug(f"Navigating to {url} with Selenium")
-                safe_url = self._sanitize_for_nav(url)
-                self.driver.get(safe_url)
-                WebDriverWait(self.driver, 20).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-
-                html = self.driver.page_source
-                soup = BeautifulSoup(html, 'html.parser')
-
-                soup_text = soup.get_text()
-                cleaned_text = re.sub(r'\s+', ' ', soup_text.strip())
-
-                if cleaned_text:
-                    data.append({
-                        'url': url,
-                        'heading': soup.title.string if soup.title else url.split('/')[-1],
-                        'data': soup_text,
-                        'cleanedData': cleaned_text
-                    })
-
-                base_netloc = urlparse(url).netloc
-                for a in soup.find_all('a', href=True):
-                    href = a['href']
-                    if href and not href.startswith('mailto:') and not href.startswith('tel:'):
-                        abs_url = urljoin(url, href)
-                        parsed_abs = urlparse(abs_url)
-
-                        if parsed_abs.scheme in ['http', 'https'] and parsed_abs.netloc == base_netloc:
-                            clean_url = urlunsplit((parsed_abs.scheme, parsed_abs.netloc, parsed_abs.path, '', ''))
-                            if clean_url not in processed_urls:
-                                processed_urls.add(clean_url)
-                                urls_to_visit.put(clean_url)
-
-            except Exception as e:
-                self.logger.error(f"Error scraping {url} with Selenium: {e}")
+                processed(url, "image")
+                return
+            if self.robots and not self.robots.can_fetch(url):
+                self.logger.debug(f"Skipping {url} - disallowed by robots.txt")
+                with self._lock:
+                    self.robots_blocked += 1
+                processed(url, "skipped")
+                return
+
+            self.rate_limiter.acquire(url)
+            self.logger.debug(f"Navigating to {url} with Selenium")
+            safe_url = self._sanitize_for_nav(url)
+            driver.get(safe_url)
+            self.wait_until_ready(driver, 20)
+
+            page = self.extractor.extract(driver.page_source, url)
+            links = page['links']
+            if self.boilerplate_filter:
+                page = self.boilerplate_filter.filter(page)
+
+            duplicate_of = None
+            if page['cleanedData']:
+                duplicate_of = self.deduplicator.find_duplicate(url, page['cleanedData'])
+                if duplicate_of:
+                    self.logger.debug(f"Skipping {url} - near duplicate of {duplicate_of}")
+            scraped_data = None
+            if page['cleanedData'] and not duplicate_of:
+                scraped_data = {
+                    'url': url,
+                    'heading': page['title'] or url.split('/')[-1],
+                    'data': page['data'],
+                    'cleanedData': page['cleanedData']
+                }
+                self._record_page(data, scraped_data)
+
+            # Links are already absolute and on this host; drop query and fragment.
+            for abs_url in links:
+                parsed_abs = urlparse(abs_url)
+                enqueue(urlunsplit((parsed_abs.scheme, parsed_abs.netloc, parsed_abs.path, '', '')))
+            processed(url, "page" if scraped_data else "empty", scraped_data)
+
+        def on_error(url: str, error: Exception):
+            self.logger.error(f"Error scraping {url} with Selenium: {error}")
+            with self._lock:
                 errored_urls.append(url)
+            processed(url, "errored")
 
-        self.quit_driver()
+        pool = BrowserPool(
+            driver_factory=self.crawl_driver,
+            size=self.pool_size,
+            recycle_after=self.recycle_after,
+            warm_driver=self.driver,
+        )
+        # The pool owns and quits the warm driver from here on.
+        self.driver = None
+        pool.run(urls_to_visit, process, on_error)
+        self.pool_stats = {**pool.stats(), "text_only": self.text_only}
+        self.logger.info(f"Selenium crawl {'stopped' if self.stopped() else 'finished'} - Pages - {self.pages_recorded} - Browser Pool - {self.pool_stats}")
 
-        return self._save_scrape_results(filename, data, pdf_urls, errored_urls)
\ No newline at end of file
+        return self._save_scrape_results(filename, data, pdf_urls, errored_urls)
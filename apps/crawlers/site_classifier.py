@@ -0,0 +1,101 @@
+import re
+
+# Mount points client-side frameworks render into: React/CRA, Vue, Next.js, Nuxt, Gatsby, Quasar, Angular.
+SPA_ROOT_IDS = ("root", "app", "__next", "__nuxt", "___gatsby", "q-app", "app-root")
+SPA_ROOT_TAGS = ("app-root",)
+# Raw HTML is only scanned with these, never parsed again: the crawler has already extracted the page.
+_EMPTY_MOUNT_RE = re.compile(
+    r"<(?P<tag>[a-z][\w-]*)\b[^>]*?(?<![\w-])id\s*=\s*[\"']?(?P<id>" + "|".join(map(re.escape, SPA_ROOT_IDS)) + r")(?=[\"'\s>])"
+    r"[^>]*>(?:\s|<!--.*?-->)*</(?P=tag)\s*>"
+    r"|<(?P<element>" + "|".join(SPA_ROOT_TAGS) + r")\b[^>]*>(?:\s|<!--.*?-->)*</(?P=element)\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+_SCRIPT_RE = re.compile(r"<script\b([^>]*)>(.*?)</script\s*>", re.IGNORECASE | re.DOTALL)
+_NOSCRIPT_RE = re.compile(r"<noscript\b[^>]*>(.*?)</noscript\s*>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]*>")
+_FRAMEWORK_RE = re.compile(
+    r"\b(react|vue|angular|ember|svelte|preact|backbone|gatsby|webpack)\b|/_(next|nuxt)/|"
+    r"\b(?:main|app|bundle|runtime|vendor|chunk)[.-][\w.-]*\.js",
+    re.IGNORECASE,
+)
+_SERVER_RENDERED_RE = re.compile(r"__NEXT_DATA__|__NUXT__|data-server-rendered", re.IGNORECASE)
+_NOSCRIPT_JS_RE = re.compile(r"(enable|requires?|need|turn on|activate)[^.]{0,40}javascript", re.IGNORECASE)
+
+# Visible text below MIN_TEXT characters looks unrendered, above RICH_TEXT it is a rendered page.
+MIN_TEXT = 200
+RICH_TEXT = 1000
+# Same-site links in the raw HTML that show the server renders navigation the crawl can follow.
+MIN_LINKS = 5
+# Inline script characters per character of visible text that make a page script-heavy.
+SCRIPT_HEAVY_RATIO = 5
+# Scores at or beyond these decide without a browser; anything in between is uncertain.
+DYNAMIC_SCORE = 3
+STATIC_SCORE = -3
+
+
+def classify_page(html: str, page: dict) -> dict:
+    """
+    Guesses whether a page needs a browser to render, from its raw HTML and
+    the page the crawler's extractor already built from it (text and links),
+    so the HTML is scanned but not parsed a second time. Positive signals
+    point to client-side rendering (an empty SPA mount point, a noscript
+    "enable JavaScript" notice, framework bundles, little text, a
+    script-heavy page, no links), negative ones to server rendering (plenty
+    of text and links, SSR markers). Returns the verdict, True for dynamic,
+    False for static or None when the score is too close to call, with the
+    score and the signals that produced it.
+    """
+    score = 0
+    signals = []
+
+    def signal(name: str, weight: int):
+        nonlocal score
+        score += weight
+        signals.append(name)
+
+    scripts = _SCRIPT_RE.findall(html)
+    script_chars = sum(len(body) for _, body in scripts)
+    framework_hints = {
+        (match.group(1) or match.group(2) or "bundle").lower()
+        for attributes, body in scripts
+        for match in _FRAMEWORK_RE.finditer(f"{attributes} {body[:2000]}")
+    }
+    server_rendered = bool(_SERVER_RENDERED_RE.search(html))
+    noscript_text = " ".join(_TAG_RE.sub(" ", body) for body in _NOSCRIPT_RE.findall(html))
+    empty_mount = _EMPTY_MOUNT_RE.search(html)
+    text_length = len(page['cleanedData'])
+    links = len(page['links'])
+
+    if empty_mount:
+        signal(f"empty_mount:{'#' + empty_mount.group('id') if empty_mount.group('id') else empty_mount.group('element')}", 3)
+    if _NOSCRIPT_JS_RE.search(noscript_text):
+        signal("noscript_requires_js", 2)
+    if framework_hints:
+        signal(f"framework:{','.join(sorted(framework_hints)[:3])}", 1)
+    if script_chars > SCRIPT_HEAVY_RATIO * max(text_length, 1):
+        signal("script_heavy", 1)
+
+    if text_length < MIN_TEXT:
+        signal("little_text", 2)
+    elif text_length >= RICH_TEXT:
+        signal("rich_text", -2)
+    if links >= MIN_LINKS:
+        signal("server_links", -2)
+    elif not links:
+        signal("no_links", 1)
+    if server_rendered and text_length >= MIN_TEXT:
+        signal("server_rendered", -1)
+
+    if score >= DYNAMIC_SCORE:
+        dynamic = True
+    elif score <= STATIC_SCORE:
+        dynamic = False
+    else:
+        dynamic = None
+    return {
+        "dynamic": dynamic,
+        "score": score,
+        "signals": signals,
+        "text_length": text_length,
+        "links": links,
+    }
@@ -0,0 +1,90 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from apps.jobs import logger
+from libs.config import JOB_BROKER, JOB_WORKERS
+from libs.db.mongodb.helpers import get_job, update_job, update_session
+from libs.enums import JobStatus, JobType, Status
+
+# Session status left by a job that ended without recording its own outcome.
+FAILED_SESSION_STATUS = {
+    JobType.CRAWL.value: Status.CRAWLING_FAILED,
+    JobType.TRAIN.value: Status.TRAINING_FAILED,
+    JobType.CRAWL_TRAIN.value: Status.TRAINING_FAILED,
+}
+
+
+def fail_job(job_id: str, error: str):
+    """Marks a job failed along with its session, so the session does not stay crawling/training forever."""
+    update_job(job_id, {"status": JobStatus.FAILED.value, "error": error})
+    job = get_job(job_id)
+    status = FAILED_SESSION_STATUS.get(job.get("type")) if job else None
+    if status is not None:
+        logger.info(f"Updating session '{job['name']}' to status: {status.value}")
+        update_session(name=job["name"], document_to_update={"status": status.value, "error": error})
+
+
+class JobBroker:
+    """Interface for executing background jobs. `func` must be a picklable module-level callable."""
+
+    def submit(self, job_id: str, func, *args):
+        raise NotImplementedError
+
+    def shutdown(self):
+        pass
+
+
+class LocalProcessBroker(JobBroker):
+
+    def __init__(self, max_workers: int = JOB_WORKERS):
+        logger.info(f"Starting local process job broker with {max_workers} workers")
+        # Spawn so children do not inherit the parent's Mongo clients and logging threads.
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def submit(self, job_id: str, func, *args):
+        logger.info(f"Submitting job {job_id} - {func.__name__}")
+        future = self.executor.submit(func, job_id, *args)
+
+        def on_done(done_future):
+            # Jobs record their own failures; this catches crashed workers, jobs that raised
+            # before recording their status, and jobs cancelled by a shutdown.
+            error = "Job cancelled before it ran" if done_future.cancelled() else done_future.exception()
+            if error is None:
+                return
+            logger.error(f"Job {job_id} crashed - {error}")
+            try:
+                fail_job(job_id, str(error))
+            except Exception as e:
+                logger.error(f"Could not mark job {job_id} as failed - {e}")
+
+        future.add_done_callback(on_done)
+        return future
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+BROKERS = {
+    "local": LocalProcessBroker,
+}
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def register_broker(name: str, broker_class):
+    BROKERS[name] = broker_class
+
+
+def get_broker() -> JobBroker:
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            broker_class = BROKERS.get(JOB_BROKER)
+            if broker_class is None:
+                raise ValueError(f"Invalid job broker: {JOB_BROKER}, check env file!")
+            _broker = broker_class()
+        return _broker
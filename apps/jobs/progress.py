@@ -0,0 +1,90 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+from apps.jobs import logger
+from libs.config import JOB_PROGRESS_INTERVAL
+from libs.db.mongodb.helpers import update_job, update_session
+from libs.enums import JobStatus
+
+
+class JobProgress:
+    """
+    Collects counters for a running job (pages crawled, chunks embedded, ...)
+    and writes them to the job and its session at most once per `min_interval`
+    seconds, so hot loops can report every item without hammering Mongo.
+    """
+
+    def __init__(self, job_id: str, session_name: str, min_interval: float = JOB_PROGRESS_INTERVAL):
+        self.job_id = job_id
+        self.session_name = session_name
+        self.min_interval = min_interval
+        self.started_at = time.time()
+        self.counters = {}
+        self.totals = {}
+        self.stage = None
+        self._last_flush = 0.0
+        self._lock = threading.Lock()
+
+    def start(self, stage: str):
+        with self._lock:
+            self.stage = stage
+        update_job(self.job_id, {"status": JobStatus.RUNNING.value, "startedAt": datetime.now(timezone.utc)})
+        self.flush()
+
+    def update(self, key: str, value: int, total: int | None = None):
+        with self._lock:
+            self.counters[key] = value
+            if total is not None:
+                self.totals[key] = total
+            due = time.time() - self._last_flush >= self.min_interval
+        if due:
+            self.flush()
+
+    def callback(self, key: str):
+        """Returns a `callback(done, total=None)` bound to one counter."""
+        def report(done: int, total: int | None = None):
+            self.update(key, done, total)
+        return report
+
+    def _eta_seconds(self):
+        elapsed = time.time() - self.started_at
+        etas = []
+        for key, total in self.totals.items():
+            done = self.counters.get(key, 0)
+            if done and total and elapsed > 0:
+                etas.append(max(total - done, 0) / (done / elapsed))
+        return round(max(etas), 1) if etas else None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "stage": self.stage,
+                "counters": dict(self.counters),
+                "totals": dict(self.totals),
+                "elapsed_seconds": round(time.time() - self.started_at, 1),
+                "eta_seconds": self._eta_seconds(),
+            }
+
+    def flush(self):
+        progress = self.snapshot()
+        with self._lock:
+            self._last_flush = time.time()
+        try:
+            update_job(self.job_id, {"progress": progress})
+            update_session(name=self.session_name, document_to_update={
+                "job_id": self.job_id,
+                "progress": progress,
+            })
+        except Exception as e:
+            logger.warning(f"Could not write progress for job {self.job_id} - {e}")
+
+    def complete(self, result: dict | None = None):
+        self.flush()
+        update_job(self.job_id, {"status": JobStatus.COMPLETED.value, "result": result or {}})
+        logger.info(f"Job {self.job_id} completed - {result}")
+
+    def fail(self, error: str):
+        self.flush()
+        update_job(self.job_id, {"status": JobStatus.FAILED.value, "error": error})
+        logger.error(f"Job {self.job_id} failed - {error}")
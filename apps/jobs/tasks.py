@@ -0,0 +1,161 @@
+import asyncio
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from apps.crawlers.page_stream import PageStream
+from apps.jobs import logger
+from apps.jobs.progress import JobProgress
+from apps.loaders.page_loader import CrawledPageLoader
+from apps.routes.crawl.dto import CrawlerInputModel, CrawlTrainInputModel
+from apps.routes.crawl.helpers import crawl_website
+from apps.routes.train.dto import TrainInputModel
+from apps.routes.train.helpers import iter_documents, store_documents
+from libs.config import CRAWL_STOP_TIMEOUT
+from libs.db.mongodb.helpers import update_session
+from libs.enums import Status
+
+
+def run_crawl_job(job_id: str, crawl_data: dict):
+    crawl_data = CrawlerInputModel(**crawl_data)
+    progress = JobProgress(job_id=job_id, session_name=crawl_data.name)
+    crawl_stats = {}
+    try:
+        progress.start(stage="crawling")
+        directory_path = asyncio.run(
+            crawl_website(
+                base_url=str(crawl_data.website),
+                progress_callback=progress.callback("pages_crawled"),
+                extractor=crawl_data.extractor,
+                remove_boilerplate=crawl_data.remove_boilerplate,
+                mode=crawl_data.mode,
+                stats=crawl_stats,
+                resume=crawl_data.resume,
+            )
+        )
+        logger.info(f"Crawling finished. Data saved to: {directory_path}")
+
+        logger.info(f"Updating session '{crawl_data.name}' to status: {Status.CRAWLED.value}")
+        update_session(name=crawl_data.name, document_to_update={
+            "status": Status.CRAWLED.value,
+            "source_directory": directory_path,
+            "last_crawl": crawl_stats,
+        })
+        progress.complete(result={"source_directory": directory_path, "crawl": crawl_stats})
+
+    except Exception as e:
+        logger.error(f"Error Occurred during crawl for session {crawl_data.name} - {str(e)}")
+        logger.info(f"Updating session '{crawl_data.name}' to status: {Status.CRAWLING_FAILED.value}")
+        update_session(name=crawl_data.name, document_to_update={
+            "status": Status.CRAWLING_FAILED.value,
+            "error": str(e)
+        })
+        progress.fail(str(e))
+
+
+def run_train_job(job_id: str, train_data: dict, docs_path: str):
+    train_data = TrainInputModel(**train_data)
+    progress = JobProgress(job_id=job_id, session_name=train_data.name)
+    try:
+        progress.start(stage="training")
+        logger.info(f"Training from directory: {docs_path}")
+
+        documents = iter_documents(train_data=train_data, directory=Path(docs_path))
+        summary = store_documents(
+            documents=documents,
+            train_data=train_data,
+            progress_callback=progress.callback("chunks_embedded"),
+        )
+
+        logger.info(f"Updating session '{train_data.name}' to status: {Status.READY.value}")
+        update_session(name=train_data.name, document_to_update={
+            "status": Status.READY.value,
+            "documents": summary["total"],
+            "last_training": summary,
+            "trainedAt": datetime.now(timezone.utc),
+        })
+        progress.complete(result=summary)
+
+    except Exception as e:
+        logger.error(f"Error Occurred in training session {train_data.name} - {str(e)}")
+        logger.info(f"Updating session '{train_data.name}' to status: {Status.TRAINING_FAILED.value}")
+        update_session(name=train_data.name, document_to_update={
+            "status": Status.TRAINING_FAILED.value,
+            "error": str(e)
+        })
+        progress.fail(str(e))
+
+
+def run_crawl_train_job(job_id: str, crawl_data: dict):
+    """
+    Crawls and trains at the same time: the crawler runs on its own thread and
+    feeds a bounded `PageStream` that this thread splits and embeds, so the
+    session is ready roughly when the slower of the two finishes.
+    """
+    crawl_data = CrawlTrainInputModel(**crawl_data)
+    progress = JobProgress(job_id=job_id, session_name=crawl_data.name)
+    page_stream = PageStream()
+    crawl_stats = {}
+    crawl_result = {}
+
+    def crawl():
+        try:
+            crawl_result["source_directory"] = asyncio.run(
+                crawl_website(
+                    base_url=str(crawl_data.website),
+                    progress_callback=progress.callback("pages_crawled"),
+                    page_sink=page_stream.put,
+                    # Training gave up: stop crawling instead of fetching pages nobody will read.
+                    stop_event=page_stream.cancelled,
+                    extractor=crawl_data.extractor,
+                    remove_boilerplate=crawl_data.remove_boilerplate,
+                    mode=crawl_data.mode,
+                    stats=crawl_stats,
+                    resume=crawl_data.resume,
+                )
+            )
+            page_stream.close()
+        except Exception as e:
+            page_stream.close(error=e)
+
+    try:
+        progress.start(stage="crawling_and_training")
+        crawler = threading.Thread(target=crawl, name=f"crawler-{job_id}", daemon=True)
+        crawler.start()
+
+        try:
+            loader = CrawledPageLoader(pages=page_stream)
+            summary = store_documents(
+                documents=loader.iter_documents(),
+                train_data=crawl_data,
+                progress_callback=progress.callback("chunks_embedded"),
+                # A resumed crawl does not stream the pages embedded before the interruption again.
+                partial=crawl_data.resume,
+            )
+        finally:
+            # Stops the crawler if we stopped reading early; pages in flight are dropped.
+            page_stream.cancel()
+            crawler.join(timeout=CRAWL_STOP_TIMEOUT)
+            if crawler.is_alive():
+                logger.warning(f"Crawler of job {job_id} still running {CRAWL_STOP_TIMEOUT}s after being stopped")
+        summary["pages"] = page_stream.pages
+        summary["crawl"] = crawl_stats
+
+        logger.info(f"Updating session '{crawl_data.name}' to status: {Status.READY.value}")
+        update_session(name=crawl_data.name, document_to_update={
+            "status": Status.READY.value,
+            "source_directory": crawl_result.get("source_directory"),
+            "documents": summary["total"],
+            "last_training": summary,
+            "trainedAt": datetime.now(timezone.utc),
+        })
+        progress.complete(result=summary)
+
+    except Exception as e:
+        logger.error(f"Error Occurred in crawl and train session {crawl_data.name} - {str(e)}")
+        logger.info(f"Updating session '{crawl_data.name}' to status: {Status.TRAINING_FAILED.value}")
+        update_session(name=crawl_data.name, document_to_update={
+            "status": Status.TRAINING_FAILED.value,
+            "error": str(e)
+        })
+        progress.fail(str(e))
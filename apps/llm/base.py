@@ -0,0 +1,117 @@
+from apps.llm import logger
+from libs.constants import prompt_template, system_prompt
+
+
+class BaseLLMHandler:
+    """
+    Shared retrieval and prompt assembly for the provider handlers.
+    Subclasses set `self.vector_store` and `self.llm` in `__init__`.
+    """
+
+    vector_store = None
+    llm = None
+
+    @staticmethod
+    def _build_prompt(user_query: str, prompt: str | None, retrieved_docs: list):
+        if retrieved_docs:
+            context_sections = []
+            for i, doc in enumerate(retrieved_docs, 1):
+                context_sections.append(f"Document {i}:\n{doc}")
+            context_text = "\n\n".join(context_sections)
+        else:
+            context_text = "No additional context available."
+
+        formatted_prompt = prompt_template.format(
+            system_prompt=system_prompt, context=context_text, query=user_query
+        )
+
+        if prompt:
+            formatted_prompt = f"{prompt}\n\n{formatted_prompt}"
+        return formatted_prompt
+
+    @staticmethod
+    def chunk_text(chunk) -> str:
+        # Anthropic streams content blocks (list of dicts) rather than plain strings.
+        content = chunk.content
+        if isinstance(content, str):
+            return content
+        return "".join(
+            part.get("text", "") if isinstance(part, dict) else str(part)
+            for part in content
+        )
+
+    def _retrieve(self, user_query: str, top_k: int, use_context: bool) -> list:
+        if not use_context:
+            return []
+        results = self.vector_store.similarity_search(user_query, k=top_k)
+        return [doc.page_content for doc in results]
+
+    async def _aretrieve(self, user_query: str, top_k: int, use_context: bool) -> list:
+        if not use_context:
+            return []
+        results = await self.vector_store.asimilarity_search(user_query, k=top_k)
+        return [doc.page_content for doc in results]
+
+    def generate_response(
+        self,
+        user_query: str,
+        prompt: str,
+        top_k: int = 3,
+        use_context: bool = True,
+    ):
+        logger.info(
+            f"Generating Response for user query - {user_query} - use_context - {use_context}"
+        )
+
+        retrieved_docs = self._retrieve(user_query, top_k, use_context)
+        formatted_prompt = self._build_prompt(user_query, prompt, retrieved_docs)
+        response = self.llm.invoke(formatted_prompt)
+        return response
+
+    async def agenerate_response(
+        self,
+        user_query: str,
+        prompt: str,
+        top_k: int = 3,
+        use_context: bool = True,
+    ):
+        logger.info(
+            f"Generating Response (async) for user query - {user_query} - use_context - {use_context}"
+        )
+
+        retrieved_docs = await self._aretrieve(user_query, top_k, use_context)
+        formatted_prompt = self._build_prompt(user_query, prompt, retrieved_docs)
+        response = await self.llm.ainvoke(formatted_prompt)
+        return response
+
+    def stream_response(
+        self,
+        user_query: str,
+        prompt: str,
+        top_k: int = 3,
+        use_context: bool = True,
+    ):
+        logger.info(
+            f"Streaming Response for user query - {user_query} - use_context - {use_context}"
+        )
+
+        retrieved_docs = self._retrieve(user_query, top_k, use_context)
+        formatted_prompt = self._build_prompt(user_query, prompt, retrieved_docs)
+        for chunk in self.llm.stream(formatted_prompt):
+            yield chunk
+
+    async def astream_response(
+        self,
+        user_query: str,
+        prompt: str,
+        top_k: int = 3,
+        use_context: bool = True,
+    ):
+        logger.info(
+            f"Streaming Response (async) for user query - {user_query} - use_context - {use_context}"
+        )
+
+        retrieved_docs = await self._aretrieve(user_query, top_k, use_context)
+        formatted_prompt = self._build_prompt(user_query, prompt, retrieved_docs)
+        async for chunk in self.llm.astream(formatted_prompt):
+            yield chunk
@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+
+from apps.llm import logger
+from libs.config import LLM_CLIENT_POOL_SIZE
+
+
+class LLMClientPool:
+    """
+    Per-worker registry of long-lived chat model clients keyed by
+    (provider, model, temperature, top_p). Handlers borrow clients from here
+    so each provider's HTTP connection pool stays warm across requests.
+    """
+
+    def __init__(self, max_size: int = LLM_CLIENT_POOL_SIZE):
+        self.max_size = max_size
+        self._clients = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_client(
+        self,
+        provider: str,
+        model: str,
+        temperature: float,
+        top_p: float,
+        factory,
+        api_key: str | None = None,
+    ):
+        key = (provider, model, temperature, top_p, api_key)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self._clients.move_to_end(key)
+                self.hits += 1
+                return client
+
+            self.misses += 1
+            logger.info(
+                f"Creating pooled LLM client - Provider - {provider} - "
+                f"Model - {model} - Temperature - {temperature} - Top P - {top_p}"
+            )
+            client = factory()
+            self._clients[key] = client
+            while len(self._clients) > self.max_size:
+                evicted_key, _ = self._clients.popitem(last=False)
+                logger.debug(f"Evicted pooled LLM client - {evicted_key[:4]}")
+            return client
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._clients),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+llm_client_pool = LLMClientPool()
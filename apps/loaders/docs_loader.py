@@ -1,45 +1,62 @@
 from pathlib import Path
 
 from langchain_community.document_loaders import UnstructuredWordDocumentLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from apps.loaders import logger
+from apps.loaders.parallel import ParallelFileParser
+from libs.config import LOADER_MAX_WORKERS, LOADER_PARALLEL
 
 
 class DocsLoader:
 
     def __init__(
-        self, directory: Path, chunk_size: int = 1024, chunk_overlap: int = 200
+        self,
+        directory: Path,
+        chunk_size: int = 1024,
+        chunk_overlap: int = 200,
+        parallel: bool = LOADER_PARALLEL,
+        max_workers: int | None = LOADER_MAX_WORKERS,
     ):
         logger.info(
             f"Initializing Docs Loader with directory - {directory} - "
             f"Chunk Size - {chunk_size} - "
             f"Chunk Overlap - {chunk_overlap} - "
+            f"Parallel - {parallel} - "
             f"Text Splitter - Recursive Character Text Splitter"
         )
 
         self.directory = directory
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=self.chunk_size,
-            chunk_overlap=self.chunk_overlap,
-            length_function=len,
-            is_separator_regex=False,
-        )
+        self.parallel = parallel
+        self.max_workers = max_workers
+        self.parse_times = {}
+        self.failed_files = {}
 
-    def load_documents(self):
-        docx_files = list(self.directory.rglob("*.docx"))
+    def iter_documents(self):
+        docx_files = sorted(self.directory.rglob("*.docx"))
 
         logger.debug(
             f"Loading all docx files from {self.directory} - "
             f"Found {len(docx_files)} to be loaded"
         )
 
-        all_documents = []
-        for file_path in docx_files:
-            loader = UnstructuredWordDocumentLoader(str(file_path))
-            all_documents.extend(loader.load_and_split(self.text_splitter))
+        parser = ParallelFileParser(
+            loader_class=UnstructuredWordDocumentLoader,
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap,
+            max_workers=self.max_workers,
+            parallel=self.parallel,
+        )
+        self.parse_times = parser.parse_times
+        self.failed_files = parser.failed_files
+
+        chunk_count = 0
+        for document in parser.iter_documents(docx_files):
+            chunk_count += 1
+            yield document
 
-        logger.debug(f"Split loaded documents into {len(all_documents)} chunks")
-        return all_documents
+        logger.debug(f"Split loaded documents into {chunk_count} chunks")
+
+    def load_documents(self):
+        return list(self.iter_documents())
@@ -37,15 +37,15 @@ class JSONDocLoader:
         self.content_key = content_key
         self.metadata_func = metadata_func
 
-    def load_documents(self):
-        json_files = list(self.directory.rglob("*.json"))
+    def iter_documents(self):
+        json_files = sorted(self.directory.rglob("*.json"))
 
         logger.debug(
             f"Loading all json files from {self.directory} - "
             f"Found {len(json_files)} to be loaded"
         )
 
-        all_documents = []
+        chunk_count = 0
         for file_path in json_files:
             loader = JSONLoader(
                 str(file_path),
@@ -55,7 +55,13 @@ class JSONDocLoader:
                 text_content=False,
             )
 
-            all_documents.extend(loader.load_and_split(self.text_splitter))
+            # Split record by record so a large scrape file never sits in memory as chunks.
+            for record in loader.lazy_load():
+                for document in self.text_splitter.split_documents([record]):
+                    chunk_count += 1
+                    yield document
+
+        logger.debug(f"Split loaded documents into {chunk_count} chunks")
 
-        logger.debug(f"Split loaded documents into {len(all_documents)} chunks")
-        return all_documents
+    def load_documents(self):
+        return list(self.iter_documents())
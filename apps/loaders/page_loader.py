@@ -0,0 +1,51 @@
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from apps.loaders import logger
+
+
+class CrawledPageLoader:
+    """Splits pages as they arrive from a crawler, e.g. a `PageStream`, without a scrape file in between."""
+
+    def __init__(self, pages, chunk_size: int = 1024, chunk_overlap: int = 200):
+        logger.info(
+            f"Initializing Crawled Page Loader - "
+            f"Chunk Size - {chunk_size} - "
+            f"Chunk Overlap - {chunk_overlap} - "
+            f"Text Splitter - Recursive Character Text Splitter"
+        )
+
+        self.pages = pages
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.text_splitter = RecursiveCharacterTextSplitter(
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap,
+            length_function=len,
+            is_separator_regex=False,
+        )
+
+    def iter_documents(self):
+        page_count = 0
+        chunk_count = 0
+        for page in self.pages:
+            text = page.get("cleanedData") or page.get("data")
+            if not text:
+                continue
+            page_count += 1
+            document = Document(
+                page_content=text,
+                metadata={
+                    "url": page["url"],
+                    "source": page["url"],
+                    "heading": page.get("heading") or page["url"],
+                },
+            )
+            for chunk in self.text_splitter.split_documents([document]):
+                chunk_count += 1
+                yield chunk
+
+        logger.debug(f"Split {page_count} crawled pages into {chunk_count} chunks")
+
+    def load_documents(self):
+        return list(self.iter_documents())
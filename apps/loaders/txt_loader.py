@@ -28,18 +28,22 @@ class TxtLoader:
             is_separator_regex=False,
         )
 
-    def load_documents(self):
-        txt_files = list(self.directory.rglob("*.txt"))
+    def iter_documents(self):
+        txt_files = sorted(self.directory.rglob("*.txt"))
 
         logger.debug(
             f"Loading all txt files from {self.directory} "
             f"Found {len(txt_files)} to be loaded"
         )
 
-        all_documents = []
+        chunk_count = 0
         for file_path in txt_files:
             loader = TextLoader(str(file_path))
-            all_documents.extend(loader.load_and_split(self.text_splitter))
+            for document in self.text_splitter.split_documents(loader.lazy_load()):
+                chunk_count += 1
+                yield document
+
+        logger.debug(f"Split loaded documents into {chunk_count} chunks")
 
-        logger.debug(f"Split loaded documents into {len(all_documents)} chunks")
-        return all_documents
+    def load_documents(self):
+        return list(self.iter_documents())
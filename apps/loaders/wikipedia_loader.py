@@ -34,13 +34,19 @@ class WikipediaPageLoader:
             is_separator_regex=False,
         )
 
-    def load_documents(self):
+    def iter_documents(self):
         logger.debug(f"Loading Wikipedia article for query: {self.query}")
 
         loader = WikipediaLoader(
             query=self.query, lang=self.lang, load_max_docs=self.load_max_docs
         )
-        documents = loader.load_and_split(self.text_splitter)
+        chunk_count = 0
+        for page in loader.lazy_load():
+            for document in self.text_splitter.split_documents([page]):
+                chunk_count += 1
+                yield document
+
+        logger.debug(f"Split loaded documents into {chunk_count} chunks")
 
-        logger.debug(f"Split loaded documents into {len(documents)} chunks")
-        return documents
+    def load_documents(self):
+        return list(self.iter_documents())
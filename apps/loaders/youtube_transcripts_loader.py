@@ -14,14 +14,14 @@ class YoutubeUrlLoader:
 
         self.chunk_size_seconds = chunk_size_seconds
 
-    def load_documents(self, youtube_links: list, add_video_info: bool = False):
+    def iter_documents(self, youtube_links: list, add_video_info: bool = False):
 
         logger.debug(
             f"Loading all youtube links - "
             f"Found {len(youtube_links)} to be loaded"
         )
 
-        all_documents = []
+        chunk_count = 0
         for link in youtube_links:
             try:
                 loader = YoutubeLoader.from_youtube_url(
@@ -30,8 +30,15 @@ class YoutubeUrlLoader:
                     transcript_format=TranscriptFormat.CHUNKS,
                     chunk_size_seconds=self.chunk_size_seconds,
                 )
-                all_documents.extend(loader.load())
+                documents = loader.load()
             except Exception as e:
                 logger.warning(f"Could not load transcript for {link}: {e}")
-        logger.debug(f"Split loaded documents into {len(all_documents)} chunks")
-        return all_documents
+                continue
+            chunk_count += len(documents)
+            yield from documents
+        logger.debug(f"Split loaded documents into {chunk_count} chunks")
+
+    def load_documents(self, youtube_links: list, add_video_info: bool = False):
+        return list(
+            self.iter_documents(youtube_links=youtube_links, add_video_info=add_video_info)
+        )
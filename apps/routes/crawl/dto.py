@@ -1,6 +1,22 @@
 from pydantic import BaseModel, HttpUrl
 
+from apps.routes.train.dto import TrainInputModel
+from libs.enums import CrawlMode, ExtractorType
+
 
 class CrawlerInputModel(BaseModel):
     name: str
     website: HttpUrl
+    extractor: ExtractorType | None = None
+    remove_boilerplate: bool | None = None
+    mode: CrawlMode | None = None
+    # Continue an interrupted crawl of this website from its checkpoint.
+    resume: bool = False
+
+
+class CrawlTrainInputModel(TrainInputModel):
+    website: HttpUrl
+    extractor: ExtractorType | None = None
+    remove_boilerplate: bool | None = None
+    mode: CrawlMode | None = None
+    resume: bool = False
@@ -1,82 +1,223 @@
 import asyncio
-from bs4 import BeautifulSoup
+import threading
 
+from apps.crawlers.async_request_helper import AsyncRequestHelper
+from apps.crawlers.checkpoint import CrawlCheckpoint
 from apps.crawlers.selenium_helper import SeleniumHelper
+from apps.crawlers.site_classifier import classify_page
 from apps.routes.crawl import logger
 from apps.crawlers.request_helper import RequestHelper
+from libs.config import CRAWL_CHECKPOINT, CRAWL_DYNAMIC_HEURISTIC, CRAWL_MODE
+from libs.enums import CrawlMode, CrawlStrategy, ExtractorType
 
 
-def is_site_dynamic(url: str, timeout: int = 15) -> bool:
+def is_site_dynamic(
+    url: str,
+    timeout: int = 15,
+    extractor: ExtractorType | str | None = None,
+    selenium_helper: SeleniumHelper | None = None,
+    report: dict | None = None,
+) -> bool:
     """
-    Determines if a site is likely dynamic by comparing the content
-    loaded by requests and a headless browser (Selenium).
+    Determines if a site is likely dynamic. The raw HTML fetched by requests
+    is classified first (`classify_page`); only when that is inconclusive,
+    or CRAWL_DYNAMIC_HEURISTIC is off, is the content loaded by a headless
+    browser (Selenium) compared with it. With a `selenium_helper`, the
+    browser is started as its crawl driver and left running, so a dynamic
+    crawl can start from it warm; the caller quits it. Pass a dict as
+    `report` to receive the verdict, the method that decided it (heuristic,
+    browser or fallback) and the heuristic's score and signals.
     """
     logger.info(f"Performing dynamic site check for: {url}")
+    report = report if report is not None else {}
 
-    requests_text = ""
+    def decide(dynamic: bool, method: str) -> bool:
+        report.update(dynamic=dynamic, method=method)
+        return dynamic
+
+    requests_page = None
     selenium_text = ""
 
     # 1. Fetch with Requests
     try:
-        request_helper = RequestHelper()
+        request_helper = RequestHelper(extractor=extractor, remove_boilerplate=False)
         response = request_helper.request(url, timeout=timeout)
         if response:
-            requests_text = BeautifulSoup(response.text, 'html.parser').get_text()
+            requests_page = request_helper.parse_page(response.text, url)
         else:
             logger.warning("Requests fetch failed during dynamic check. Assuming site needs Selenium.")
-            return True
+            return decide(True, "fallback")
     except Exception as e:
         logger.error(f"Error fetching with requests during dynamic check: {e}. Assuming site needs Selenium.")
-        return True
+        return decide(True, "fallback")
+
+    # 2. Classify the raw HTML
+    if CRAWL_DYNAMIC_HEURISTIC:
+        classification = classify_page(response.text, requests_page)
+        report.update(score=classification['score'], signals=classification['signals'])
+        if classification['dynamic'] is not None:
+            logger.info(
+                f"Site is {'DYNAMIC' if classification['dynamic'] else 'STATIC'} from its HTML. "
+                f"Score: {classification['score']}, Signals: {classification['signals']}"
+            )
+            return decide(classification['dynamic'], "heuristic")
+        logger.info(
+            f"HTML is inconclusive. Score: {classification['score']}, Signals: {classification['signals']}. "
+            "Checking with Selenium."
+        )
 
-    # 2. Fetch with Selenium
+    # 3. Fetch with Selenium
+    keep_driver = selenium_helper is not None
     try:
-        selenium_helper = SeleniumHelper()
-        driver = selenium_helper.get_driver(headless=True, page_load_strategy="eager")  # eager for speed
+        if selenium_helper is None:
+            selenium_helper = SeleniumHelper(extractor=extractor, remove_boilerplate=False)
+        if selenium_helper.driver is None:
+            selenium_helper.driver = selenium_helper.crawl_driver()
         _, selenium_text = selenium_helper.get_page_source(url, timeout=timeout)
-        selenium_helper.quit_driver()
+        if not keep_driver:
+            selenium_helper.quit_driver(sleep_time=0)
     except Exception as e:
         logger.error(f"Error fetching with Selenium during dynamic check: {e}. Falling back to requests-based crawl.")
-        return False
+        return decide(False, "fallback")
 
-    # 3. Compare content length
-    len_req = len(requests_text.strip())
+    # 4. Compare content length
+    len_req = len(requests_page['cleanedData'].strip())
     len_sel = len(selenium_text.strip())
 
     # If selenium text is more than 30% longer, consider it dynamic.
     if len_req > 0 and (len_sel - len_req) / len_req > 0.3:
         logger.info(f"Site is DYNAMIC. Requests length: {len_req}, Selenium length: {len_sel}")
-        return True
+        return decide(True, "browser")
 
     logger.info(f"Site is STATIC. Requests length: {len_req}, Selenium length: {len_sel}")
-    return False
-
-
-async def crawl_website(base_url: str):
+    return decide(False, "browser")
+
+
+async def crawl_website(
+    base_url: str,
+    progress_callback=None,
+    page_sink=None,
+    extractor: ExtractorType | str | None = None,
+    remove_boilerplate: bool | None = None,
+    stats: dict | None = None,
+    resume: bool = False,
+    mode: CrawlMode | str | None = None,
+    stop_event: threading.Event | None = None,
+):
+    """
+    Crawls `base_url` and returns the directory the results were saved to.
+    Pass a dict as `stats` to receive the crawl's page, boilerplate, duplicate
+    and politeness counts, and how the static/dynamic check decided. With
+    `resume`, a crawl that died part way picks up from its checkpoint: same
+    strategy, no sitemap or dynamic probing again, pages restored (unless
+    they were streamed to `page_sink`) and only the remaining frontier
+    fetched. `mode` (CRAWL_MODE by default)
+    chooses between one crawler for the whole site (auto) and HTTP first
+    with a browser only for the pages that need one (hybrid); hybrid skips
+    the dynamic check. Setting `stop_event` abandons the crawl: the crawlers
+    stop queueing and fetching, and the checkpoint is kept for a resume.
+    """
     filename = base_url.rstrip("/").split("/")[-1]
-
-    request_helper = RequestHelper()
-    sitemap_urls = request_helper.get_sitemaps_from_robots_txt(base_url)
-
-    if len(sitemap_urls) > 0:
-        logger.info("Sitemap found. Scraping through Sitemap URLs using requests.")
-        all_urls = []
-        for sitemap in sitemap_urls:
-            all_urls.extend(list(request_helper.get_urls_from_sitemap(sitemap)))
-        return request_helper.scrape_using_sitemap_urls(all_urls, filename)
-
-    loop = asyncio.get_event_loop()
-    is_dynamic = await loop.run_in_executor(None, is_site_dynamic, base_url)
-
-    if is_dynamic:
-        logger.info("Site appears to be dynamic. Using Selenium for crawling.")
-        selenium_helper = SeleniumHelper()
-        return await loop.run_in_executor(
-            None, selenium_helper.scrape_entire_website_with_selenium, base_url, filename
+    mode = CrawlMode(mode or CRAWL_MODE)
+
+    # Streamed pages are already downstream, so their checkpoint keeps URLs and statuses only.
+    checkpoint = CrawlCheckpoint(filename, store_pages=page_sink is None) if CRAWL_CHECKPOINT else None
+    strategy = checkpoint.strategy if checkpoint and resume and checkpoint.load() else None
+    if resume and strategy is None:
+        logger.info(f"No checkpoint to resume for {base_url}. Starting a new crawl.")
+
+    request_helper = AsyncRequestHelper(
+        progress_callback=progress_callback,
+        page_sink=page_sink,
+        extractor=extractor,
+        remove_boilerplate=remove_boilerplate,
+        checkpoint=checkpoint,
+        stop_event=stop_event,
+    )
+
+    def new_selenium_helper() -> SeleniumHelper:
+        return SeleniumHelper(
+            progress_callback=progress_callback,
+            page_sink=page_sink,
+            extractor=extractor,
+            remove_boilerplate=remove_boilerplate,
+            robots=request_helper.load_robots(base_url) if request_helper.respect_robots else None,
+            checkpoint=checkpoint,
+            stop_event=stop_event,
         )
-    else:
-        logger.info("Site appears to be static. Using Requests for crawling.")
-        return await request_helper.scrape_entire_website_with_main_url_async(base_url, filename)
+
+    all_urls = []
+    selenium_helper = None
+    dynamic_check = None
+    if strategy is None:
+        sitemap_urls = request_helper.get_sitemaps_from_robots_txt(base_url)
+        if len(sitemap_urls) > 0:
+            strategy = CrawlStrategy.SITEMAP
+            for sitemap in sitemap_urls:
+                all_urls.extend(list(request_helper.get_urls_from_sitemap(sitemap)))
+        elif mode == CrawlMode.HYBRID:
+            strategy = CrawlStrategy.HYBRID
+        else:
+            selenium_helper = new_selenium_helper()
+            dynamic_check = {}
+            loop = asyncio.get_event_loop()
+            is_dynamic = await loop.run_in_executor(
+                None, is_site_dynamic, base_url, 15, extractor, selenium_helper, dynamic_check
+            )
+            strategy = CrawlStrategy.DYNAMIC if is_dynamic else CrawlStrategy.STATIC
+            if not is_dynamic and selenium_helper.driver is not None:
+                selenium_helper.quit_driver(sleep_time=0)
+
+    if mode == CrawlMode.HYBRID or strategy == CrawlStrategy.HYBRID:
+        renderer = SeleniumHelper(extractor=extractor, remove_boilerplate=False)
+        # One politeness budget per host for both the HTTP fetches and the renders.
+        renderer.rate_limiter = request_helper.rate_limiter
+        request_helper.renderer = renderer
+
+    if checkpoint:
+        checkpoint.start(strategy)
+    try:
+        if strategy == CrawlStrategy.SITEMAP:
+            logger.info("Sitemap found. Scraping through Sitemap URLs using requests.")
+            if progress_callback:
+                await asyncio.to_thread(
+                    progress_callback, 0,
+                    total=len(checkpoint.seen) if checkpoint and checkpoint.resumed else len(all_urls),
+                )
+            crawler = request_helper
+            directory_path = await request_helper.scrape_using_sitemap_urls_async(all_urls, filename)
+        elif strategy == CrawlStrategy.DYNAMIC:
+            logger.info("Site appears to be dynamic. Using Selenium for crawling.")
+            # Reuses the probe's browser when there was a probe.
+            crawler = selenium_helper or new_selenium_helper()
+            loop = asyncio.get_event_loop()
+            directory_path = await loop.run_in_executor(
+                None, crawler.scrape_entire_website_with_selenium, base_url, filename
+            )
+        elif strategy == CrawlStrategy.HYBRID:
+            logger.info("Hybrid crawl. Using Requests, with Selenium for pages that need rendering.")
+            crawler = request_helper
+            directory_path = await request_helper.scrape_entire_website_with_main_url_async(base_url, filename)
+        else:
+            logger.info("Site appears to be static. Using Requests for crawling.")
+            crawler = request_helper
+            directory_path = await request_helper.scrape_entire_website_with_main_url_async(base_url, filename)
+        stopped = stop_event is not None and stop_event.is_set()
+        if stopped:
+            logger.warning(f"Crawl of {base_url} stopped before finishing. Its checkpoint is kept for a resume.")
+        elif checkpoint:
+            checkpoint.finish()
+    finally:
+        if checkpoint:
+            checkpoint.close()
+
+    crawl_stats = crawler.crawl_stats()
+    crawl_stats["checkpoint"] = checkpoint.stats() if checkpoint else None
+    crawl_stats["dynamic_check"] = dynamic_check
+    crawl_stats["stopped"] = stopped
+    if stats is not None:
+        stats.update(crawl_stats)
+    return directory_path
 
 
 if __name__ == '__main__':
@@ -1,17 +1,19 @@
 from fastapi import APIRouter
 from starlette.responses import JSONResponse
 
-from apps.routes.crawl.helpers import crawl_website
-from apps.routes.crawl.dto import CrawlerInputModel
+from apps.jobs.broker import get_broker
+from apps.jobs.tasks import run_crawl_job, run_crawl_train_job
+from apps.routes.crawl.dto import CrawlerInputModel, CrawlTrainInputModel
+from apps.routes.query.semantic_cache import semantic_cache
 from apps.routes.train import logger
-from libs.db.mongodb.helpers import update_session
-from libs.enums import Status
+from libs.db.mongodb.helpers import create_job, update_session
+from libs.enums import JobType, Status, VectorStoreType
 
 crawl_route = APIRouter(tags=["CRAWLER"])
 
 
 @crawl_route.post("/crawl")
-async def crawl_and_store(crawl_data: CrawlerInputModel):
+def crawl_and_store(crawl_data: CrawlerInputModel):
     try:
         logger.info(f"Crawl Route accessed for website: {crawl_data.website}")
 
@@ -22,21 +24,20 @@ async def crawl_and_store(crawl_data: CrawlerInputModel):
             "website": str(crawl_data.website)
         })
 
-        directory_path = await crawl_website(base_url=str(crawl_data.website))
-        logger.info(f"Crawling finished. Data saved to: {directory_path}")
-
-        logger.info(f"Updating session '{crawl_data.name}' to status: {Status.CRAWLED.value}")
-        update_session(name=crawl_data.name, document_to_update={
-            "status": Status.CRAWLED.value,
-            "source_directory": directory_path
-        })
+        job_id = create_job(
+            job_type=JobType.CRAWL.value,
+            name=crawl_data.name,
+            payload={"website": str(crawl_data.website)},
+        )
+        get_broker().submit(job_id, run_crawl_job, crawl_data.model_dump(mode="json"))
 
         return JSONResponse(
             content={
                 "success": True,
-                "message": f"Website crawled successfully. Scraped data saved to {directory_path}",
+                "message": f"Crawl queued for {crawl_data.website}. Track progress at /jobs/{job_id}",
+                "job_id": job_id,
             },
-            status_code=200,
+            status_code=202,
         )
 
     except Exception as e:
@@ -48,4 +49,54 @@ async def crawl_and_store(crawl_data: CrawlerInputModel):
         })
         return JSONResponse(
             content={"success": False, "error": str(e)}, status_code=500
-        )
\ No newline at end of file
+        )
+
+
+@crawl_route.post("/crawl/train")
+def crawl_and_train(crawl_data: CrawlTrainInputModel):
+    try:
+        logger.info(f"Crawl and Train Route accessed for website: {crawl_data.website}")
+
+        document_to_update = {
+            "status": Status.TRAINING.value,
+            "name": crawl_data.name,
+            "website": str(crawl_data.website),
+            "vector_store": crawl_data.vector_store.value,
+        }
+        if crawl_data.vector_store == VectorStoreType.CHROMA:
+            document_to_update["chroma_collection_name"] = crawl_data.chroma_collection_name
+        else:
+            document_to_update["pinecone_index_name"] = crawl_data.pinecone_index_name
+        if crawl_data.semantic_cache_threshold is not None:
+            document_to_update["semantic_cache_threshold"] = crawl_data.semantic_cache_threshold
+
+        logger.info(f"Updating session '{crawl_data.name}' to status: {Status.TRAINING.value}")
+        update_session(name=crawl_data.name, document_to_update=document_to_update)
+        semantic_cache.invalidate(crawl_data.name)
+
+        job_id = create_job(
+            job_type=JobType.CRAWL_TRAIN.value,
+            name=crawl_data.name,
+            payload={"website": str(crawl_data.website)},
+        )
+        get_broker().submit(job_id, run_crawl_train_job, crawl_data.model_dump(mode="json"))
+
+        return JSONResponse(
+            content={
+                "success": True,
+                "message": f"Crawl and train queued for {crawl_data.website}. Track progress at /jobs/{job_id}",
+                "job_id": job_id,
+            },
+            status_code=202,
+        )
+
+    except Exception as e:
+        logger.error(f"Error Occurred during crawl and train for session {crawl_data.name} - {str(e)}")
+        logger.info(f"Updating session '{crawl_data.name}' to status: {Status.TRAINING_FAILED.value}")
+        update_session(name=crawl_data.name, document_to_update={
+            "status": Status.TRAINING_FAILED.value,
+            "error": str(e)
+        })
+        return JSONResponse(
+            content={"success": False, "error": str(e)}, status_code=500
+        )
@@ -0,0 +1,4 @@
+from libs.logger import get_logger
+
+logger, listener = get_logger("jobs-apis")
+listener.start()
@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+from fastapi.encoders import jsonable_encoder
+from starlette.responses import JSONResponse
+
+from apps.routes.jobs import logger
+from libs.db.mongodb.helpers import get_job
+
+jobs_route = APIRouter(tags=["JOBS"])
+
+
+@jobs_route.get("/jobs/{job_id}")
+def get_job_status(job_id: str):
+    logger.info(f"Jobs route accessed for job: {job_id}")
+    job = get_job(job_id=job_id)
+    if not job:
+        return JSONResponse(
+            content={"success": False, "error": f"Job {job_id} not found"}, status_code=404
+        )
+
+    return JSONResponse(content={"success": True, "job": jsonable_encoder(job)}, status_code=200)
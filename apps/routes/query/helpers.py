@@ -1,24 +1,41 @@
+import asyncio
+import time
+
 from apps.llm.claude import ClaudeHandler
 from apps.llm.gemini import GeminiHandler
 from apps.llm.openai import OpenAIHandler
 from apps.routes.query import logger
 from apps.routes.query.dto import QueryInputModel
+from apps.routes.query.semantic_cache import semantic_cache
+from apps.vector_stores.cache import vector_store_cache
 from apps.vector_stores.chroma_db import ChromaManager
 from apps.vector_stores.pinecone import PineconeManager
+from libs.config import SEMANTIC_CACHE_ENABLED, SEMANTIC_CACHE_MAX_ENTRIES
+from libs.db.mongodb.helpers import aget_cached_conversations
 from libs.enums import LLMType, VectorStoreType
 
 
 def get_vector_store_object(session_data: dict):
     if session_data.get("vector_store") == VectorStoreType.CHROMA.name:
-        vector_store_object = ChromaManager(
-            collection_name=session_data.get("chroma_collection_name")
+        collection_name = session_data.get("chroma_collection_name")
+        return vector_store_cache.get_or_create(
+            store_type=VectorStoreType.CHROMA.value,
+            name=collection_name,
+            factory=lambda: ChromaManager(
+                collection_name=collection_name
+            ).get_vector_store(),
+            version=session_data.get("updatedAt"),
         )
-        return vector_store_object.get_vector_store()
     else:
-        vector_store_object = PineconeManager(
-            index_name=session_data.get("pinecone_index_name")
+        index_name = session_data.get("pinecone_index_name")
+        return vector_store_cache.get_or_create(
+            store_type=VectorStoreType.PINECONE.value,
+            name=index_name,
+            factory=lambda: PineconeManager(
+                index_name=index_name
+            ).get_vector_store(),
+            version=session_data.get("updatedAt"),
         )
-        return vector_store_object.get_vector_store()
 
 
 def parse_openai_response(response):
@@ -28,7 +45,7 @@ def parse_openai_response(response):
     return content, response_metadata, usage_metadata
 
 
-def ask_llm(query_data: QueryInputModel, session_data: dict):
+async def get_llm_handler(query_data: QueryInputModel, session_data: dict):
     logger.debug(
         f"Processing query - {query_data.user_query} - "
         f"Using LLM - {query_data.llm.name} - "
@@ -44,16 +61,151 @@ def ask_llm(query_data: QueryInputModel, session_data: dict):
 
     llm_class = llm_mapping.get(query_data.llm)
     logger.debug(f"Received LLM Class - {llm_class.__name__} ")
-    vector_store_object = get_vector_store_object(session_data=session_data)
-    llm = llm_class(vector_store=vector_store_object)
+    # Opening a handle is a no-op on a cache hit, but a miss can hit the
+    # network (Pinecone index checks), so keep it off the event loop.
+    vector_store_object = await asyncio.to_thread(
+        get_vector_store_object, session_data=session_data
+    )
+    return llm_class(vector_store=vector_store_object)
+
+
+def get_semantic_cache_scope(query_data: QueryInputModel):
+    return semantic_cache.make_scope(
+        query_data.llm.name, query_data.prompt, query_data.use_context
+    )
+
+
+async def lookup_semantic_cache(llm, query_data: QueryInputModel, session_data: dict):
+    """
+    Returns (query_embedding, cached_response, similarity). The embedding is
+    None when the semantic cache is disabled.
+    """
+    if not SEMANTIC_CACHE_ENABLED:
+        return None, None, 0.0
+
+    name = session_data.get("name")
+    trained_at = session_data.get("trainedAt")
+    if not semantic_cache.is_warm(name, trained_at):
+        conversations = await aget_cached_conversations(
+            name=name, since=trained_at, limit=SEMANTIC_CACHE_MAX_ENTRIES
+        )
+        semantic_cache.warm(name, trained_at, conversations)
+
+    query_embedding = await llm.vector_store.embeddings.aembed_query(query_data.user_query)
+    cached_response, similarity = semantic_cache.lookup(
+        session_data=session_data,
+        scope=get_semantic_cache_scope(query_data),
+        embedding=query_embedding,
+    )
+    if cached_response is not None:
+        logger.info(f"Semantic cache hit - {name} - similarity - {similarity:.4f}")
+    return query_embedding, cached_response, similarity
+
+
+def add_to_semantic_cache(query_data: QueryInputModel, session_data: dict, query_embedding, ai_response: str):
+    if query_embedding is None:
+        return
+    semantic_cache.add(
+        session_data=session_data,
+        scope=get_semantic_cache_scope(query_data),
+        user_query=query_data.user_query,
+        embedding=query_embedding,
+        ai_response=ai_response,
+    )
+
+
+async def ask_llm(query_data: QueryInputModel, session_data: dict):
+    """
+    Returns (content, response_metadata, usage_metadata, query_embedding). The
+    embedding is only returned for fresh answers so cached replies are not
+    indexed twice when the conversation is stored.
+    """
+    llm = await get_llm_handler(query_data=query_data, session_data=session_data)
+
+    query_embedding, cached_response, similarity = await lookup_semantic_cache(
+        llm=llm, query_data=query_data, session_data=session_data
+    )
+    if cached_response is not None:
+        response_metadata = {"semantic_cache": {"hit": True, "similarity": similarity}}
+        return cached_response, response_metadata, None, None
+
     logger.debug("Querying LLM for Response")
-    response = llm.generate_response(
+    response = await llm.agenerate_response(
+        user_query=query_data.user_query,
+        prompt=query_data.prompt,
+        use_context=query_data.use_context,
+    )
+
+    content, response_metadata, usage_metadata = parse_openai_response(response)
+    add_to_semantic_cache(query_data, session_data, query_embedding, content)
+    if query_embedding is not None:
+        response_metadata = {
+            **response_metadata,
+            "semantic_cache": {"hit": False, "similarity": similarity},
+        }
+    return content, response_metadata, usage_metadata, query_embedding
+
+
+async def stream_llm(query_data: QueryInputModel, session_data: dict):
+    """
+    Yields ("token", text) while the provider streams, then a single
+    ("done", (content, response_metadata, usage_metadata, query_embedding))
+    once it closes.
+    """
+    llm = await get_llm_handler(query_data=query_data, session_data=session_data)
+
+    query_embedding, cached_response, similarity = await lookup_semantic_cache(
+        llm=llm, query_data=query_data, session_data=session_data
+    )
+    if cached_response is not None:
+        yield "token", cached_response
+        response_metadata = {"semantic_cache": {"hit": True, "similarity": similarity}}
+        yield "done", (cached_response, response_metadata, None, None)
+        return
+
+    logger.debug("Streaming LLM Response")
+
+    start_time = time.perf_counter()
+    first_token_time = None
+    aggregated = None
+    content_parts = []
+    chunk_count = 0
+
+    async for chunk in llm.astream_response(
         user_query=query_data.user_query,
         prompt=query_data.prompt,
         use_context=query_data.use_context,
+    ):
+        aggregated = chunk if aggregated is None else aggregated + chunk
+        text = llm.chunk_text(chunk)
+        if not text:
+            continue
+        if first_token_time is None:
+            first_token_time = time.perf_counter()
+        chunk_count += 1
+        content_parts.append(text)
+        yield "token", text
+
+    end_time = time.perf_counter()
+    response_metadata = dict(aggregated.response_metadata) if aggregated else {}
+    usage_metadata = aggregated.usage_metadata if aggregated else None
+
+    output_tokens = (usage_metadata or {}).get("output_tokens") or chunk_count
+    generation_time = end_time - (first_token_time or start_time)
+    response_metadata["time_to_first_token"] = (
+        round(first_token_time - start_time, 4) if first_token_time else None
     )
+    response_metadata["total_time"] = round(end_time - start_time, 4)
+    response_metadata["tokens_per_second"] = (
+        round(output_tokens / generation_time, 2) if generation_time > 0 else None
+    )
+
+    if query_embedding is not None:
+        response_metadata["semantic_cache"] = {"hit": False, "similarity": similarity}
 
-    return parse_openai_response(response)
+    content = "".join(content_parts)
+    add_to_semantic_cache(query_data, session_data, query_embedding, content)
+    yield "done", (content, response_metadata, usage_metadata, query_embedding)
 
 
 def create_conversation_object(
@@ -63,13 +215,21 @@ def create_conversation_object(
     ai_response: str,
     response_metadata: dict,
     usage_metadata: dict,
+    prompt: str | None = None,
+    use_context: bool | None = True,
+    query_embedding: list | None = None,
 ):
     logger.debug(f"Creating conversation object ....")
-    return {
+    conversation_object = {
         "name": name,
         "llm": llm,
         "user_query": user_query,
         "ai_response": ai_response,
         "response_metadata": response_metadata,
         "usage_metadata": usage_metadata,
+        "prompt": prompt,
+        "use_context": use_context,
     }
+    if query_embedding is not None:
+        conversation_object["query_embedding"] = list(query_embedding)
+    return conversation_object
@@ -1,46 +1,57 @@
+import json
+
 from fastapi import APIRouter
-from starlette.responses import JSONResponse
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse, StreamingResponse
 
 from apps.routes.query import logger
 from apps.routes.query.dto import QueryInputModel
-from apps.routes.query.helpers import ask_llm, create_conversation_object
-from libs.db.mongodb.helpers import get_sessions, store_conversations
+from apps.routes.query.helpers import ask_llm, create_conversation_object, stream_llm
+from libs.db.mongodb.helpers import aget_sessions, astore_conversations
 from libs.enums import Status
 
 query_route = APIRouter(tags=["QUERY"])
 
 
+def get_session_error_response(query_data: QueryInputModel, session_data: dict | None):
+    if session_data is None:
+        logger.error(f"Session Data Not Found - name - {query_data.name}")
+        return JSONResponse(
+            content={
+                "success": False,
+                "user_query": query_data.user_query,
+                "error": "Session Data Not Found.",
+            },
+            status_code=400,
+        )
+
+    if session_data.get("status") != Status.READY.value:
+        logger.error(f"Session not ready for querying - name - {query_data.name} - status - {session_data.get('status')}")
+        return JSONResponse(
+            content={
+                "success": False,
+                "user_query": query_data.user_query,
+                "error": f"Session is not ready for querying. Current status: {session_data.get('status')}",
+            },
+            status_code=400,
+        )
+
+    return None
+
+
 @query_route.post("/query")
-def query_llm(query_data: QueryInputModel):
+async def query_llm(query_data: QueryInputModel):
     try:
         logger.info("Query Route accessed ...")
-        session_data = get_sessions(name=query_data.name)
-
-        if session_data is None:
-            logger.error(f"Session Data Not Found - name - {query_data.name}")
-            return JSONResponse(
-                content={
-                    "success": False,
-                    "user_query": query_data.user_query,
-                    "error": "Session Data Not Found.",
-                },
-                status_code=400,
-            )
+        session_data = await aget_sessions(name=query_data.name)
 
-        if session_data.get("status") != Status.READY.value:
-            logger.error(f"Session not ready for querying - name - {query_data.name} - status - {session_data.get('status')}")
-            return JSONResponse(
-                content={
-                    "success": False,
-                    "user_query": query_data.user_query,
-                    "error": f"Session is not ready for querying. Current status: {session_data.get('status')}",
-                },
-                status_code=400,
-            )
+        error_response = get_session_error_response(query_data, session_data)
+        if error_response is not None:
+            return error_response
 
         logger.debug(f"Session '{query_data.name}' is ready. Proceeding with query.")
 
-        content, response_metadata, usage_metadata = ask_llm(
+        content, response_metadata, usage_metadata, query_embedding = await ask_llm(
             query_data=query_data, session_data=session_data
         )
 
@@ -51,9 +62,12 @@ def query_llm(query_data: QueryInputModel):
             ai_response=content,
             response_metadata=response_metadata,
             usage_metadata=usage_metadata,
+            prompt=query_data.prompt,
+            use_context=query_data.use_context,
+            query_embedding=query_embedding,
         )
 
-        store_conversations(conversation_object)
+        await astore_conversations(conversation_object)
         logger.info(f"Received Response - {str(content)}")
         return JSONResponse(
             content={
@@ -76,3 +90,83 @@ def query_llm(query_data: QueryInputModel):
             },
             status_code=500,
         )
+
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@query_route.post("/query/stream")
+async def stream_query_llm(query_data: QueryInputModel):
+    logger.info("Streaming Query Route accessed ...")
+    try:
+        session_data = await aget_sessions(name=query_data.name)
+    except Exception as e:
+        logger.error(f"Error Occurred -  {str(e)}")
+        return JSONResponse(
+            content={
+                "success": False,
+                "query": query_data.user_query,
+                "response": None,
+                "error": str(e),
+            },
+            status_code=500,
+        )
+
+    error_response = get_session_error_response(query_data, session_data)
+    if error_response is not None:
+        return error_response
+
+    logger.debug(f"Session '{query_data.name}' is ready. Proceeding with streaming query.")
+    conversation = {}
+
+    async def event_stream():
+        try:
+            async for event, payload in stream_llm(
+                query_data=query_data, session_data=session_data
+            ):
+                if event == "token":
+                    yield format_sse("token", {"content": payload})
+                    continue
+
+                content, response_metadata, usage_metadata, query_embedding = payload
+                conversation.update(
+                    create_conversation_object(
+                        name=query_data.name,
+                        llm=query_data.llm.name,
+                        user_query=query_data.user_query,
+                        ai_response=content,
+                        response_metadata=response_metadata,
+                        usage_metadata=usage_metadata,
+                        prompt=query_data.prompt,
+                        use_context=query_data.use_context,
+                        query_embedding=query_embedding,
+                    )
+                )
+                logger.info(f"Received Streamed Response - {str(content)}")
+                yield format_sse(
+                    "done",
+                    {
+                        "success": True,
+                        "user_query": query_data.user_query,
+                        "ai_response": content,
+                        "response_metadata": response_metadata,
+                        "usage_metadata": usage_metadata,
+                    },
+                )
+        except Exception as e:
+            logger.error(f"Error Occurred while streaming -  {str(e)}")
+            yield format_sse(
+                "error",
+                {"success": False, "query": query_data.user_query, "error": str(e)},
+            )
+
+    async def persist_conversation():
+        if conversation:
+            await astore_conversations(conversation)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        background=BackgroundTask(persist_conversation),
+    )
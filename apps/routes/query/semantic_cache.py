@@ -0,0 +1,171 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from apps.routes.query import logger
+from libs.config import (
+    SEMANTIC_CACHE_MAX_ENTRIES,
+    SEMANTIC_CACHE_MAX_SESSIONS,
+    SEMANTIC_CACHE_THRESHOLD,
+)
+
+
+class _ScopeIndex:
+    """
+    Cosine-similarity index over past query embeddings of one session scope.
+    Vectors are kept L2-normalised and stacked lazily, so a lookup is a single
+    matrix-vector product; the index is bounded, so brute force stays cheap.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self._matrix = None
+        self._keys = []
+
+    def add(self, key: str, vector: np.ndarray, ai_response: str):
+        self.entries[key] = (vector, ai_response)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self._matrix = None
+
+    def search(self, vector: np.ndarray):
+        if not self.entries:
+            return None, 0.0
+        if self._matrix is None:
+            self._keys = list(self.entries.keys())
+            self._matrix = np.vstack([self.entries[k][0] for k in self._keys])
+
+        scores = self._matrix @ vector
+        best = int(np.argmax(scores))
+        key = self._keys[best]
+        self.entries.move_to_end(key)
+        return self.entries[key][1], float(scores[best])
+
+
+class SemanticCache:
+    """
+    Per-session cache of answered queries. A lookup returns a past
+    `ai_response` when the new query's embedding is within the session's
+    cosine threshold of a previous one and the session has not been
+    retrained since (tracked through the session's `trainedAt`).
+    """
+
+    def __init__(
+        self,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+        max_sessions: int = SEMANTIC_CACHE_MAX_SESSIONS,
+    ):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    @staticmethod
+    def make_scope(llm: str, prompt: str | None, use_context: bool | None) -> tuple:
+        return llm, prompt or "", bool(use_context)
+
+    def get_threshold(self, session_data: dict) -> float:
+        return float(session_data.get("semantic_cache_threshold") or self.threshold)
+
+    def _get_session(self, name: str, trained_at):
+        """Returns the session's scope map, or None when it must be (re)warmed."""
+        session = self._sessions.get(name)
+        if session is None:
+            return None
+        if session["trained_at"] != trained_at:
+            logger.debug(f"Semantic cache is stale for session - {name}")
+            del self._sessions[name]
+            return None
+        self._sessions.move_to_end(name)
+        return session["scopes"]
+
+    def is_warm(self, name: str, trained_at) -> bool:
+        with self._lock:
+            return self._get_session(name, trained_at) is not None
+
+    def warm(self, name: str, trained_at, conversations: list):
+        with self._lock:
+            scopes = {}
+            self._sessions[name] = {"trained_at": trained_at, "scopes": scopes}
+            self._sessions.move_to_end(name)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+            # Oldest first so the most recent conversations win the LRU slots.
+            for conversation in reversed(conversations):
+                scope = self.make_scope(
+                    conversation.get("llm"),
+                    conversation.get("prompt"),
+                    conversation.get("use_context", True),
+                )
+                index = scopes.setdefault(scope, _ScopeIndex(self.max_entries))
+                index.add(
+                    key=conversation.get("user_query"),
+                    vector=self.normalize(conversation["query_embedding"]),
+                    ai_response=conversation.get("ai_response"),
+                )
+        logger.debug(f"Warmed semantic cache for session - {name} - with {len(conversations)} conversations")
+
+    def lookup(self, session_data: dict, scope: tuple, embedding):
+        name = session_data.get("name")
+        with self._lock:
+            scopes = self._get_session(name, session_data.get("trainedAt"))
+            index = scopes.get(scope) if scopes else None
+            if index is None:
+                self.misses += 1
+                return None, 0.0
+
+            ai_response, similarity = index.search(self.normalize(embedding))
+            if ai_response is not None and similarity >= self.get_threshold(session_data):
+                self.hits += 1
+                return ai_response, similarity
+
+            self.misses += 1
+            return None, similarity
+
+    def add(self, session_data: dict, scope: tuple, user_query: str, embedding, ai_response: str):
+        name = session_data.get("name")
+        with self._lock:
+            scopes = self._get_session(name, session_data.get("trainedAt"))
+            if scopes is None:
+                # Only cache into warmed sessions, otherwise a later warm-up would drop it anyway.
+                return
+            index = scopes.setdefault(scope, _ScopeIndex(self.max_entries))
+            index.add(key=user_query, vector=self.normalize(embedding), ai_response=ai_response)
+
+    def invalidate(self, name: str):
+        with self._lock:
+            if self._sessions.pop(name, None) is not None:
+                logger.info(f"Invalidated semantic cache for session - {name}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "entries": sum(
+                    len(index.entries)
+                    for session in self._sessions.values()
+                    for index in session["scopes"].values()
+                ),
+                "max_sessions": self.max_sessions,
+                "max_entries_per_scope": self.max_entries,
+                "threshold": self.threshold,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+semantic_cache = SemanticCache()
@@ -15,6 +15,10 @@ class TrainInputModel(BaseModel):
     chroma_collection_name: str | None = None
     pinecone_index_name: str | None = None
     wikipedia_query: str | None = None
+    semantic_cache_threshold: float | None = None
+    incremental: bool = False
+    # Sources (file paths or URLs) whose chunks are deleted from the collection.
+    removed_sources: list[str] | None = None
 
     @field_validator("pinecone_index_name", "chroma_collection_name")
     def sanitize_name(cls, v: str) -> str:
@@ -59,4 +63,9 @@ class TrainInputModel(BaseModel):
                 "pinecone_index_name must be provided when vector_store is pinecone"
             )
 
+        if self.semantic_cache_threshold is not None and not (
+            0 < self.semantic_cache_threshold <= 1
+        ):
+            raise ValueError("semantic_cache_threshold must be between 0 and 1")
+
         return self
\ No newline at end of file
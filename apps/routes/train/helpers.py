@@ -11,12 +11,19 @@ from apps.loaders.wikipedia_loader import WikipediaPageLoader
 from apps.loaders.youtube_transcripts_loader import YoutubeUrlLoader
 from apps.routes.train import logger
 from apps.routes.train.dto import TrainInputModel
+from apps.vector_stores.cache import vector_store_cache
 from apps.vector_stores.chroma_db import ChromaManager
+from apps.vector_stores.ingestion import get_chunk_id, get_document_source
 from apps.vector_stores.pinecone import PineconeManager
+from libs.db.mongodb.helpers import (
+    add_chunk_manifest_entries,
+    delete_chunk_manifest_entries,
+    get_chunk_manifest,
+)
 from libs.enums import FileType, VectorStoreType
 
 
-def load_documents(train_data=TrainInputModel, directory: Path | None = None):
+def iter_documents(train_data=TrainInputModel, directory: Path | None = None):
     logger.debug(
         f"Loading Documents of file type - {train_data.file_type.name if train_data.file_type else None} - "
         f"From Directory - {str(directory)} - "
@@ -24,7 +31,6 @@ def load_documents(train_data=TrainInputModel, directory: Path | None = None):
         f"Wikipedia Query Provided - {train_data.wikipedia_query is not None} "
     )
 
-    all_documents = []
     loader_mapping = {
         FileType.PDF: PDFLoader,
         FileType.DOCX: DocsLoader,
@@ -37,34 +43,118 @@ def load_documents(train_data=TrainInputModel, directory: Path | None = None):
         loader_class = loader_mapping.get(train_data.file_type)
         logger.debug(f"Received Loader Class - {loader_class.__name__} ")
         loader = loader_class(directory=directory)
-        all_documents.extend(loader.load_documents())
+        yield from loader.iter_documents()
 
     if train_data.web:
         if train_data.yt_links:
             loader = YoutubeUrlLoader()
-            all_documents.extend(
-                loader.load_documents(youtube_links=train_data.yt_links)
-            )
+            yield from loader.iter_documents(youtube_links=train_data.yt_links)
         if train_data.wikipedia_query:
             loader = WikipediaPageLoader(query=train_data.wikipedia_query)
-            all_documents.extend(loader.load_documents())
+            yield from loader.iter_documents()
 
+    # Only reached once every chunk has been consumed, so a failed store keeps the source files.
     if directory and directory.exists():
         logger.debug(f"Cleaning up directory - {str(directory)}")
         shutil.rmtree(directory)
 
-    return all_documents
+
+def load_documents(train_data=TrainInputModel, directory: Path | None = None):
+    return list(iter_documents(train_data=train_data, directory=directory))
 
 
-def store_documents(documents: list, train_data: TrainInputModel):
+def store_documents(documents, train_data: TrainInputModel, progress_callback=None, partial: bool = False) -> dict:
+    """
+    Stores documents under deterministic chunk ids and records each batch in
+    the collection's chunk manifest as soon as the store accepts it. Chunks
+    of a source this run loaded again, but no longer produced by it, are
+    deleted, as are all chunks of `train_data.removed_sources`; sources the
+    run did not touch are left alone, so adding a file never drops the rest
+    of the collection. With `train_data.incremental`, chunks already in the
+    manifest are skipped, so a retrain only pays for the diff. An existing
+    collection without a manifest was trained before chunk ids were
+    deterministic (or its manifest was lost); its chunks cannot be matched,
+    so it is cleared and rebuilt on that first run. Set `partial` when the
+    documents are only part of their sources, like a resumed streamed crawl
+    whose earlier pages were embedded before the interruption: nothing is
+    cleared or deleted then, only stored.
+    """
+    store_type = train_data.vector_store.value
     if train_data.vector_store == VectorStoreType.CHROMA:
-        vector_store_object = ChromaManager(
-            collection_name=train_data.chroma_collection_name
-        )
+        name = train_data.chroma_collection_name
+        vector_store_object = ChromaManager(collection_name=name)
     else:
-        vector_store_object = PineconeManager(
-            index_name=train_data.pinecone_index_name
+        name = train_data.pinecone_index_name
+        vector_store_object = PineconeManager(index_name=name)
+
+    # Query workers may hold a handle to the collection being rewritten
+    # (Pinecone can even drop and recreate the index), so drop it up front.
+    vector_store_cache.invalidate(store_type=store_type, name=name)
+    try:
+        vector_store_object.get_vector_store()
+
+        existing_chunks = {}
+        if vector_store_object.created:
+            # A brand-new collection/index holds nothing the old manifest describes.
+            delete_chunk_manifest_entries(vector_store=store_type, collection=name)
+        else:
+            existing_chunks = get_chunk_manifest(vector_store=store_type, collection=name)
+            if not existing_chunks and not partial:
+                logger.info(f"No chunk manifest for {name}. Clearing its untracked chunks before storing.")
+                vector_store_object.clear_documents()
+        logger.debug(f"Found {len(existing_chunks)} chunks in manifest of {name}")
+        skip_chunks = existing_chunks if train_data.incremental else {}
+
+        seen_chunk_ids = set()
+        seen_sources = set()
+        new_chunks = 0
+
+        def pending_documents():
+            nonlocal new_chunks
+            for document in documents:
+                chunk_id = get_chunk_id(document)
+                if chunk_id in seen_chunk_ids:
+                    continue
+                seen_chunk_ids.add(chunk_id)
+                seen_sources.add(get_document_source(document))
+                if chunk_id in skip_chunks:
+                    continue
+                new_chunks += 1
+                yield document
+
+        def record_batch(batch, ids):
+            # Written per batch, so vectors of a run that fails later are still tracked.
+            add_chunk_manifest_entries(
+                vector_store=store_type,
+                collection=name,
+                entries={chunk_id: get_document_source(document) for chunk_id, document in zip(ids, batch)},
+            )
+
+        stored = vector_store_object.store_documents(
+            loaded_documents=pending_documents(),
+            progress_callback=progress_callback,
+            id_func=get_chunk_id,
+            batch_callback=record_batch,
         )
 
-    vector_store_object.get_vector_store()
-    vector_store_object.store_documents(loaded_documents=documents)
\ No newline at end of file
+        removed_sources = set(train_data.removed_sources or [])
+        stale_chunk_ids = [] if partial else [
+            chunk_id for chunk_id, source in existing_chunks.items()
+            if chunk_id not in seen_chunk_ids and (source in seen_sources or source in removed_sources)
+        ]
+        if stale_chunk_ids:
+            vector_store_object.delete_documents(ids=stale_chunk_ids)
+            delete_chunk_manifest_entries(
+                vector_store=store_type, collection=name, chunk_ids=stale_chunk_ids
+            )
+
+        summary = {
+            "total": len(seen_chunk_ids),
+            "stored": stored,
+            "unchanged": len(seen_chunk_ids) - new_chunks,
+            "deleted": len(stale_chunk_ids),
+        }
+        logger.info(f"Stored documents in {name} - {summary}")
+        return summary
+    finally:
+        vector_store_cache.invalidate(store_type=store_type, name=name)
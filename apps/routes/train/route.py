@@ -3,11 +3,13 @@ from pathlib import Path
 from fastapi import APIRouter
 from starlette.responses import JSONResponse
 
+from apps.jobs.broker import get_broker
+from apps.jobs.tasks import run_train_job
+from apps.routes.query.semantic_cache import semantic_cache
 from apps.routes.train import logger
 from apps.routes.train.dto import TrainInputModel
-from apps.routes.train.helpers import load_documents, store_documents
-from libs.db.mongodb.helpers import update_session, get_sessions
-from libs.enums import Status, VectorStoreType
+from libs.db.mongodb.helpers import create_job, update_session, get_sessions
+from libs.enums import JobType, Status, VectorStoreType
 
 train_route = APIRouter(tags=["TRAIN"])
 
@@ -26,9 +28,12 @@ def train_documents(train_data: TrainInputModel):
             document_to_update["chroma_collection_name"] = train_data.chroma_collection_name
         else:
             document_to_update["pinecone_index_name"] = train_data.pinecone_index_name
+        if train_data.semantic_cache_threshold is not None:
+            document_to_update["semantic_cache_threshold"] = train_data.semantic_cache_threshold
 
         logger.info(f"Updating session '{train_data.name}' to status: {Status.TRAINING.value}")
         update_session(name=train_data.name, document_to_update=document_to_update)
+        semantic_cache.invalidate(train_data.name)
 
         if train_data.directory_name:
             docs_path = Path(train_data.directory_name)
@@ -39,25 +44,21 @@ def train_documents(train_data: TrainInputModel):
             if not session_data or "source_directory" not in session_data:
                 raise ValueError("directory_name not provided and not found in session")
             docs_path = Path(session_data["source_directory"])
-        
-        logger.info(f"Training from directory: {docs_path}")
 
-        documents = load_documents(train_data=train_data, directory=docs_path)
-        logger.info(f"Loaded {len(documents)} document chunks.")
-        store_documents(documents=documents, train_data=train_data)
-
-        logger.info(f"Updating session '{train_data.name}' to status: {Status.READY.value}")
-        update_session(name=train_data.name, document_to_update={
-            "status": Status.READY.value,
-            "documents": len(documents)
-        })
+        job_id = create_job(
+            job_type=JobType.TRAIN.value,
+            name=train_data.name,
+            payload={"docs_path": str(docs_path)},
+        )
+        get_broker().submit(job_id, run_train_job, train_data.model_dump(mode="json"), str(docs_path))
 
         return JSONResponse(
             content={
                 "success": True,
-                "message": f"{len(documents)} chunks of documents have been stored successfully.",
+                "message": f"Training queued for session {train_data.name}. Track progress at /jobs/{job_id}",
+                "job_id": job_id,
             },
-            status_code=200,
+            status_code=202,
         )
 
     except Exception as e:
@@ -0,0 +1,98 @@
+import threading
+import time
+from collections import OrderedDict
+
+from apps.vector_stores import logger
+from libs.config import VECTOR_STORE_CACHE_SIZE, VECTOR_STORE_CACHE_TTL
+
+
+class VectorStoreCache:
+    """
+    Process-wide LRU cache of opened vector store handles, keyed by
+    (vector store type, collection/index name). Entries expire after
+    `ttl` seconds and can be dropped explicitly when a collection is retrained.
+    An optional `version` (e.g. the session's `updatedAt`) lets other workers
+    notice a retrain without a shared invalidation channel.
+    """
+
+    def __init__(self, max_size: int = VECTOR_STORE_CACHE_SIZE, ttl: int = VECTOR_STORE_CACHE_TTL):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _make_key(store_type: str, name: str) -> tuple:
+        return str(store_type).lower(), str(name)
+
+    def get(self, store_type: str, name: str, version=None):
+        key = self._make_key(store_type, name)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            vector_store, created_at, entry_version = entry
+            if self.ttl and time.monotonic() - created_at > self.ttl:
+                logger.debug(f"Vector store handle expired - {key}")
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            if version is not None and entry_version != version:
+                logger.debug(f"Vector store handle is stale - {key}")
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector_store
+
+    def put(self, store_type: str, name: str, vector_store, version=None):
+        key = self._make_key(store_type, name)
+        with self._lock:
+            self._entries[key] = (vector_store, time.monotonic(), version)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                evicted_key, _ = self._entries.popitem(last=False)
+                self.evictions += 1
+                logger.debug(f"Evicted vector store handle - {evicted_key}")
+
+    def get_or_create(self, store_type: str, name: str, factory, version=None):
+        vector_store = self.get(store_type, name, version=version)
+        if vector_store is not None:
+            return vector_store
+
+        logger.debug(f"Vector store handle cache miss - {store_type} - {name}")
+        vector_store = factory()
+        self.put(store_type, name, vector_store, version=version)
+        return vector_store
+
+    def invalidate(self, store_type: str, name: str):
+        key = self._make_key(store_type, name)
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                logger.info(f"Invalidated vector store handle - {key}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+vector_store_cache = VectorStoreCache()
@@ -1,15 +1,17 @@
-from uuid import uuid4
+from pathlib import Path
 
 import chromadb
 from langchain_chroma import Chroma
 from langchain_core.documents import Document
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 
 from apps.vector_stores import logger
+from apps.vector_stores.embeddings import get_embeddings
+from apps.vector_stores.ingestion import IngestionPipeline
 from libs.config import (
+    INGEST_BATCH_SIZE,
+    INGEST_MAX_CONCURRENCY,
     CHROMA_COLLECTION_NAME,
     CHROMA_PERSIST_DIRECTORY,
-    GEMINI_API_KEY, GOOGLE_EMBEDDING_MODEL,
 )
 
 
@@ -22,13 +24,10 @@ class ChromaManager:
         persist_directory: str = CHROMA_PERSIST_DIRECTORY,
     ):
         self.collection_name = collection_name or CHROMA_COLLECTION_NAME
-        self.embeddings = embeddings or GoogleGenerativeAIEmbeddings(
-            model=GOOGLE_EMBEDDING_MODEL,
-            google_api_key=GEMINI_API_KEY,
-            task_type="RETRIEVAL_DOCUMENT"
-        )
+        self.embeddings = embeddings or get_embeddings()
         self.persist_directory = persist_directory
         self.vector_store = None
+        self.created = False
 
     def get_vector_store(self):
         logger.info(
@@ -37,6 +36,9 @@ class ChromaManager:
             f"Persist Directory - {self.persist_directory}"
         )
 
+        persist_path = Path(str(self.persist_directory) + str(f"/{self.collection_name}"))
+        self.created = not persist_path.exists()
+
         vector_store = Chroma(
             collection_name=str(self.collection_name),
             embedding_function=self.embeddings,
@@ -50,27 +52,50 @@ class ChromaManager:
         self.vector_store = vector_store
         return vector_store
 
-    def store_documents(self, loaded_documents: list):
+    def store_documents(self, loaded_documents, progress_callback=None, id_func=None, batch_callback=None) -> int:
         logger.info(
-            f"Storing - {len(loaded_documents)} documents in the chroma vector store"
+            f"Storing documents in the chroma vector store - "
+            f"Batch Size - {INGEST_BATCH_SIZE} - Concurrency - {INGEST_MAX_CONCURRENCY}"
         )
 
         if self.vector_store is None:
             logger.error("Chroma Vector Store Object is not created.")
             raise Exception("Chroma Vector Store Object Not Formed.")
 
-        documents = [
+        documents = (
             Document(
                 page_content=doc.page_content,
                 metadata=doc.metadata,
             )
             for doc in loaded_documents
-        ]
-
-        uuids = [str(uuid4()) for _ in range(len(documents))]
+        )
 
-        self.vector_store.add_documents(documents=documents, uuids=uuids)
+        pipeline = IngestionPipeline(
+            vector_store=self.vector_store,
+            progress_callback=progress_callback,
+            batch_callback=batch_callback,
+        )
+        stored = pipeline.run(documents, id_func=id_func)
 
         logger.info(
-            f"All Documents successfully stored in the chroma vector store with collection name - {self.collection_name}"
+            f"All {stored} Documents successfully stored in the chroma vector store with collection name - {self.collection_name}"
         )
+        return stored
+
+    def delete_documents(self, ids: list, batch_size: int = 1000):
+        if self.vector_store is None:
+            logger.error("Chroma Vector Store Object is not created.")
+            raise Exception("Chroma Vector Store Object Not Formed.")
+
+        ids = list(ids)
+        for start in range(0, len(ids), batch_size):
+            self.vector_store.delete(ids=ids[start:start + batch_size])
+        logger.info(f"Deleted {len(ids)} documents from the chroma vector store")
+
+    def clear_documents(self):
+        if self.vector_store is None:
+            logger.error("Chroma Vector Store Object is not created.")
+            raise Exception("Chroma Vector Store Object Not Formed.")
+
+        self.vector_store.reset_collection()
+        logger.info(f"Cleared the chroma vector store with collection name - {self.collection_name}")
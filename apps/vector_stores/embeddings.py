@@ -0,0 +1,208 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+
+from langchain_core.embeddings import Embeddings
+from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+from apps.vector_stores import logger
+from libs.config import (
+    EMBEDDING_CACHE_PATH,
+    EMBEDDING_CACHE_SIZE,
+    GEMINI_API_KEY,
+    GOOGLE_EMBEDDING_MODEL,
+)
+
+
+class SQLiteEmbeddingStore:
+    """
+    On-disk embedding tier. SQLite in WAL mode lets every gunicorn worker
+    read concurrently while writes are serialised by the database itself.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._connection.commit()
+
+    def get_many(self, keys: list) -> dict:
+        if not keys:
+            return {}
+        found = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit.
+            for start in range(0, len(keys), 500):
+                batch = keys[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("f", blob).tolist()
+        return found
+
+    def set_many(self, items: dict):
+        if not items:
+            return
+        rows = [(key, array("f", vector).tobytes()) for key, vector in items.items()]
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+            self._connection.commit()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Content-addressed cache around an embeddings client. Keys are a hash of
+    the model name, the embedding kind (query/document) and the
+    whitespace-normalised text, so identical chunks and repeated queries are
+    only embedded once. An in-memory LRU sits in front of an optional SQLite
+    tier shared across workers.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model_name: str,
+        max_size: int = EMBEDDING_CACHE_SIZE,
+        disk_path: str | None = EMBEDDING_CACHE_PATH,
+    ):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.max_size = max_size
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.disk_store = SQLiteEmbeddingStore(disk_path) if disk_path else None
+        self.hits = 0
+        self.misses = 0
+
+    def _make_key(self, text: str, kind: str) -> str:
+        normalized = " ".join(text.split())
+        return hashlib.sha256(
+            f"{self.model_name}\x00{kind}\x00{normalized}".encode("utf-8")
+        ).hexdigest()
+
+    def _remember(self, items: dict):
+        with self._lock:
+            for key, vector in items.items():
+                self._memory[key] = vector
+                self._memory.move_to_end(key)
+            while len(self._memory) > self.max_size:
+                self._memory.popitem(last=False)
+
+    def _lookup(self, keys: list) -> dict:
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        if missing and self.disk_store is not None:
+            from_disk = self.disk_store.get_many(missing)
+            self._remember(from_disk)
+            found.update(from_disk)
+        return found
+
+    def _store(self, items: dict):
+        self._remember(items)
+        if self.disk_store is not None:
+            self.disk_store.set_many(items)
+
+    def _split(self, texts: list, kind: str):
+        keys = [self._make_key(text, kind) for text in texts]
+        found = self._lookup(keys)
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in pending:
+                pending[key] = text
+        with self._lock:
+            self.hits += len(keys) - len(pending)
+            self.misses += len(pending)
+        return keys, found, pending
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys, found, pending = self._split(texts, "document")
+        if pending:
+            vectors = self.embeddings.embed_documents(list(pending.values()))
+            computed = dict(zip(pending.keys(), vectors))
+            self._store(computed)
+            found.update(computed)
+        return [found[key] for key in keys]
+
+    def embed_query(self, text: str) -> list[float]:
+        keys, found, pending = self._split([text], "query")
+        if pending:
+            vector = self.embeddings.embed_query(text)
+            self._store({keys[0]: vector})
+            return vector
+        return found[keys[0]]
+
+    async def _ato_disk(self, func, *args):
+        # The SQLite tier can wait up to its busy timeout on a writer (a training job), so keep it off the loop.
+        if self.disk_store is None:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys, found, pending = await self._ato_disk(self._split, texts, "document")
+        if pending:
+            vectors = await self.embeddings.aembed_documents(list(pending.values()))
+            computed = dict(zip(pending.keys(), vectors))
+            await self._ato_disk(self._store, computed)
+            found.update(computed)
+        return [found[key] for key in keys]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        keys, found, pending = await self._ato_disk(self._split, [text], "query")
+        if pending:
+            vector = await self.embeddings.aembed_query(text)
+            await self._ato_disk(self._store, {keys[0]: vector})
+            return vector
+        return found[keys[0]]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "model": self.model_name,
+                "memory_size": len(self._memory),
+                "max_size": self.max_size,
+                "disk_path": self.disk_store.path if self.disk_store else None,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_embeddings = None
+_embeddings_lock = threading.Lock()
+
+
+def get_embeddings() -> CachedEmbeddings:
+    """Process-wide cached Google embeddings client shared by all vector stores."""
+    global _embeddings
+    with _embeddings_lock:
+        if _embeddings is None:
+            logger.info(f"Creating cached embeddings client - Model - {GOOGLE_EMBEDDING_MODEL}")
+            _embeddings = CachedEmbeddings(
+                embeddings=GoogleGenerativeAIEmbeddings(
+                    model=GOOGLE_EMBEDDING_MODEL,
+                    google_api_key=GEMINI_API_KEY,
+                    task_type="RETRIEVAL_DOCUMENT"
+                ),
+                model_name=GOOGLE_EMBEDDING_MODEL,
+            )
+        return _embeddings
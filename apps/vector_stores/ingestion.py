@@ -0,0 +1,143 @@
+import hashlib
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+from apps.vector_stores import logger
+from libs.config import (
+    INGEST_BATCH_SIZE,
+    INGEST_MAX_CONCURRENCY,
+    INGEST_MAX_RETRIES,
+)
+
+_RATE_LIMIT_MARKERS = ("429", "rate limit", "ratelimit", "quota", "resource exhausted", "resourceexhausted", "too many requests")
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    message = f"{type(error).__name__} {error}".lower()
+    return any(marker in message for marker in _RATE_LIMIT_MARKERS)
+
+
+def get_document_source(document) -> str:
+    metadata = document.metadata or {}
+    return str(metadata.get("url") or metadata.get("source") or "")
+
+
+def get_chunk_id(document) -> str:
+    """Deterministic chunk id: the same source and text always map to the same vector."""
+    return hashlib.sha256(
+        f"{get_document_source(document)}\x00{document.page_content}".encode("utf-8")
+    ).hexdigest()
+
+
+def iter_batches(documents, batch_size: int):
+    iterator = iter(documents)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+class IngestionPipeline:
+    """
+    Embeds and upserts documents in fixed-size batches with at most
+    `max_concurrency` batches in flight, so memory stays bounded by
+    batch_size * max_concurrency regardless of corpus size. Rate-limited
+    batches are retried with exponential backoff and jitter. Each batch the
+    store accepted is passed to `batch_callback(batch, ids)` as it lands,
+    including batches still in flight when another one fails, so callers
+    can track exactly what was written.
+    """
+
+    def __init__(
+        self,
+        vector_store,
+        batch_size: int = INGEST_BATCH_SIZE,
+        max_concurrency: int = INGEST_MAX_CONCURRENCY,
+        max_retries: int = INGEST_MAX_RETRIES,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        progress_callback=None,
+        batch_callback=None,
+    ):
+        self.vector_store = vector_store
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.progress_callback = progress_callback
+        self.batch_callback = batch_callback
+
+    def _upsert_batch(self, batch: list, ids: list) -> int:
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.vector_store.add_documents(documents=batch, ids=ids)
+                return len(batch)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_rate_limit_error(e):
+                    raise
+                delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+                delay = delay / 2 + random.uniform(0, delay / 2)
+                logger.warning(
+                    f"Rate limited while storing batch of {len(batch)} - "
+                    f"Retry {attempt + 1}/{self.max_retries} in {delay:.2f} seconds - {e}"
+                )
+                time.sleep(delay)
+
+    def run(self, documents, id_func=None) -> int:
+        id_func = id_func or get_chunk_id
+        stored = 0
+        start_time = time.time()
+        in_flight = set()
+        batches = {}
+
+        def collect(done, raise_errors: bool = True):
+            nonlocal stored
+            error = None
+            for future in done:
+                batch, ids = batches.pop(future)
+                if future.cancelled():
+                    continue
+                if future.exception() is not None:
+                    error = error or future.exception()
+                    continue
+                stored += future.result()
+                if self.batch_callback:
+                    self.batch_callback(batch, ids)
+            if self.progress_callback:
+                self.progress_callback(stored)
+            logger.debug(
+                f"Stored {stored} documents - "
+                f"{stored / max(time.time() - start_time, 1e-6):.1f} docs/sec"
+            )
+            if raise_errors and error is not None:
+                raise error
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrency, thread_name_prefix="ingest"
+        ) as executor:
+            try:
+                for batch in iter_batches(documents, self.batch_size):
+                    if len(in_flight) >= self.max_concurrency:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        collect(done)
+                    ids = [id_func(doc) for doc in batch]
+                    future = executor.submit(self._upsert_batch, batch, ids)
+                    batches[future] = (batch, ids)
+                    in_flight.add(future)
+
+                if in_flight:
+                    done, in_flight = wait(in_flight)
+                    collect(done)
+            except Exception:
+                for future in in_flight:
+                    future.cancel()
+                # Batches already running still land in the store; report them before failing.
+                collect(wait(in_flight)[0], raise_errors=False)
+                raise
+
+        logger.info(
+            f"Ingestion finished - {stored} documents in {time.time() - start_time:.2f} seconds - "
+            f"Batch Size - {self.batch_size} - Concurrency - {self.max_concurrency}"
+        )
+        return stored
@@ -1,15 +1,17 @@
 from datetime import datetime
-from uuid import uuid4
 
 from langchain_core.documents import Document
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
 from langchain_pinecone import PineconeVectorStore
 from pinecone import Pinecone, ServerlessSpec
 
 from apps.vector_stores import logger
+from apps.vector_stores.embeddings import get_embeddings
+from apps.vector_stores.ingestion import IngestionPipeline
 from libs.config import (
+    INGEST_BATCH_SIZE,
+    INGEST_MAX_CONCURRENCY,
     PINECONE_API_KEY,
-    PINECONE_INDEX_NAME, GEMINI_API_KEY, GOOGLE_EMBEDDING_MODEL,
+    PINECONE_INDEX_NAME,
 )
 
 
@@ -32,12 +34,9 @@ class PineconeManager:
         self.cloud = cloud
         self.region = region
         self.pinecone_client = Pinecone(api_key=self.api_key)
-        self.embeddings = embeddings or GoogleGenerativeAIEmbeddings(
-            model=GOOGLE_EMBEDDING_MODEL,
-            google_api_key=GEMINI_API_KEY,
-            task_type="RETRIEVAL_DOCUMENT"
-        )
+        self.embeddings = embeddings or get_embeddings()
         self.vector_store = None
+        self.created = False
 
     def _delete_first_index(self):
         try:
@@ -91,6 +90,7 @@ class PineconeManager:
 
     def _create_index_with_retry(self):
         logger.debug(f"Creating new Index: {self.index_name}")
+        self.created = True
         try:
             self.pinecone_client.create_index(
                 self.index_name,
@@ -111,26 +111,53 @@ class PineconeManager:
             else:
                 raise
 
-    def store_documents(self, loaded_documents: list):
+    def store_documents(self, loaded_documents, progress_callback=None, id_func=None, batch_callback=None) -> int:
         logger.info(
-            f"Storing - {len(loaded_documents)} documents in the pinecone vector store"
+            f"Storing documents in the pinecone vector store - "
+            f"Batch Size - {INGEST_BATCH_SIZE} - Concurrency - {INGEST_MAX_CONCURRENCY}"
         )
 
         if self.vector_store is None:
             logger.error("Pinecone Vector Store Object is not created.")
             raise Exception("Pinecone Vector Store Object Not Formed.")
 
-        documents = [
+        documents = (
             Document(
                 page_content=doc.page_content,
                 metadata=doc.metadata,
             )
             for doc in loaded_documents
-        ]
+        )
 
-        uuids = [str(uuid4()) for _ in range(len(documents))]
-        self.vector_store.add_documents(documents=documents, uuids=uuids)
+        pipeline = IngestionPipeline(
+            vector_store=self.vector_store,
+            progress_callback=progress_callback,
+            batch_callback=batch_callback,
+        )
+        stored = pipeline.run(documents, id_func=id_func)
 
         logger.info(
-            f"All Documents successfully stored in the pinecone vector store with index - {self.index_name}"
-        )
\ No newline at end of file
+            f"All {stored} Documents successfully stored in the pinecone vector store with index - {self.index_name}"
+        )
+        return stored
+
+    def delete_documents(self, ids: list, batch_size: int = 1000):
+        if self.vector_store is None:
+            logger.error("Pinecone Vector Store Object is not created.")
+            raise Exception("Pinecone Vector Store Object Not Formed.")
+
+        ids = list(ids)
+        for start in range(0, len(ids), batch_size):
+            self.vector_store.delete(ids=ids[start:start + batch_size])
+        logger.info(f"Deleted {len(ids)} documents from the pinecone vector store")
+
+    def clear_documents(self):
+        if self.vector_store is None:
+            logger.error("Pinecone Vector Store Object is not created.")
+            raise Exception("Pinecone Vector Store Object Not Formed.")
+
+        # Pinecone answers a delete_all on an empty index with "namespace not found".
+        stats = self.pinecone_client.Index(self.index_name).describe_index_stats()
+        if stats.total_vector_count:
+            self.vector_store.delete(delete_all=True)
+        logger.info(f"Cleared the pinecone vector store with index - {self.index_name}")
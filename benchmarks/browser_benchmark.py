@@ -0,0 +1,134 @@
+"""
+Compares the default Selenium profile against the text-only crawl profile
+(blocked images, media, fonts and trackers, eager loads, DOM-stability wait)
+on per-page time, extracted text and Chrome's resident memory.
+
+Without URLs it serves a local test site whose pages each pull in `--images`
+slow images and a web font, and render part of their text from JavaScript
+after a short delay, like a typical client-rendered page. Needs Chrome and
+Linux (memory is read from /proc). Run from the repository root with the
+usual environment loaded (libs.config reads it on import):
+
+    python benchmarks/browser_benchmark.py --pages 20
+    python benchmarks/browser_benchmark.py https://example.com/ https://example.com/about
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from apps.crawlers.selenium_helper import SeleniumHelper  # noqa: E402
+
+
+def make_handler(images: int, latency: float):
+    class SiteHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            if self.path.startswith("/static/"):
+                # Images and fonts: slow and heavy.
+                time.sleep(latency)
+                body = os.urandom(200 * 1024)
+                content_type = "font/woff2" if self.path.endswith(".woff2") else "image/png"
+            else:
+                page = self.path.strip("/").split("/")[-1] or "0"
+                imgs = "".join(f'<img src="/static/{page}-{i}.png">' for i in range(images))
+                body = (
+                    f"<html><head><title>Page {page}</title><style>@font-face {{font-family: f; "
+                    f"src: url('/static/{page}.woff2')}} body {{font-family: f}}</style></head><body>"
+                    f"<main><h1>Page {page}</h1><p>Static text of page {page}.</p>{imgs}<div id='app'></div></main>"
+                    f"<script>setTimeout(() => {{ document.getElementById('app').innerText = "
+                    f"'Text rendered by JavaScript on page {page}.'; }}, 300);</script></body></html>"
+                ).encode("utf-8")
+                content_type = "text/html; charset=utf-8"
+
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return SiteHandler
+
+
+def process_tree_rss_mb(pid: int) -> float:
+    """Resident memory of a process and all its descendants, from /proc."""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    parent = int(f.read().rsplit(")", 1)[1].split()[1])
+                children.setdefault(parent, []).append(int(entry))
+            except (OSError, IndexError, ValueError):
+                continue
+
+    total_kb, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, []))
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+        except OSError:
+            continue
+    return total_kb / 1024
+
+
+def run(name: str, text_only: bool, urls: list[str]):
+    helper = SeleniumHelper(text_only=text_only, remove_boilerplate=False)
+    driver = helper.build_driver(headless=True, text_only=text_only)
+    try:
+        times, text_length, peak_rss = [], 0, 0.0
+        for url in urls:
+            start_time = time.perf_counter()
+            driver.get(url)
+            helper.wait_until_ready(driver, 20)
+            page = helper.extractor.extract(driver.page_source, url)
+            times.append(time.perf_counter() - start_time)
+            text_length += len(page['cleanedData'])
+            peak_rss = max(peak_rss, process_tree_rss_mb(driver.service.process.pid))
+    finally:
+        driver.quit()
+        helper.listener.stop()
+
+    print(
+        f"{name:<12} {len(urls):>4} pages {sum(times) / len(times):>8.3f} s/page "
+        f"{text_length:>9} chars {peak_rss:>9.0f} MB peak RSS"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("urls", nargs="*", help="Pages to load instead of the local test site")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--images", type=int, default=10, help="Images per local test page")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds added to every image and font")
+    args = parser.parse_args()
+
+    urls = args.urls
+    server = None
+    if not urls:
+        server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.images, args.latency))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        urls = [f"http://127.0.0.1:{server.server_address[1]}/page/{page}" for page in range(args.pages)]
+
+    run("default", False, urls)
+    run("text-only", True, urls)
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Compares crawl throughput of a baseline crawl running blocking
+RequestHelper.fetch_page calls in executor threads against the native
+asyncio AsyncRequestHelper on a local, generated test site.
+
+The site is a tree of `--pages` HTML pages, each linking to `--fanout`
+children, and every response is delayed by `--latency` seconds to stand in
+for network round trips. With `--throttle N` the server answers 429 with a
+Retry-After once a client goes over N requests per second, like rate
+limited production sites; pass `--rate` to set the crawlers' per-host rate
+limit to compare. Pages carry an ETag and `--recrawl` crawls the site twice
+through an HTTP cache to measure conditional recrawls. Run from the repository root with the usual
+environment loaded (libs.config reads it on import):
+
+    python benchmarks/crawl_benchmark.py --pages 500 --latency 0.05
+    python benchmarks/crawl_benchmark.py --throttle 50 --rate 45
+    python benchmarks/crawl_benchmark.py --recrawl
+"""
+import argparse
+import asyncio
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from apps.crawlers.async_request_helper import AsyncRequestHelper  # noqa: E402
+from apps.crawlers.http_cache import HttpCache  # noqa: E402
+from apps.crawlers.request_helper import RequestHelper  # noqa: E402
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore "
+    "et dolore magna aliqua enim ad minim veniam quis nostrud exercitation ullamco laboris nisi aliquip"
+).split()
+
+
+def make_paragraph(page: int, words: int = 200) -> str:
+    # Distinct text per page, so content de-duplication does not collapse the site.
+    generator = random.Random(page)
+    return " ".join(generator.choice(WORDS) for _ in range(words))
+
+
+def make_handler(pages: int, fanout: int, latency: float, throttle: int = 0):
+    recent_requests = deque()
+    throttle_lock = threading.Lock()
+
+    def over_limit() -> bool:
+        with throttle_lock:
+            now = time.monotonic()
+            while recent_requests and now - recent_requests[0] > 1:
+                recent_requests.popleft()
+            if len(recent_requests) >= throttle:
+                return True
+            recent_requests.append(now)
+            return False
+
+    class SiteHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        bytes_served = 0
+
+        def do_GET(self):
+            time.sleep(latency)
+            if throttle and over_limit():
+                self.send_response(429)
+                self.send_header("Retry-After", "1")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            try:
+                page = int(self.path.split("?")[0].strip("/").split("/")[-1] or 0)
+            except ValueError:
+                page = pages
+            if page >= pages:
+                self.send_error(404)
+                return
+
+            children = range(page * fanout + 1, min(page * fanout + fanout, pages - 1) + 1)
+            links = "".join(f'<li><a href="/page/{child}">Page {child}</a></li>' for child in children)
+            body = (
+                f"<html><head><title>Page {page}</title></head><body>"
+                f"<nav><a href='/'>Home</a></nav><h1>Page {page}</h1>"
+                f"<p>{make_paragraph(page)}</p><ul>{links}</ul></body></html>"
+            ).encode("utf-8")
+
+            etag = f'"page-{page}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(body)
+            with throttle_lock:
+                SiteHandler.bytes_served += len(body)
+
+        def log_message(self, *args):
+            pass
+
+    return SiteHandler
+
+
+async def executor_crawl(helper: RequestHelper, main_url: str, max_workers: int):
+    """The baseline: asyncio workers handing each blocking fetch to the default thread pool."""
+    queue = asyncio.Queue()
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, helper.load_robots, main_url)
+    helper.deduplicator.add_url(main_url)
+    queue.put_nowait(main_url)
+
+    async def worker():
+        while True:
+            url = await queue.get()
+            try:
+                if url is None:
+                    return
+                if not helper.is_allowed(url):
+                    continue
+                page = await loop.run_in_executor(None, helper.fetch_page, url)
+                if page is None:
+                    continue
+                scraped_data = helper.to_scraped_data(page)
+                if scraped_data:
+                    helper._record_page([], scraped_data)
+                for new_url in page['links']:
+                    if helper.deduplicator.add_url(new_url):
+                        queue.put_nowait(new_url)
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(max_workers)]
+    await queue.join()
+    for _ in workers:
+        queue.put_nowait(None)
+    await asyncio.gather(*workers)
+
+
+def run(name: str, helper, crawl):
+    pages = []
+    helper.page_sink = pages.append
+    start_time = time.perf_counter()
+    output_dir = asyncio.run(crawl())
+    time_taken = time.perf_counter() - start_time
+    if output_dir:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    politeness = helper.politeness_stats()
+    print(
+        f"{name:<28} {len(pages):>6} pages {time_taken:>8.2f} s {len(pages) / time_taken:>9.1f} pages/sec "
+        f"{politeness['throttled']:>6} throttled {politeness['retries']:>6} retries"
+    )
+    return len(pages) / time_taken
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--fanout", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds added to every response")
+    parser.add_argument("--workers", type=int, default=10, help="Workers for the executor crawl")
+    parser.add_argument("--concurrency", type=int, default=32, help="Global limit for the async crawl")
+    parser.add_argument("--per-host", type=int, default=32, help="Per host limit for the async crawl")
+    parser.add_argument("--rate", type=float, default=0, help="Crawlers' per host requests/sec, 0 for unlimited")
+    parser.add_argument("--throttle", type=int, default=0, help="Server's requests/sec before 429s, 0 for none")
+    parser.add_argument("--recrawl", action="store_true", help="Also crawl twice through an HTTP cache")
+    args = parser.parse_args()
+
+    handler = make_handler(args.pages, args.fanout, args.latency, args.throttle)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/page/0"
+    print(f"Serving {args.pages} pages at {base_url} with {args.latency * 1000:.0f} ms latency\n")
+
+    threaded = RequestHelper(rate_limit=args.rate)
+    threaded.http_cache = None
+    baseline = run(
+        f"requests + executor ({args.workers})",
+        threaded,
+        lambda: executor_crawl(threaded, base_url, args.workers),
+    )
+
+    native = AsyncRequestHelper(
+        max_concurrency=args.concurrency, per_host_concurrency=args.per_host, rate_limit=args.rate
+    )
+    native.http_cache = None
+    candidate = run(
+        f"httpx async ({args.concurrency}/{args.per_host})",
+        native,
+        lambda: native.scrape_entire_website_with_main_url_async(base_url, "crawl-benchmark"),
+    )
+
+    print(f"\nSpeedup: {candidate / baseline:.2f}x")
+
+    if args.recrawl:
+        print()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            http_cache = HttpCache(str(Path(cache_dir) / "http_cache.sqlite3"))
+            for label in ("first crawl", "recrawl"):
+                helper = AsyncRequestHelper(
+                    max_concurrency=args.concurrency, per_host_concurrency=args.per_host, rate_limit=args.rate
+                )
+                helper.http_cache = http_cache
+                bytes_before = handler.bytes_served
+                run(
+                    f"httpx async, {label}",
+                    helper,
+                    lambda helper=helper: helper.scrape_entire_website_with_main_url_async(base_url, "crawl-benchmark"),
+                )
+                print(f"{'':<28} {(handler.bytes_served - bytes_before) / 1024:>13.1f} KB served")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Compares the HTML extraction engines in apps.crawlers.extractors on a corpus
+of saved pages: pages/sec, MB/sec, how much text each engine keeps and how
+many pages come out with no text at all (which should be none: a page left
+empty by main-content mode is silently lost from the crawl).
+
+The default corpus is benchmarks/fixtures/html; point `--corpus` at any
+directory of saved .html files (for example a real crawl) for numbers that
+reflect your sites. Run from the repository root with the usual environment
+loaded (libs.config reads it on import):
+
+    python benchmarks/extraction_benchmark.py --repeat 200
+"""
+import argparse
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from apps.crawlers.extractors import EXTRACTORS  # noqa: E402
+from libs.enums import ExtractorType  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "html"
+
+
+def run(extractor, pages: list, repeat: int):
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        for url, html in pages:
+            extractor.extract(html, url)
+    time_taken = time.perf_counter() - start_time
+
+    texts = [extractor.extract(html, url)["cleanedData"] for url, html in pages]
+    return len(pages) * repeat / time_taken, time_taken, sum(len(text) for text in texts), texts.count("")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=FIXTURES_DIR)
+    parser.add_argument("--repeat", type=int, default=100, help="Passes over the corpus per engine")
+    args = parser.parse_args()
+
+    files = sorted(args.corpus.rglob("*.html"))
+    if not files:
+        raise SystemExit(f"No .html files found in {args.corpus}")
+    pages = [(f"https://example.com/{path.stem}", path.read_text(encoding="utf-8", errors="replace")) for path in files]
+    input_mb = sum(len(html.encode("utf-8")) for _, html in pages) / 1024 / 1024
+    print(f"Corpus: {len(pages)} pages, {input_mb * 1024:.1f} KB, {args.repeat} passes\n")
+
+    print(f"{'engine':<12} {'main':<6} {'pages/sec':>10} {'MB/sec':>8} {'text chars':>11} {'vs soup':>8} {'empty':>6}")
+    baseline_chars = None
+    for extractor_type in ExtractorType:
+        extractor_class, module_name = EXTRACTORS[extractor_type]
+        if importlib.util.find_spec(module_name) is None:
+            print(f"{extractor_type.value:<12} skipped, {module_name} is not installed")
+            continue
+        for main_content in (False, True):
+            pages_per_sec, time_taken, output_chars, empty_pages = run(
+                extractor_class(main_content=main_content), pages, args.repeat
+            )
+            if baseline_chars is None:
+                baseline_chars = output_chars
+            print(
+                f"{extractor_type.value:<12} {str(main_content):<6} {pages_per_sec:>10.1f} "
+                f"{input_mb * args.repeat / time_taken:>8.2f} {output_chars:>11} "
+                f"{output_chars / baseline_chars:>7.0%} {empty_pages:>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
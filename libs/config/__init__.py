@@ -24,4 +24,95 @@ ENVIRONMENT = os.getenv("ENVIRONMENT")
 ANTHROPIC_MODEL = os.getenv("ANTHROPIC_MODEL")
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY")
 
-GOOGLE_EMBEDDING_MODEL =os.getenv("GOOGLE_EMBEDDING_MODEL")
\ No newline at end of file
+GOOGLE_EMBEDDING_MODEL =os.getenv("GOOGLE_EMBEDDING_MODEL")
+
+VECTOR_STORE_CACHE_SIZE = int(os.getenv("VECTOR_STORE_CACHE_SIZE") or 32)
+VECTOR_STORE_CACHE_TTL = int(os.getenv("VECTOR_STORE_CACHE_TTL") or 3600)
+LLM_CLIENT_POOL_SIZE = int(os.getenv("LLM_CLIENT_POOL_SIZE") or 16)
+
+# The query route is async end to end, so a couple of uvicorn workers can hold
+# hundreds of in-flight LLM calls; scale this with cores, not with concurrency.
+WORKERS = int(os.getenv("WORKERS") or 2)
+
+SEMANTIC_CACHE_ENABLED = (os.getenv("SEMANTIC_CACHE_ENABLED") or "true").lower() == "true"
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD") or 0.95)
+SEMANTIC_CACHE_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES") or 500)
+SEMANTIC_CACHE_MAX_SESSIONS = int(os.getenv("SEMANTIC_CACHE_MAX_SESSIONS") or 100)
+
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE") or 10000)
+# Optional SQLite file shared by all workers; leave empty for memory only.
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH") or None
+
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE") or 100)
+INGEST_MAX_CONCURRENCY = int(os.getenv("INGEST_MAX_CONCURRENCY") or 4)
+INGEST_MAX_RETRIES = int(os.getenv("INGEST_MAX_RETRIES") or 5)
+
+LOADER_PARALLEL = (os.getenv("LOADER_PARALLEL") or "true").lower() == "true"
+# Defaults to the number of cores when unset.
+LOADER_MAX_WORKERS = int(os.getenv("LOADER_MAX_WORKERS") or 0) or None
+
+JOB_BROKER = os.getenv("JOB_BROKER") or "local"
+JOB_WORKERS = int(os.getenv("JOB_WORKERS") or 2)
+JOB_PROGRESS_INTERVAL = float(os.getenv("JOB_PROGRESS_INTERVAL") or 2)
+
+# Pages buffered between the crawler and the embedder in /crawl/train.
+CRAWL_STREAM_QUEUE_SIZE = int(os.getenv("CRAWL_STREAM_QUEUE_SIZE") or 256)
+# Seconds /crawl/train waits for a stopped crawler to wind down before marking the job failed.
+CRAWL_STOP_TIMEOUT = float(os.getenv("CRAWL_STOP_TIMEOUT") or 30)
+
+CRAWL_MAX_CONCURRENCY = int(os.getenv("CRAWL_MAX_CONCURRENCY") or 32)
+CRAWL_PER_HOST_CONCURRENCY = int(os.getenv("CRAWL_PER_HOST_CONCURRENCY") or 8)
+CRAWL_HTTP2 = (os.getenv("CRAWL_HTTP2") or "true").lower() == "true"
+
+# HTML extraction engine for crawls: soup, lxml or selectolax. Falls back to soup if not installed.
+CRAWL_EXTRACTOR = os.getenv("CRAWL_EXTRACTOR") or "lxml"
+# Keep only the main content of a page, dropping nav, footer, cookie banners etc.
+CRAWL_MAIN_CONTENT = (os.getenv("CRAWL_MAIN_CONTENT") or "true").lower() == "true"
+
+# Strip text lines repeated across most pages of a crawl (menus, footers, banners).
+CRAWL_REMOVE_BOILERPLATE = (os.getenv("CRAWL_REMOVE_BOILERPLATE") or "true").lower() == "true"
+CRAWL_BOILERPLATE_MIN_PAGES = int(os.getenv("CRAWL_BOILERPLATE_MIN_PAGES") or 3)
+CRAWL_BOILERPLATE_MIN_RATIO = float(os.getenv("CRAWL_BOILERPLATE_MIN_RATIO") or 0.5)
+
+# Canonicalize URLs and skip near-duplicate pages (SimHash) while crawling.
+CRAWL_DEDUPLICATE = (os.getenv("CRAWL_DEDUPLICATE") or "true").lower() == "true"
+# Max differing bits between two page fingerprints to count as duplicates.
+CRAWL_SIMHASH_DISTANCE = int(os.getenv("CRAWL_SIMHASH_DISTANCE") or 3)
+
+# Per-host politeness: steady request rate (0 disables) and burst, on top of robots.txt Crawl-delay.
+CRAWL_RATE_LIMIT = float(os.getenv("CRAWL_RATE_LIMIT") or 10)
+CRAWL_RATE_BURST = int(os.getenv("CRAWL_RATE_BURST") or 10)
+CRAWL_RESPECT_ROBOTS = (os.getenv("CRAWL_RESPECT_ROBOTS") or "true").lower() == "true"
+CRAWL_MAX_RETRIES = int(os.getenv("CRAWL_MAX_RETRIES") or 4)
+CRAWL_BACKOFF_BASE = float(os.getenv("CRAWL_BACKOFF_BASE") or 0.5)
+# Upper bound in seconds for Crawl-delay, Retry-After and backoff waits.
+CRAWL_MAX_DELAY = float(os.getenv("CRAWL_MAX_DELAY") or 30)
+
+# Optional SQLite file caching crawled pages and their ETag/Last-Modified for recrawls; leave empty to refetch everything.
+CRAWL_HTTP_CACHE_PATH = os.getenv("CRAWL_HTTP_CACHE_PATH") or None
+
+# Append-only crawl checkpoints (documents/<site>/checkpoint.jsonl) that /crawl can resume from, deleted once
+# the crawl finishes. Crawls streaming to training log URLs and statuses only, never page text.
+CRAWL_CHECKPOINT = (os.getenv("CRAWL_CHECKPOINT") or "true").lower() == "true"
+# Seconds between checkpoint fsyncs; at most this much crawl work is lost on a crash.
+CRAWL_CHECKPOINT_INTERVAL = float(os.getenv("CRAWL_CHECKPOINT_INTERVAL") or 5)
+
+# Headless browsers crawling a dynamic site in parallel, and pages each one serves before it is replaced.
+CRAWL_BROWSER_POOL_SIZE = int(os.getenv("CRAWL_BROWSER_POOL_SIZE") or 4)
+CRAWL_BROWSER_RECYCLE_PAGES = int(os.getenv("CRAWL_BROWSER_RECYCLE_PAGES") or 50)
+
+# Text-only browser profile for dynamic crawls: no images, media, fonts or trackers, eager loads, DOM-stability wait.
+CRAWL_BROWSER_TEXT_ONLY = (os.getenv("CRAWL_BROWSER_TEXT_ONLY") or "true").lower() == "true"
+# A page is ready once its DOM has been quiet this long, waiting at most CRAWL_BROWSER_PAGE_TIMEOUT seconds.
+CRAWL_BROWSER_QUIET_MS = int(os.getenv("CRAWL_BROWSER_QUIET_MS") or 500)
+CRAWL_BROWSER_PAGE_TIMEOUT = float(os.getenv("CRAWL_BROWSER_PAGE_TIMEOUT") or 10)
+
+# Pinned chromedriver binary; skips webdriver-manager's network lookup when set.
+CHROMEDRIVER_PATH = os.getenv("CHROMEDRIVER_PATH") or None
+
+# Decide static vs dynamic from the raw HTML first and start a browser only when that is inconclusive.
+CRAWL_DYNAMIC_HEURISTIC = (os.getenv("CRAWL_DYNAMIC_HEURISTIC") or "true").lower() == "true"
+
+# auto: one crawler for the whole site, picked from the sitemap or a static/dynamic check.
+# hybrid: every page over HTTP, escalating the ones that look script-rendered to the browser pool.
+CRAWL_MODE = os.getenv("CRAWL_MODE") or "auto"
@@ -56,3 +56,40 @@ BASIC_HEADERS = {
 
 SCROLL_TO_END_SCRIPT = 'window.scrollTo(0, document.body.scrollHeight);'
 SCROLL_TO_TOP_SCRIPT = 'window.scrollTo(0, 0);'
+
+# Resolves once the DOM has had no mutations for arguments[0] ms, or with false after arguments[1] ms.
+WAIT_FOR_DOM_STABLE_SCRIPT = """
+const quietMs = arguments[0], timeoutMs = arguments[1], done = arguments[arguments.length - 1];
+let quietTimer = null, limitTimer = null, observer = null;
+const finish = (stable) => {
+    if (observer) observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(limitTimer);
+    done(stable);
+};
+const begin = () => {
+    observer = new MutationObserver(() => {
+        clearTimeout(quietTimer);
+        quietTimer = setTimeout(() => finish(true), quietMs);
+    });
+    observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+    quietTimer = setTimeout(() => finish(true), quietMs);
+};
+limitTimer = setTimeout(() => finish(false), timeoutMs);
+if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', begin);
+} else {
+    begin();
+}
+"""
+
+# Requests the text-only browser profile blocks through CDP: images, media, fonts and trackers.
+TEXT_ONLY_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico", "*.bmp",
+    "*.mp4", "*.webm", "*.ogg", "*.mp3", "*.wav", "*.m4a", "*.mov",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*clarity.ms*", "*segment.io*",
+    "*segment.com*", "*mixpanel.com*", "*intercom.io*", "*hubspot.com*", "*hs-scripts.com*",
+    "*newrelic.com*", "*nr-data.net*", "*optimizely.com*", "*youtube.com/embed*", "*player.vimeo.com*",
+]
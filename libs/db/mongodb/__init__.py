@@ -1,4 +1,4 @@
-from pymongo import MongoClient
+from pymongo import AsyncMongoClient, MongoClient
 from pymongo.errors import PyMongoError
 
 from libs.config import DATABASE_NAME, MONGO_URI
@@ -19,6 +19,23 @@ def connect_db():
         )
 
 
+def connect_async_db():
+    try:
+        client = AsyncMongoClient(MONGO_URI)
+        return client[DATABASE_NAME]
+    except PyMongoError as error:
+        raise Exception(
+            f'Failed to connect to database: "{DATABASE_NAME}",'
+            f"ERROR: {str(error)}"
+        )
+
+
 db = connect_db()
 sessions_collection = db["sessions"]
 conversations_collection = db["conversations"]
+chunk_manifests_collection = db["chunk_manifests"]
+jobs_collection = db["jobs"]
+
+async_db = connect_async_db()
+async_sessions_collection = async_db["sessions"]
+async_conversations_collection = async_db["conversations"]
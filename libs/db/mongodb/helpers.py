@@ -1,10 +1,18 @@
 from datetime import datetime, timezone
+from uuid import uuid4
+
+from pymongo import DeleteMany, UpdateOne
 
 from libs.db.mongodb import (
+    async_conversations_collection,
+    async_sessions_collection,
+    chunk_manifests_collection,
     conversations_collection,
+    jobs_collection,
     logger,
     sessions_collection,
 )
+from libs.enums import JobStatus
 
 
 def store_session(document_to_insert: dict):
@@ -39,3 +47,101 @@ def store_conversations(document_to_insert: dict):
     document_to_insert["createdAt"] = datetime.now(timezone.utc)
     document_to_insert["updatedAt"] = datetime.now(timezone.utc)
     conversations_collection.insert_one(document_to_insert)
+
+
+async def aget_sessions(name: str):
+    logger.debug(f"Getting Session Details (async) for - {name}")
+    session_data = await async_sessions_collection.find_one({"name": name})
+    return session_data
+
+
+async def astore_conversations(document_to_insert: dict):
+    logger.debug(
+        f"Storing conversations (async) - {document_to_insert.get('name')} - query - {document_to_insert.get('user_query')}"
+    )
+    document_to_insert["createdAt"] = datetime.now(timezone.utc)
+    document_to_insert["updatedAt"] = datetime.now(timezone.utc)
+    await async_conversations_collection.insert_one(document_to_insert)
+
+
+async def aget_cached_conversations(name: str, since=None, limit: int = 500):
+    logger.debug(f"Getting cacheable conversations (async) for - {name} - since - {since}")
+    query = {"name": name, "query_embedding": {"$exists": True}}
+    if since is not None:
+        query["createdAt"] = {"$gte": since}
+    cursor = async_conversations_collection.find(
+        query,
+        {"_id": 0, "llm": 1, "prompt": 1, "use_context": 1, "user_query": 1, "ai_response": 1, "query_embedding": 1},
+    ).sort("createdAt", -1).limit(limit)
+    return await cursor.to_list(length=limit)
+
+
+def get_chunk_manifest(vector_store: str, collection: str) -> dict:
+    logger.debug(f"Getting chunk manifest for - {vector_store} - {collection}")
+    chunk_manifests_collection.create_index(
+        [("vector_store", 1), ("collection", 1), ("chunk_id", 1)], unique=True
+    )
+    cursor = chunk_manifests_collection.find(
+        {"vector_store": vector_store, "collection": collection},
+        {"_id": 0, "chunk_id": 1, "source": 1},
+    )
+    return {doc["chunk_id"]: doc.get("source") for doc in cursor}
+
+
+def add_chunk_manifest_entries(vector_store: str, collection: str, entries: dict, batch_size: int = 1000):
+    logger.debug(f"Adding {len(entries)} chunk manifest entries for - {vector_store} - {collection}")
+    operations = [
+        UpdateOne(
+            {"vector_store": vector_store, "collection": collection, "chunk_id": chunk_id},
+            {"$set": {"source": source, "updatedAt": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+        for chunk_id, source in entries.items()
+    ]
+    for start in range(0, len(operations), batch_size):
+        chunk_manifests_collection.bulk_write(operations[start:start + batch_size], ordered=False)
+
+
+def delete_chunk_manifest_entries(vector_store: str, collection: str, chunk_ids: list | None = None, batch_size: int = 1000):
+    """Deletes the given chunk ids, or the whole manifest when chunk_ids is None."""
+    logger.debug(f"Deleting chunk manifest entries for - {vector_store} - {collection}")
+    query = {"vector_store": vector_store, "collection": collection}
+    if chunk_ids is None:
+        chunk_manifests_collection.delete_many(query)
+        return
+
+    chunk_ids = list(chunk_ids)
+    operations = [
+        DeleteMany({**query, "chunk_id": {"$in": chunk_ids[start:start + batch_size]}})
+        for start in range(0, len(chunk_ids), batch_size)
+    ]
+    if operations:
+        chunk_manifests_collection.bulk_write(operations, ordered=False)
+
+
+def create_job(job_type: str, name: str, payload: dict | None = None) -> str:
+    job_id = uuid4().hex
+    logger.debug(f"Creating Job - {job_id} - {job_type} - {name}")
+    jobs_collection.insert_one({
+        "job_id": job_id,
+        "type": job_type,
+        "name": name,
+        "status": JobStatus.QUEUED.value,
+        "payload": payload or {},
+        "progress": {},
+        "createdAt": datetime.now(timezone.utc),
+        "updatedAt": datetime.now(timezone.utc),
+    })
+    return job_id
+
+
+def update_job(job_id: str, document_to_update: dict):
+    logger.debug(f"Updating Job - {job_id}")
+    document_to_update["updatedAt"] = datetime.now(timezone.utc)
+    jobs_collection.update_one({"job_id": job_id}, {"$set": document_to_update})
+
+
+def get_job(job_id: str):
+    logger.debug(f"Getting Job Details for - {job_id}")
+    return jobs_collection.find_one({"job_id": job_id}, {"_id": 0})
+
@@ -27,3 +27,34 @@ class Status(Enum):
     TRAINING = "training"
     TRAINING_FAILED = "training_failed"
     READY = "ready"
+
+
+class ExtractorType(Enum):
+    SOUP = "soup"
+    LXML = "lxml"
+    SELECTOLAX = "selectolax"
+
+
+class CrawlStrategy(Enum):
+    SITEMAP = "sitemap"
+    STATIC = "static"
+    DYNAMIC = "dynamic"
+    HYBRID = "hybrid"
+
+
+class CrawlMode(Enum):
+    AUTO = "auto"
+    HYBRID = "hybrid"
+
+
+class JobType(Enum):
+    CRAWL = "crawl"
+    TRAIN = "train"
+    CRAWL_TRAIN = "crawl_train"
+
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
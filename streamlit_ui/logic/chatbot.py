@@ -23,9 +23,8 @@ def create_chatbot_from_website(url: str, name: str):
     st.write("Website crawled successfully!")
     
     st.write("Training chatbot...")
-    all_documents = []
     json_loader = JSONDocLoader(directory=Path(directory))
-    all_documents.extend(json_loader.load_documents())
+    all_documents = json_loader.iter_documents()
     
     train_input = TrainInputModel(
         name=name,
@@ -50,8 +49,6 @@ def create_chatbot_from_document(uploaded_files: list, name: str):
         with open(file_path, "wb") as f:
             f.write(uploaded_file.getbuffer())
 
-    all_documents = []
-    
     # Map file extensions to loader classes
     loader_map = {
         ".pdf": PDFLoader,
@@ -61,13 +58,16 @@ def create_chatbot_from_document(uploaded_files: list, name: str):
         ".docx": DocsLoader,
     }
 
-    for uploaded_file in uploaded_files:
-        file_extension = Path(uploaded_file.name).suffix
-        loader_class = loader_map.get(file_extension)
-        
-        if loader_class:
-            loader = loader_class(directory=temp_dir)
-            all_documents.extend(loader.load_documents())
+    def iter_uploaded_documents():
+        # Each loader scans the whole directory, so run one per extension, not per file.
+        extensions = dict.fromkeys(Path(f.name).suffix for f in uploaded_files)
+        for file_extension in extensions:
+            loader_class = loader_map.get(file_extension)
+            if loader_class:
+                loader = loader_class(directory=temp_dir)
+                yield from loader.iter_documents()
+
+    all_documents = iter_uploaded_documents()
 
     train_input = TrainInputModel(
         name=name,
@@ -85,7 +85,7 @@ def create_chatbot_from_document(uploaded_files: list, name: str):
 def create_chatbot_from_wikipedia(page_name: str, name: str):
     st.write("Training chatbot from Wikipedia...")
     loader = WikipediaPageLoader(query=page_name)
-    documents = loader.load_documents()
+    documents = loader.iter_documents()
     
     train_input = TrainInputModel(
         name=name,
@@ -99,7 +99,7 @@ def create_chatbot_from_wikipedia(page_name: str, name: str):
 def create_chatbot_from_youtube(video_url: str, name: str):
     st.write("Training chatbot from YouTube...")
     loader = YoutubeUrlLoader()
-    documents = loader.load_documents(youtube_links=[video_url])
+    documents = loader.iter_documents(youtube_links=[video_url])
     
     train_input = TrainInputModel(
         name=name,
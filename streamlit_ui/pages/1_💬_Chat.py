@@ -44,11 +44,12 @@ def chat_page():
                 vector_store = chroma_manager.get_vector_store()
                 
                 handler = GeminiHandler(vector_store=vector_store)
-                response = handler.generate_response(user_query=prompt, prompt=None)
-                
-                response_content = response.content
-                st.markdown(response_content)
-                st.session_state.messages.append({"role": "assistant", "content": response_content})
+                chunks = handler.stream_response(user_query=prompt, prompt=None)
+
+            response_content = st.write_stream(
+                handler.chunk_text(chunk) for chunk in chunks
+            )
+            st.session_state.messages.append({"role": "assistant", "content": response_content})
 
 if __name__ == "__main__":
     chat_page()
\ No newline at end of file